@@ -0,0 +1,62 @@
+""" Benchmark of reading a JSON payload through the POST adapters.
+
+Processes and validates a payload with an array of rows, once by
+flattening the rows into a WebOb MultiDict of "name_N" keys first (as
+was needed before the adapters) and once by passing the payload as it
+is, for a growing number of rows.
+
+Usage: python -m benchmarks.bench_adapters
+"""
+import timeit
+
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import EqualTo, InputRequired
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+
+class BaseForm(Form):
+    first_name = TextField('First name')
+
+
+def configure():
+    dynamic = WTFormsDynamicFields()
+    dynamic.add_field('mobile', 'Mobile', TextField)
+    dynamic.add_validator('mobile', EqualTo, '%handy%')
+    dynamic.add_field('handy', 'Handy', TextField)
+    dynamic.add_validator('handy', InputRequired)
+    return dynamic
+
+
+def flatten(payload):
+    post = MultiDict(first_name=payload['first_name'])
+    for number, row in enumerate(payload['phones'], 1):
+        for name, value in row.items():
+            post.add('%s_%d' % (name, number), value)
+    return post
+
+
+def main():
+    dynamic = configure()
+    print('%-6s %14s %14s %8s' % ('rows', 'flattened', 'payload', 'speedup'))
+    for rows in (10, 100, 1000):
+        payload = {'first_name': 'John',
+                   'phones': [{'mobile': str(i), 'handy': str(i)} for i in range(rows)]}
+
+        def flattened():
+            return dynamic.process(BaseForm, flatten(payload)).validate()
+
+        def direct():
+            return dynamic.process(BaseForm, payload).validate()
+
+        assert flattened() and direct()
+        flat_time = min(timeit.repeat(flattened, number=3, repeat=5)) / 3
+        direct_time = min(timeit.repeat(direct, number=3, repeat=5)) / 3
+        print('%-6d %11.2f ms %11.2f ms %7.1fx' % (rows, flat_time * 1e3,
+                                                   direct_time * 1e3,
+                                                   flat_time / direct_time))
+
+
+if __name__ == '__main__':
+    main()
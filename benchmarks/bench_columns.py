@@ -0,0 +1,45 @@
+""" Benchmark of column-wise validation of large sets.
+
+Validates a set of "amount" members under NumberRange and AnyOf with
+the ValidationEngine, field by field and column-wise, for a growing
+number of members. NumPy is used for the ranges when it is installed.
+
+Usage: python -m benchmarks.bench_columns
+"""
+import timeit
+
+from wtforms import IntegerField
+from wtforms.validators import AnyOf, NumberRange
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+from wtforms_dynamic_fields import columns
+
+
+def configure():
+    dynamic = WTFormsDynamicFields()
+    dynamic.add_field('amount', 'Amount', IntegerField)
+    dynamic.add_validator('amount', NumberRange, min=0, max=1000)
+    dynamic.add_validator('amount', AnyOf, range(0, 1000, 3))
+    return dynamic
+
+
+def main():
+    dynamic = configure()
+    by_field = dynamic.engine(cache_size=10000, column_size=None)
+    by_column = dynamic.engine(cache_size=10000)
+    print('NumPy: %s' % ('yes' if columns.numpy is not None else 'no'))
+    print('%-8s %14s %14s %8s' % ('members', 'by field', 'by column', 'speedup'))
+    for members in (100, 1000, 5000):
+        data = dict(('amount_%d' % i, str(i * 7 % 1100)) for i in range(1, members + 1))
+        assert by_field.validate(data) == by_column.validate(data)
+        field_time = min(timeit.repeat(lambda: by_field.validate(data),
+                                       number=5, repeat=5)) / 5
+        column_time = min(timeit.repeat(lambda: by_column.validate(data),
+                                        number=5, repeat=5)) / 5
+        print('%-8d %11.3f ms %11.3f ms %7.1fx' % (members, field_time * 1e3,
+                                                   column_time * 1e3,
+                                                   field_time / column_time))
+
+
+if __name__ == '__main__':
+    main()
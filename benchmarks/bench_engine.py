@@ -0,0 +1,69 @@
+""" Benchmark of the form-free validation engine.
+
+Compares processing and validating a form with validating the same
+data with the ValidationEngine, for a base form of two fields and a
+growing number of set members, each with an EqualTo placeholder, a
+Length and an InputRequired validator.
+
+Usage: python -m benchmarks.bench_engine
+"""
+import timeit
+
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import EqualTo, InputRequired, Length
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+
+class BaseForm(Form):
+    first_name = TextField('First name', validators=[InputRequired()])
+    last_name = TextField('Last name')
+
+
+def configure():
+    dynamic = WTFormsDynamicFields()
+    dynamic.add_field('mobile', 'Mobile', TextField)
+    dynamic.add_validator('mobile', EqualTo, '%handy%',
+                          message='Please fill in the exact same data as %handy%.')
+    dynamic.add_validator('mobile', Length, max=20)
+    dynamic.add_field('handy', 'Handy', TextField)
+    dynamic.add_validator('handy', InputRequired)
+    return dynamic
+
+
+def post_data(members):
+    post = MultiDict()
+    post.add('first_name', 'John')
+    post.add('last_name', 'Doe')
+    for i in range(1, members + 1):
+        post.add('mobile_%d' % i, str(i))
+        post.add('handy_%d' % i, str(i if i % 2 else -i))
+    return post
+
+
+def form_errors(dynamic, post):
+    form = dynamic.process(BaseForm, post)
+    form.validate()
+    return form.errors
+
+
+def main():
+    dynamic = configure()
+    engine = dynamic.engine(BaseForm)
+    print('%-8s %14s %14s %8s' % ('members', 'form', 'engine', 'speedup'))
+    for members in (10, 100, 1000):
+        post = post_data(members)
+        data = dict(post.items())
+        assert engine.validate(post) == form_errors(dynamic, post)
+        form_time = min(timeit.repeat(lambda: form_errors(dynamic, post),
+                                      number=20, repeat=5)) / 20
+        engine_time = min(timeit.repeat(lambda: engine.validate(data),
+                                        number=20, repeat=5)) / 20
+        print('%-8d %11.3f ms %11.3f ms %7.1fx' % (members, form_time * 1e3,
+                                                   engine_time * 1e3,
+                                                   form_time / engine_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+""" Benchmark of grouped set members against the flat layout.
+
+Processes a POST with 5,000 set members (2,500 set numbers of a
+"mobile" and "handy" field, the first with an EqualTo placeholder)
+flat and grouped, and reports for each layout:
+
+- the time to build the form class (an empty form cache),
+- the time to process a POST once the class is cached,
+- the traced memory of the form class and of a processed form.
+
+Usage: python -m benchmarks.bench_grouped
+"""
+import timeit
+import tracemalloc
+
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import EqualTo, InputRequired
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+SET_NUMBERS = 2500
+
+
+class BaseForm(Form):
+    first_name = TextField('First name')
+
+
+def configure():
+    dynamic = WTFormsDynamicFields()
+    dynamic.add_field('mobile', 'Mobile', TextField)
+    dynamic.add_validator('mobile', EqualTo, '%handy%')
+    dynamic.add_field('handy', 'Handy', TextField)
+    dynamic.add_validator('handy', InputRequired)
+    return dynamic
+
+
+def post_data():
+    post = MultiDict(first_name='John')
+    for i in range(1, SET_NUMBERS + 1):
+        post.add('mobile_%d' % i, str(i))
+        post.add('handy_%d' % i, str(i))
+    return post
+
+
+def traced(func):
+    """ Return the result of func and the memory it left allocated. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = func()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, used
+
+
+def main():
+    post = post_data()
+    dynamic = configure()
+    dynamic.compile()
+    print('%d set members' % (SET_NUMBERS * 2))
+    print('%-8s %12s %12s %12s %12s' % ('layout', 'build class', 'process',
+                                        'class mem', 'form mem'))
+    for grouped in (False, True):
+        def build():
+            dynamic.clear_form_cache()
+            return dynamic.process(BaseForm, post, grouped=grouped)
+
+        build_time = min(timeit.repeat(build, number=1, repeat=5))
+        process_time = min(timeit.repeat(
+            lambda: dynamic.process(BaseForm, post, grouped=grouped),
+            number=1, repeat=5))
+
+        dynamic.clear_form_cache()
+        form, class_memory = traced(lambda: type(build()))
+        form, form_memory = traced(lambda: dynamic.process(BaseForm, post, grouped=grouped))
+        assert form.validate()
+        print('%-8s %9.1f ms %9.1f ms %8.0f KiB %8.0f KiB' % (
+            'grouped' if grouped else 'flat', build_time * 1e3,
+            process_time * 1e3, class_memory / 1024.0, form_memory / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+""" Benchmark of lazy versus eager binding of dynamic fields.
+
+Processes a POST with a growing number of set members and reads
+a single one of them, as a bulk-edit screen rendering one row would.
+Reports the latency and the peak memory of such a request, with the
+form class already cached (the steady state).
+
+Usage: python -m benchmarks.bench_lazy
+"""
+import timeit
+import tracemalloc
+
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import InputRequired, Length
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+
+class BaseForm(Form):
+    name = TextField('Name', validators=[InputRequired()])
+
+
+def build(members):
+    dynamic = WTFormsDynamicFields()
+    dynamic.add_field('row', 'Row', TextField)
+    dynamic.add_validator('row', InputRequired, message='Please fill in %row%.')
+    dynamic.add_validator('row', Length, max=20)
+    post = MultiDict()
+    post.add('name', 'bulk')
+    for number in range(1, members + 1):
+        post.add('row_%d' % number, 'value %d' % number)
+    return dynamic, post
+
+
+def measure(members, lazy, repeat=5):
+    dynamic, post = build(members)
+
+    def request():
+        form = dynamic.process(BaseForm, post, lazy=lazy)
+        return form.row_1.data
+
+    request()
+    number = max(1, 1000 // members)
+    seconds = min(timeit.repeat(request, number=number, repeat=repeat)) / number
+
+    tracemalloc.start()
+    form = dynamic.process(BaseForm, post, lazy=lazy)
+    form.row_1.data
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    print('members    eager ms  eager KiB    lazy ms   lazy KiB')
+    for members in (10, 100, 1000, 10000):
+        eager = measure(members, False)
+        lazy = measure(members, True)
+        print('%7d %11.3f %10.1f %10.3f %10.1f' % (
+            members, eager[0] * 1000, eager[1] / 1024.0,
+            lazy[0] * 1000, lazy[1] / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+""" Benchmark of the memory used by a large configuration.
+
+Configures 1,000 fields with two validators each through the public
+add_field() and add_validator() calls and reports the traced memory
+per field, for the configuration alone and once compiled.
+
+Usage: python -m benchmarks.bench_memory
+"""
+import tracemalloc
+
+from wtforms import TextField
+from wtforms.validators import InputRequired, Length
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+FIELDS = 1000
+
+
+def configure():
+    dynamic = WTFormsDynamicFields()
+    for i in range(FIELDS):
+        name = 'field_%d' % i
+        dynamic.add_field(name, 'Field %d' % i, TextField)
+        dynamic.add_validator(name, InputRequired)
+        dynamic.add_validator(name, Length, max=50,
+                              message='Check %' + name + '%.')
+    return dynamic
+
+
+def main():
+    # Import and warm up everything first, so only the configuration
+    # itself is traced.
+    configure().compile()
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    dynamic = configure()
+    configured = tracemalloc.get_traced_memory()[0]
+    dynamic.compile()
+    compiled = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print('%d fields with 2 validators each' % FIELDS)
+    print('configuration  %7.0f bytes/field' % ((configured - start) / float(FIELDS)))
+    print('+ compiled     %7.0f bytes/field' % ((compiled - start) / float(FIELDS)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+""" Micro-benchmark of the set-suffix field name resolution.
+
+Resolves a fixed number of POST keys against a growing number of
+configured canonical names. The per-key cost should stay flat.
+
+Usage: python -m benchmarks.bench_resolver
+"""
+import timeit
+
+from wtforms_dynamic_fields.resolver import FieldResolver
+
+KEYS = 10000
+
+
+def main():
+    print('canonical names    ns/key (cold)    ns/key (memo)')
+    for count in (10, 100, 1000, 10000):
+        names = ['field_%d_name' % i for i in range(count)]
+        keys = ['%s_%d' % (names[i % count], i) for i in range(KEYS)]
+
+        def run():
+            resolve = FieldResolver(names, maxsize=KEYS).resolve
+            for key in keys:
+                resolve(key)
+
+        resolver = FieldResolver(names, maxsize=KEYS)
+        for key in keys:
+            resolver.resolve(key)
+
+        def run_memo():
+            resolve = resolver.resolve
+            for key in keys:
+                resolve(key)
+
+        cold = min(timeit.repeat(run, number=1, repeat=5)) / KEYS * 1e9
+        memo = min(timeit.repeat(run_memo, number=1, repeat=5)) / KEYS * 1e9
+        print('%15d %16.0f %16.0f' % (count, cold, memo))
+
+
+if __name__ == '__main__':
+    main()
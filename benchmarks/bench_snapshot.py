@@ -0,0 +1,52 @@
+""" Benchmark of the startup time of a large configuration.
+
+Compares, for 1,000 configured fields with two validators each,
+replaying the add_field() and add_validator() calls with loading a
+snapshot of the same configuration, from a dictionary or from JSON.
+Both are also timed together with compiling the configuration,
+which a worker may do upfront as well (before forking, say).
+
+Usage: python -m benchmarks.bench_snapshot
+"""
+import json
+import timeit
+
+from wtforms import TextField
+from wtforms.validators import EqualTo, Length
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+FIELDS = 1000
+
+
+def replay():
+    dynamic = WTFormsDynamicFields()
+    for i in range(FIELDS):
+        name = 'field_%d' % i
+        dynamic.add_field(name, 'Field %d' % i, TextField)
+        dynamic.add_validator(name, Length, min=1, max=50,
+                              message='Check %' + name + '%.')
+        dynamic.add_validator(name, EqualTo, '%field_' + str((i + 1) % FIELDS) + '%')
+    return dynamic
+
+
+def main():
+    snapshot = replay().snapshot()
+    document = json.dumps(snapshot)
+
+    timings = [
+        ('replay add calls', replay),
+        ('from_snapshot(dict)', lambda: WTFormsDynamicFields.from_snapshot(snapshot)),
+        ('from_snapshot(json)', lambda: WTFormsDynamicFields.from_snapshot(document)),
+        ('replay + compile()', lambda: replay().compile()),
+        ('from_snapshot + compile()',
+         lambda: WTFormsDynamicFields.from_snapshot(snapshot).compile()),
+    ]
+    print('%d fields, JSON snapshot of %.1f KiB' % (FIELDS, len(document) / 1024.0))
+    for name, func in timings:
+        seconds = min(timeit.repeat(func, number=1, repeat=7))
+        print('%-26s %9.2f ms' % (name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main()
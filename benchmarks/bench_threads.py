@@ -0,0 +1,101 @@
+""" Throughput of "process()" and "validate()" from many threads.
+
+Runs a fixed number of requests (a POST with 3 set members of 5
+dynamic fields each, in a few shapes) spread over 1, 4, 16 and 64
+threads sharing one configuration, once with the configuration left
+alone and once while another thread keeps adding validators to it.
+With the GIL the throughput stays about level with the thread count;
+a free-threaded CPython lets it scale, since the request path only
+reads the published configuration.
+
+Usage: python -m benchmarks.bench_threads
+"""
+import sys
+import threading
+import time
+
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import InputRequired, EqualTo, Length
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+REQUESTS = 4096
+FIELDS = 5
+MEMBERS = 3
+
+
+class PersonalFile(Form):
+    first_name = TextField('First name', validators=[InputRequired()])
+    last_name = TextField('Last name', validators=[InputRequired()])
+
+
+def configure():
+    dynamic = WTFormsDynamicFields(validator_cache_size=1024)
+    for index in range(FIELDS):
+        name = 'field%d' % index
+        dynamic.add_field(name, name.title(), TextField)
+        dynamic.add_validator(name, InputRequired)
+        dynamic.add_validator(name, EqualTo, '%%field%d%%' % ((index + 1) % FIELDS))
+    return dynamic
+
+
+def posts():
+    """ A few POST shapes, as the users of a site would send them. """
+    result = []
+    for members in range(1, MEMBERS + 1):
+        post = MultiDict([('first_name', 'John'), ('last_name', 'Doe')])
+        for set_number in range(1, members + 1):
+            for index in range(FIELDS):
+                post.add('field%d_%d' % (index, set_number), 'value')
+        result.append(post)
+    return result
+
+
+def throughput(dynamic, threads, update=False):
+    """ Return the requests per second of the given number of threads. """
+    samples = posts()
+    per_thread = REQUESTS // threads
+    stop = threading.Event()
+
+    def request():
+        for number in range(per_thread):
+            dynamic.process(PersonalFile, samples[number % len(samples)]).validate()
+
+    def updates():
+        number = 0
+        while not stop.is_set():
+            dynamic.add_validator('field0', Length, max=100 + number)
+            number += 1
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=request) for _ in range(threads)]
+    writer = threading.Thread(target=updates) if update else None
+    start = time.time()
+    if writer is not None:
+        writer.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration = time.time() - start
+    stop.set()
+    if writer is not None:
+        writer.join()
+    return per_thread * threads / duration
+
+
+def main():
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('GIL enabled: %s' % gil)
+    print('threads    requests/s    requests/s (with updates)')
+    for threads in (1, 4, 16, 64):
+        dynamic = configure()
+        dynamic.process(PersonalFile, posts()[0])
+        steady = throughput(dynamic, threads)
+        updated = throughput(configure(), threads, update=True)
+        print('%7d %13.0f %28.0f' % (threads, steady, updated))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+""" Benchmark of the first request of a freshly forked worker.
+
+Configures a form with 20 dynamic fields, each validated against
+another one, and forks a worker that times its first "process()" and
+"validate()" of a POST with 10 set members per field. Without warmup
+the worker compiles the configuration and builds the form class
+itself; with "warmup()" in the parent (the master of a pre-forking
+server) it starts close to its steady state, the rest being mostly
+the copy-on-write faults of the memory pages the request touches.
+
+Usage: python -m benchmarks.bench_warmup
+"""
+import multiprocessing
+import timeit
+
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import InputRequired, EqualTo, Length
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+FIELDS = 20
+MEMBERS = 10
+
+
+def configure():
+    """ Return a new form and its dynamic configuration. """
+    class PersonalFile(Form):
+        first_name = TextField('First name', validators=[InputRequired()])
+        last_name = TextField('Last name', validators=[InputRequired()])
+
+    dynamic = WTFormsDynamicFields()
+    for index in range(FIELDS):
+        name = 'field%d' % index
+        dynamic.add_field(name, name.title(), TextField)
+        dynamic.add_validator(name, InputRequired)
+        dynamic.add_validator(name, Length, max=50)
+        dynamic.add_validator(name, EqualTo, '%%field%d%%' % ((index + 1) % FIELDS))
+    return PersonalFile, dynamic
+
+
+def shape():
+    return dict(('field%d' % index, MEMBERS) for index in range(FIELDS))
+
+
+def request(form, dynamic):
+    post = MultiDict([('first_name', 'John'), ('last_name', 'Doe')])
+    for key in WTFormsDynamicFields.shape_keys(shape()):
+        post.add(key, 'value')
+    dynamic.process(form, post).validate()
+
+
+def first_request(form, dynamic, queue):
+    queue.put(timeit.timeit(lambda: request(form, dynamic), number=1))
+
+
+def forked(warm):
+    """ Return the duration of the first request of a forked worker. """
+    form, dynamic = configure()
+    if warm:
+        dynamic.warmup(form, [shape()], freeze=True, validate=True)
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    worker = context.Process(target=first_request, args=(form, dynamic, queue))
+    worker.start()
+    duration = queue.get()
+    worker.join()
+    return duration
+
+
+def main():
+    form, dynamic = configure()
+    request(form, dynamic)
+    steady = min(timeit.repeat(lambda: request(form, dynamic), number=1, repeat=20))
+
+    cold = min(forked(False) for _ in range(5))
+    warm = min(forked(True) for _ in range(5))
+    print('first request, cold worker      %8.2f ms' % (cold * 1e3))
+    print('first request, warmed up master %8.2f ms' % (warm * 1e3))
+    print('steady state                    %8.2f ms' % (steady * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+""" Compare two benchmark suite result files.
+
+Prints the relative change of every timing per benchmark point and
+exits with status 1 when any of them got slower by more than the
+threshold, so it can guard a release or a CI job.
+
+Usage: python -m benchmarks.compare BASE.json NEW.json [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+
+METRICS = ('process_s', 'process_cold_s', 'validate_s', 'peak_bytes')
+
+
+def load(path):
+    with open(path) as source:
+        document = json.load(source)
+    return document.get('meta', {}), dict(
+        (entry['name'], entry) for entry in document['results']
+        if 'skipped' not in entry)
+
+
+def compare(base, new, threshold, metrics=METRICS):
+    """ Return a list of (name, metric, base, new, change, regressed). """
+    rows = []
+    for name in sorted(set(base) & set(new)):
+        for metric in metrics:
+            if metric not in base[name] or metric not in new[name]:
+                continue
+            old, current = base[name][metric], new[name][metric]
+            change = (current - old) / old if old else 0.0
+            rows.append((name, metric, old, current, change,
+                         change > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative slowdown (default 0.1)')
+    parser.add_argument('--ignore-memory', action='store_true',
+                        help='do not fail on peak memory growth')
+    options = parser.parse_args(argv)
+
+    base_meta, base = load(options.base)
+    new_meta, new = load(options.new)
+    metrics = METRICS[:-1] if options.ignore_memory else METRICS
+    rows = compare(base, new, options.threshold, metrics)
+
+    print('%s (%s) -> %s (%s)' % (options.base, base_meta.get('revision'),
+                                  options.new, new_meta.get('revision')))
+    for name, metric, old, current, change, regressed in rows:
+        print('%-24s %-15s %12.6g %12.6g %+8.1f%%%s' % (
+            name, metric, old, current, change * 100,
+            '  REGRESSION' if regressed else ''))
+
+    regressions = [row for row in rows if row[-1]]
+    if regressions:
+        print('%d regression(s) above %.0f%%' % (len(regressions),
+                                                 options.threshold * 100))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+""" Benchmark suite for the process() hot path and the subsequent validate().
+
+Every scaling axis is varied on its own, with the other axes at their
+default value, and for each point the suite records:
+
+* process_s: seconds per process() call in the steady state
+  (compiled plan and form class cached)
+* process_cold_s: seconds per process() call with the form class
+  and validator caches cleared before every call
+* validate_s: seconds per validate() call on a processed form
+* peak_bytes: the peak traced memory of one process() + validate()
+
+The results are written as JSON so two revisions can be compared
+with benchmarks.compare. No network access is needed; the
+flask_wtf=True points are skipped when Flask-WTF is not installed.
+
+Usage: python -m benchmarks.suite [--quick] [--output results.json]
+
+Run it from the root of the repository.
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import wtforms
+from webob.multidict import MultiDict
+from wtforms import Form, TextField
+from wtforms.validators import InputRequired, Length, Regexp
+
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+DEFAULTS = {
+    'keys': 0,
+    'members': 10,
+    'validators': 2,
+    'placeholders': 1,
+    'base_fields': 2,
+    'flask_wtf': False,
+}
+
+AXES = {
+    'keys': [0, 100, 1000, 10000],
+    'members': [1, 10, 100, 1000],
+    'validators': [0, 1, 4, 16],
+    'placeholders': [0, 1, 4, 16],
+    'base_fields': [2, 20, 200],
+    'flask_wtf': [False, True],
+}
+
+QUICK_AXES = {
+    'keys': [0, 1000],
+    'members': [1, 100],
+    'validators': [0, 4],
+    'placeholders': [0, 4],
+    'base_fields': [2, 200],
+    'flask_wtf': [False, True],
+}
+
+# The validators cycled through for the validators axis.
+VALIDATORS = [
+    (InputRequired, (), {}),
+    (Length, (), {'min': 1, 'max': 50}),
+    (Regexp, (r'^[\w@. ]*$', ), {}),
+]
+
+
+def base_form(size, flask_wtf=False):
+    """ Return a base form class with the given number of fields. """
+    if flask_wtf:
+        try:
+            from flask_wtf import FlaskForm as BaseClass
+        except ImportError:
+            from flask_wtf import Form as BaseClass
+    else:
+        BaseClass = Form
+    attrs = dict(('base_%d' % i, TextField('Base %d' % i))
+                 for i in range(size))
+    return type('BenchForm', (BaseClass, ), attrs)
+
+
+def scenario(keys, members, validators, placeholders, base_fields, flask_wtf):
+    """ Build the configuration, base form and POST of a scenario.
+
+    Two canonical fields ("email" and "phone") are posted as sets of
+    "members" each. Every field gets "validators" validators whose
+    message holds "placeholders" %field% references. On top of that,
+    "keys" POST keys that are not configured are added.
+    """
+    dynamic = WTFormsDynamicFields(flask_wtf=flask_wtf)
+    for name in ('email', 'phone'):
+        dynamic.add_field(name, name.title(), TextField)
+    refs = ['%email%' if i % 2 == 0 else '%phone%' for i in range(placeholders)]
+    message = 'Check ' + ', '.join(refs) + '.' if refs else 'Invalid.'
+    for name in ('email', 'phone'):
+        for i in range(validators):
+            validator, args, kwargs = VALIDATORS[i % len(VALIDATORS)]
+            kwargs = dict(kwargs, message=message)
+            dynamic.add_validator(name, validator, *args, **kwargs)
+
+    post = MultiDict()
+    for i in range(base_fields):
+        post.add('base_%d' % i, 'value')
+    for number in range(1, members + 1):
+        post.add('email_%d' % number, 'someone%d@mail.mock' % number)
+        post.add('phone_%d' % number, '0612345%03d' % number)
+    for i in range(keys):
+        post.add('unknown_%d' % i, 'noise')
+    return dynamic, base_form(base_fields, flask_wtf), post
+
+
+def per_call(func, min_time):
+    """ Return the best seconds per call of func over a few rounds. """
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(2):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def measure(params, min_time):
+    """ Measure a single scenario, return its result dictionary. """
+    dynamic, form, post = scenario(**params)
+    context = None
+    if params['flask_wtf']:
+        from flask import Flask
+        app = Flask(__name__)
+        app.config.update(WTF_CSRF_ENABLED=False, SECRET_KEY='bench')
+        context = app.test_request_context(method='POST', data=post.mixed())
+        context.push()
+
+    try:
+        def process():
+            return dynamic.process(form, post)
+
+        # Releases before the form class and validator caches have
+        # neither, and are always cold.
+        clear_form_cache = getattr(dynamic, 'clear_form_cache', None)
+        validator_cache = getattr(dynamic, 'validator_cache', None)
+
+        def process_cold():
+            if clear_form_cache is not None:
+                clear_form_cache()
+            if validator_cache is not None:
+                validator_cache.clear()
+            return dynamic.process(form, post)
+
+        processed = process()
+
+        result = {
+            'process_s': per_call(process, min_time),
+            'process_cold_s': per_call(process_cold, min_time),
+            'validate_s': per_call(processed.validate, min_time),
+        }
+
+        tracemalloc.start()
+        process().validate()
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+    finally:
+        if context is not None:
+            context.pop()
+
+
+def revision():
+    """ Return the git revision of the working tree, if any. """
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'],
+            stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(axes, min_time, log=sys.stderr):
+    """ Run every point of every axis, return the results document. """
+    results = []
+    for axis in sorted(axes):
+        for value in axes[axis]:
+            params = dict(DEFAULTS, **{axis: value})
+            name = '%s=%s' % (axis, value)
+            entry = {'name': name, 'axis': axis, 'value': value,
+                     'params': params}
+            if params['flask_wtf'] and importlib.util.find_spec('flask_wtf') is None:
+                entry['skipped'] = 'Flask-WTF is not installed'
+                results.append(entry)
+                log.write('%-24s skipped\n' % name)
+                continue
+            entry.update(measure(params, min_time))
+            results.append(entry)
+            log.write('%-24s process %9.1fus  cold %9.1fus  validate %9.1fus'
+                      '  peak %8.1fKiB\n' % (
+                          name, entry['process_s'] * 1e6,
+                          entry['process_cold_s'] * 1e6,
+                          entry['validate_s'] * 1e6,
+                          entry['peak_bytes'] / 1024.0))
+    return {
+        'meta': {
+            'revision': revision(),
+            'python': platform.python_version(),
+            'wtforms': wtforms.__version__,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='only run the end points of every axis')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='seconds to spend per timing round')
+    parser.add_argument('--output', '-o', default='bench_output.json',
+                        help='where to write the JSON results')
+    options = parser.parse_args(argv)
+
+    document = run(QUICK_AXES if options.quick else AXES, options.min_time)
+    with open(options.output, 'w') as output:
+        json.dump(document, output, indent=2, sort_keys=True)
+    sys.stderr.write('Results written to %s\n' % options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+import sys
+
+# Modules with syntax older Pythons can not even compile.
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append('test_wtforms_dynamic_fields_async.py')
@@ -5,3 +5,9 @@ class SimpleForm(Form):
     """ The basic test form. """
     first_name = TextField("First name", validators=[InputRequired()])
     last_name = TextField("Last name", validators=[InputRequired()])
+
+class CSRFForm(SimpleForm):
+    """ The basic test form with CSRF protection enabled. """
+    class Meta:
+        csrf = True
+        csrf_field_name = 'token'
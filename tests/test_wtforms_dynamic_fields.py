@@ -1,11 +1,12 @@
 from __future__ import absolute_import
 import pytest
 from copy import deepcopy
-from .forms import SimpleForm
+from .forms import SimpleForm, CSRFForm
 from webob.multidict import MultiDict
 from wtforms import TextField
 from wtforms.validators import InputRequired
 from wtforms_dynamic_fields import WTFormsDynamicFields
+from wtforms_dynamic_fields.wtforms_dynamic_fields import base_field_names
 
 """ This test module uses PyTest (py.test command) for its testing. """
 
@@ -220,3 +221,30 @@ def test_long_field_name_replacement(setup):
     assert form.yet_another_34_long_2_name_10_1() == '<input id="yet_another_34_long_2_name_10_1" name="yet_another_34_long_2_name_10_1" type="text" value="">'
     assert form.a_very_long_10_field_name_2() == '<input id="a_very_long_10_field_name_2" name="a_very_long_10_field_name_2" type="text" value="">'
     assert form.yet_another_34_long_2_name_10_2() == '<input id="yet_another_34_long_2_name_10_2" name="yet_another_34_long_2_name_10_2" type="text" value="">'
+
+def test_base_field_names():
+    """ Test the static field names of the base form
+    They match the fields of an actual form instance and
+    include the CSRF field when the form's Meta enables it.
+    """
+    assert base_field_names(SimpleForm) == frozenset(SimpleForm()._fields)
+    assert base_field_names(SimpleForm) is base_field_names(SimpleForm)
+    assert base_field_names(CSRFForm) == frozenset(['first_name', 'last_name', 'token'])
+
+def test_base_fields_are_not_overridden(setup):
+    """ Test POST fields of the base form are left alone
+    No sets - No error situation.
+    A configured field that is also a base form field keeps
+    the base form definition.
+    """
+    post = deepcopy(setup)
+    post.add(u'email', 'foo')
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('first_name','Dynamic first name', TextField)
+    dynamic_form.add_field('email','Email', TextField)
+    form = dynamic_form.process(SimpleForm,
+                                post)
+
+    assert form.first_name.label.text == 'First name'
+    assert form.email.data == 'foo'
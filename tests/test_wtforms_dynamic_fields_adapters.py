@@ -0,0 +1,146 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import (WTFormsDynamicFields, MappingAdapter,
+                                    WebObAdapter, adapt)
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the POST adapters.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    return post
+
+@pytest.fixture(scope="module")
+def payload(request):
+    """ Initiate the same POST as a decoded JSON payload. """
+    return {'first_name': 'John', 'last_name': 'Doe',
+            'phones': [{'mobile': '123456', 'handy': '123456'},
+                       {'mobile': '456789', 'handy': '987654'}]}
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    return dynamic_form
+
+class GetListPost(object):
+    """ The interface of Werkzeug and Django POSTs: unique keys and
+    "getlist".
+    """
+
+    def __init__(self, items):
+        self._items = items
+
+    def getlist(self, key):
+        return [value for item_key, value in self._items if item_key == key]
+
+    def __iter__(self):
+        seen = []
+        for key, value in self._items:
+            if key not in seen:
+                seen.append(key)
+                yield key
+
+    def __len__(self):
+        return len(self._items)
+
+# Below follow the actual tests
+
+def test_adapters_same_form(setup, payload, dynamic_form):
+    """ Test every kind of POST gives the same form
+    Sets - Error situation.
+    """
+    expected = {'mobile_2': ['Please fill in the exact same data as handy_2.']}
+    for post in (deepcopy(setup), GetListPost(list(setup.items())), payload,
+                 dict(setup.items())):
+        form = dynamic_form.process(SimpleForm, post)
+        assert form.validate() == False
+        assert form.errors == expected
+        assert form.data == {'first_name': 'John', 'last_name': 'Doe',
+                             'mobile_1': '123456', 'handy_1': '123456',
+                             'mobile_2': '456789', 'handy_2': '987654'}
+
+    assert dynamic_form.engine(SimpleForm).validate(payload) == expected
+    live = dynamic_form.incremental(SimpleForm)
+    assert live.validate(payload) == False
+    assert live.form.errors == expected
+
+def test_adapter_rows(payload):
+    """ Test rows of a payload are split up front. """
+    post = adapt(payload)
+
+    assert isinstance(post, MappingAdapter)
+    assert list(post.fields()) == [('first_name', None), ('last_name', None),
+                                   ('mobile_1', ('mobile', '1')), ('handy_1', ('handy', '1')),
+                                   ('mobile_2', ('mobile', '2')), ('handy_2', ('handy', '2'))]
+    assert post.getlist('handy_2') == ['987654']
+    assert post.getlist('handy_3') == [] and 'handy_3' not in post
+    assert post.getlist('handy_02') == [] and 'phones' not in post
+    assert MappingAdapter({'mobile': [{'handy': 'x'}]}, start=0).getlist('handy_0') == ['x']
+
+def test_adapter_webob(setup):
+    """ Test WebOb MultiDicts keep their repeated values. """
+    post = deepcopy(setup)
+    post.add('handy_1', '654321')
+    post.add('handy_1', '')
+    adapter = adapt(post)
+
+    assert isinstance(adapter, WebObAdapter)
+    assert adapter.getlist('handy_1') == ['123456', '654321', '']
+    assert adapter.getlist('mobile_2') == ['456789']
+    assert adapter.getlist('handy_3') == []
+    assert 'handy_1' in adapter and 'handy_3' not in adapter
+    assert dict(adapter.items())['handy_1'] == ['123456', '654321', '']
+    with pytest.raises(TypeError):
+        adapt(['not', 'a', 'post'])
+
+def test_adapter_unknown_row_fields(dynamic_form):
+    """ Test row fields that are not configured are rejected. """
+    form = dynamic_form.process(SimpleForm, {'first_name': 'John', 'last_name': 'Doe',
+                                             'phones': [{'mobile': '1', 'handy': '1',
+                                                         'fax': '2'}]})
+    assert sorted(form._fields) == ['first_name', 'handy_1', 'last_name', 'mobile_1']
+    assert form.validate() == True
+
+def test_adapter_json_scalars():
+    """ Test JSON booleans, numbers and nulls are posted as text
+    Sets - Error situation.
+    """
+    from wtforms import BooleanField, IntegerField
+    from wtforms.validators import Length
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('agree','Agree', BooleanField)
+    dynamic_form.add_field('nick','Nick', TextField)
+    dynamic_form.add_validator('nick', Length, max=3)
+    dynamic_form.add_field('age','Age', IntegerField)
+    payload = {'first_name': 'John', 'last_name': 'Doe', 'agree': False,
+               'nick': 12345, 'age': None, 'rows': [{'agree': True, 'age': 42.0}]}
+
+    assert adapt(payload).getlist('agree') == ['false']
+    assert adapt(payload).getlist('age') == [] and 'age' in adapt(payload)
+    form = dynamic_form.process(SimpleForm, payload)
+    assert form.agree.data == False and form.agree_1.data == True
+    assert form.nick.data == '12345'
+    assert form.age.data is None
+    assert form.validate() == False
+    assert form.errors == {'nick': ['Field cannot be longer than 3 characters.'],
+                           'age_1': ['Not a valid integer value']}
@@ -0,0 +1,107 @@
+from __future__ import absolute_import
+import asyncio
+import pytest
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, ValidationError
+from wtforms_dynamic_fields import WTFormsDynamicFields, validate_async
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the asyncio entry points and coroutine validators.
+"""
+
+TAKEN = set(['taken@mail.mock'])
+
+class Unique(object):
+    """ A coroutine validator standing in for a database lookup.
+    Keeps track of how many lookups run at the same time.
+    """
+    running = 0
+    peak = 0
+
+    def __init__(self, message=None):
+        self.message = message
+
+    async def __call__(self, form, field):
+        Unique.running += 1
+        Unique.peak = max(Unique.peak, Unique.running)
+        await asyncio.sleep(0.01)
+        Unique.running -= 1
+        if field.data in TAKEN:
+            raise ValidationError(self.message)
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'')
+    for number in range(1, 9):
+        post.add(u'email_%d' % number,
+                 u'taken@mail.mock' if number % 3 == 0 else u'%d@mail.mock' % number)
+    post.add(u'email_9', u'')
+    return post
+
+@pytest.fixture
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    Unique.peak = 0
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', InputRequired, message='Please fill in %email%.')
+    dynamic_form.add_validator('email', Unique, message='%email% is taken.')
+    return dynamic_form
+
+def run(coroutine):
+    """ Run a coroutine to completion in an event loop of its own. """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+# Below follow the actual tests
+
+def test_validate_async_errors(setup, dynamic_form):
+    """ Test coroutine validators across set members
+    Sets - Error situation.
+    Same error structure as the synchronous path, with the
+    chain stopping at InputRequired for email_9.
+    """
+    async def main():
+        form = await dynamic_form.process_async(SimpleForm, setup)
+        return form, await validate_async(form)
+
+    form, valid = run(main())
+
+    assert valid == False
+    assert form.errors == {'last_name': ['This field is required.'],
+                           'email_3': ['email_3 is taken.'],
+                           'email_6': ['email_6 is taken.'],
+                           'email_9': ['Please fill in email_9.']}
+    assert Unique.peak == 8
+
+def test_validate_async_limit(setup, dynamic_form):
+    """ Test the concurrency limit
+    Sets - Error situation.
+    """
+    form = dynamic_form.process(SimpleForm, setup)
+
+    assert run(validate_async(form, limit=2)) == False
+    assert Unique.peak == 2
+    assert sorted(form.errors) == ['email_3', 'email_6', 'email_9', 'last_name']
+
+def test_validate_async_success(dynamic_form):
+    """ Test coroutine validators on a lazy form
+    Sets - No error situation.
+    """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'email_1', u'free@mail.mock')
+    form = dynamic_form.process(SimpleForm, post, lazy=True)
+
+    assert run(validate_async(form)) == True
+    assert form.errors == {}
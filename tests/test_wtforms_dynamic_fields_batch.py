@@ -0,0 +1,70 @@
+from __future__ import absolute_import
+import pytest
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the batch processing of many POSTs.
+"""
+
+def rows(count):
+    """ Generate POST mockups, every third one has an empty email_2. """
+    for number in range(count):
+        post = MultiDict()
+        post.add(u'first_name', u'John %d' % number)
+        post.add(u'last_name', u'Doe')
+        post.add(u'email_1', u'one@mail.mock')
+        post.add(u'email_2', u'' if number % 3 == 0 else u'two@mail.mock')
+        yield post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', InputRequired, message='Please fill in %email%.')
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_process_many_yields_forms(dynamic_form):
+    """ Test every row gets its own processed form
+    Sets - No error situation.
+    """
+    forms = dynamic_form.process_many(SimpleForm, rows(3))
+
+    assert next(forms).first_name.data == 'John 0'
+    second = next(forms)
+    assert second.first_name.data == 'John 1'
+    assert second.email_2.data == 'two@mail.mock'
+    assert len(list(forms)) == 1
+
+def test_process_many_validate(dynamic_form):
+    """ Test the (index, valid, errors) results
+    Sets - Error situation.
+    """
+    results = list(dynamic_form.process_many(SimpleForm, rows(4), validate=True))
+
+    assert results == [(0, False, {'email_2': ['Please fill in email_2.']}),
+                       (1, True, {}),
+                       (2, True, {}),
+                       (3, False, {'email_2': ['Please fill in email_2.']})]
+
+def test_process_many_shares_form_classes(dynamic_form):
+    """ Test rows with the same shape share their form class. """
+    dynamic_form.clear_form_cache()
+    forms = list(dynamic_form.process_many(SimpleForm, rows(5)))
+
+    assert len(set(type(form) for form in forms)) == 1
+    assert len(dynamic_form.form_cache) == 1
+
+def test_process_many_checks_form():
+    """ Test an invalid form is refused before any row is read. """
+    dynamic_form = WTFormsDynamicFields()
+
+    with pytest.raises(TypeError):
+        next(dynamic_form.process_many(object, rows(1)))
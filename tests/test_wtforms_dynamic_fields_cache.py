@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired
+from wtforms_dynamic_fields import WTFormsDynamicFields
+from wtforms_dynamic_fields.cache import LRUCache
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the caching of generated form classes.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    return post
+
+# Below follow the actual tests
+
+def test_lru_cache_eviction():
+    """ Test LRU eviction and statistics
+    The least recently used entry is dropped when full.
+    """
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.keys() == ['a', 'c']
+    assert cache.get('b') is None
+    assert cache.info() == (1, 1, 1, 2, 2)
+    assert cache.hit_rate == 0.5
+
+def test_same_shape_reuses_form_class(setup):
+    """ Test form class reuse
+    Sets - Error situation.
+    Two POSTs with the same fields but different values share
+    their class, yet are bound and validated independently.
+    """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', InputRequired, message='Please fill in %email%.')
+
+    post = deepcopy(setup)
+    post.add(u'email_1', 'one@mail.mock')
+    post.add(u'email_2', '')
+    first = dynamic_form.process(SimpleForm, post)
+
+    post = deepcopy(setup)
+    post.add(u'email_1', '')
+    post.add(u'email_2', 'two@mail.mock')
+    second = dynamic_form.process(SimpleForm, post)
+
+    assert type(first) is type(second)
+    assert dynamic_form.form_cache.hits == 1
+    assert dynamic_form.form_cache.misses == 1
+    assert first.validate() == False
+    assert second.validate() == False
+    assert first.errors == {'email_2': ['Please fill in email_2.']}
+    assert second.errors == {'email_1': ['Please fill in email_1.']}
+
+def test_different_shape_gets_own_class(setup):
+    """ Test form class per shape
+    A POST with another set of dynamic fields gets its own class.
+    """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+
+    post = deepcopy(setup)
+    post.add(u'email_1', 'one@mail.mock')
+    first = dynamic_form.process(SimpleForm, post)
+    post.add(u'email_2', 'two@mail.mock')
+    second = dynamic_form.process(SimpleForm, post)
+
+    assert type(first) is not type(second)
+    assert 'email_2' not in first
+    assert second.email_2.data == 'two@mail.mock'
+
+def test_form_cache_invalidation(setup):
+    """ Test explicit and configuration driven invalidation. """
+    post = deepcopy(setup)
+    post.add(u'email', '')
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.process(SimpleForm, post)
+    assert len(dynamic_form.form_cache) == 1
+
+    dynamic_form.clear_form_cache(SimpleForm)
+    assert len(dynamic_form.form_cache) == 0
+
+    dynamic_form.process(SimpleForm, post)
+    dynamic_form.add_validator('email', InputRequired)
+    assert len(dynamic_form.form_cache) == 0
+
+    form = dynamic_form.process(SimpleForm, post)
+    assert form.validate() == False
+    assert form.errors['email'] == ['This field is required.']
+
+def test_form_cache_disabled(setup):
+    """ Test a cache size of 0 builds a class on every call. """
+    post = deepcopy(setup)
+    post.add(u'email', '')
+
+    dynamic_form = WTFormsDynamicFields(form_cache_size=0)
+    dynamic_form.add_field('email','Email', TextField)
+    first = dynamic_form.process(SimpleForm, post)
+    second = dynamic_form.process(SimpleForm, post)
+
+    assert type(first) is not type(second)
+    assert len(dynamic_form.form_cache) == 0
+
+def test_form_cache_max_fields(setup):
+    """ Test the classes of large POSTs are not cached
+    Sets - Error situation.
+    """
+    dynamic_form = WTFormsDynamicFields(form_cache_max_fields=3)
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', InputRequired, message='Please fill in %email%.')
+
+    post = deepcopy(setup)
+    for number in range(1, 5):
+        post.add(u'email_%d' % number, '')
+    first = dynamic_form.process(SimpleForm, post)
+    second = dynamic_form.process(SimpleForm, post)
+
+    assert type(first) is not type(second)
+    assert len(dynamic_form.form_cache) == 0
+    assert second.validate() == False
+    assert second.errors['email_4'] == ['Please fill in email_4.']
+
+    post = deepcopy(setup)
+    post.add(u'email_1', '')
+    dynamic_form.process(SimpleForm, post)
+    assert len(dynamic_form.form_cache) == 1
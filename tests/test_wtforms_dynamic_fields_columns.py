@@ -0,0 +1,121 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField, IntegerField, DecimalField
+from wtforms.validators import (InputRequired, Optional, Length, NumberRange,
+                                AnyOf, NoneOf, Regexp)
+from wtforms_dynamic_fields import WTFormsDynamicFields
+from wtforms_dynamic_fields.columns import numpy_out_of_range
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the column-wise validation of set members.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    amounts = ['5', '0', '101', 'many', '', '100', '-3', '42']
+    codes = ['AB1', 'ab1', '', 'XY99', 'Q', 'AB1', 'ZZ9', '1']
+    kinds = ['home', 'boat', 'work', 'home', 'spam', '', 'work', 'home']
+    for number, (amount, code, kind) in enumerate(zip(amounts, codes, kinds)):
+        post.add(u'amount_%d' % (number + 1), amount)
+        post.add(u'code_%d' % (number + 1), code)
+        post.add(u'kind_%d' % (number + 1), kind)
+    post.add(u'price_1', '1.5')
+    post.add(u'price_2', 'cheap')
+    post.add(u'price_3', '99.99')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('amount','Amount', IntegerField)
+    dynamic_form.add_validator('amount', NumberRange, min=1, max=100)
+    dynamic_form.add_field('code','Code', TextField)
+    dynamic_form.add_validator('code', InputRequired, message='Please fill in %code%.')
+    dynamic_form.add_validator('code', Length, max=3)
+    dynamic_form.add_validator('code', Regexp, '^[A-Z]+[0-9]$')
+    dynamic_form.add_field('kind','Kind', TextField)
+    dynamic_form.add_validator('kind', Optional)
+    dynamic_form.add_validator('kind', AnyOf, ['home', 'work', 'spam'])
+    dynamic_form.add_validator('kind', NoneOf, ('spam', ), message='No %kind% please.')
+    dynamic_form.add_field('price','Price', DecimalField)
+    dynamic_form.add_validator('price', NumberRange, max=10)
+    return dynamic_form
+
+def form_errors(dynamic_form, post):
+    """ Return the errors of the form path. """
+    form = dynamic_form.process(SimpleForm, post)
+    form.validate()
+    return form.errors
+
+# Below follow the actual tests
+
+def test_columns_match_form_errors(setup, dynamic_form):
+    """ Test column-wise validation gives the errors of the form path
+    Sets - Error situation.
+    """
+    expected = form_errors(dynamic_form, deepcopy(setup))
+    columns = dynamic_form.engine(SimpleForm, column_size=2).validate(deepcopy(setup))
+    fields = dynamic_form.engine(SimpleForm, column_size=None).validate(deepcopy(setup))
+
+    assert columns == expected
+    assert fields == expected
+    assert expected['amount_4'] == ['Not a valid integer value', 'Number must be between 1 and 100.']
+    assert expected['code_3'] == ['Please fill in code_3.']
+    assert expected['code_5'] == ['Invalid input.']
+    assert expected['kind_5'] == ['No kind_5 please.']
+    assert expected['price_2'] == ['Not a valid decimal value', 'Number must be at most 10.']
+    assert 'kind_6' not in expected
+
+def test_columns_any_of_string():
+    """ Test AnyOf on a string still looks for a substring
+    Sets - Error situation.
+    """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('size','Size', TextField)
+    dynamic_form.add_validator('size', AnyOf, 'SML')
+    data = {'first_name': 'John', 'last_name': 'Doe',
+            'size_1': 'S', 'size_2': 'ML', 'size_3': 'XL'}
+
+    errors = dynamic_form.engine(SimpleForm, column_size=1).validate(data)
+    assert errors == {'size_3': ['Invalid value, must be one of: S, M, L.']}
+    assert errors == form_errors(dynamic_form, MultiDict(data))
+
+def test_columns_many_members():
+    """ Test a large set, past the size at which NumPy is used
+    Sets - Error situation.
+    """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('amount','Amount', IntegerField)
+    dynamic_form.add_validator('amount', NumberRange, min=-50, max=50)
+    post = MultiDict(first_name='John', last_name='Doe')
+    for number in range(1, 501):
+        post.add('amount_%d' % number, str(number % 120 - 60 if number % 7 else 2 ** 60))
+
+    errors = dynamic_form.engine(SimpleForm).validate(post)
+    assert errors == form_errors(dynamic_form, post)
+    assert len(errors) == 145
+
+def test_numpy_out_of_range():
+    """ Test the NumPy range check and the values it leaves alone. """
+    pytest.importorskip('numpy')
+
+    assert numpy_out_of_range([1, None, 2.5, 11, -1], 0, 10) == [False, True, False, True, True]
+    assert numpy_out_of_range([2 ** 60], 0, 10) is None
+    assert numpy_out_of_range([1], 0, 2 ** 60) is None
+
+def test_numpy_imported_on_use():
+    """ Test importing the package leaves NumPy alone. """
+    import subprocess
+    import sys
+    loaded = subprocess.check_output([sys.executable, '-c',
+        'import sys, wtforms_dynamic_fields; print("numpy" in sys.modules)'])
+    assert loaded.strip() == b'False'
@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo, AnyOf
+from wtforms_dynamic_fields import WTFormsDynamicFields
+from wtforms_dynamic_fields.plan import Template, parse_argument, bind_argument
+from wtforms_dynamic_fields.resolver import FieldResolver, MEMO_KEY_LENGTH
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the compiled processing plan and field name resolution.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    return post
+
+# Below follow the actual tests
+
+def test_compile_is_reused_until_configuration_changes():
+    """ Test plan reuse
+    The plan is built once and rebuilt only after
+    the configuration has been altered.
+    """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    plan = dynamic_form.compile()
+
+    assert dynamic_form.compile() is plan
+
+    dynamic_form.add_validator('email', InputRequired)
+    assert dynamic_form.compile() is not plan
+    assert len(dynamic_form.compile().fields['email'].validators) == 1
+
+def test_template_substitution():
+    """ Test pre-parsed %field% templates
+    Placeholders, including the empty one, are suffixed
+    exactly like the former regex substitution did.
+    """
+    template = Template('Fill in %telephone% or %pager% (%%).')
+
+    assert template.names == ('telephone', 'pager', '')
+    assert template.substitute('_12') == 'Fill in telephone_12 or pager_12 (_12).'
+
+def test_nested_template_substitution():
+    """ Test placeholders inside lists, tuples, sets and dictionaries
+    Containers without placeholders are constants, passed on as they are.
+    """
+    argument = parse_argument(['%a%', ('x', '%b% or %a%'), {'message': '%c%', 'n': 1},
+                               set(['%d%']), 7])
+
+    assert argument.names == ('a', 'b', 'a', 'c', 'd')
+    assert bind_argument(argument, '_3') == ['a_3', ('x', 'b_3 or a_3'),
+                                             {'message': 'c_3', 'n': 1},
+                                             set(['d_3']), 7]
+
+    constant = ['a', ('b', {'c': 'd'})]
+    assert parse_argument(constant) is constant
+    assert bind_argument(parse_argument(constant), '_3') is constant
+
+def test_nested_template_processing(setup):
+    """ Test AnyOf with placeholders in its values
+    Sets - Error situation.
+    """
+    post = deepcopy(setup)
+    post.add(u'alias_1', 'mobile_1')
+    post.add(u'alias_2', 'mobile_1')
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('alias','Alias', TextField)
+    dynamic_form.add_validator('alias', AnyOf, ['%mobile%', '%handy%'], message='Pick %mobile% or %handy%.')
+    form = dynamic_form.process(SimpleForm,
+                                post)
+
+    assert form.validate() == False
+    assert form.errors == {'alias_2': ['Pick mobile_2 or handy_2.']}
+
+def test_compiled_plan_after_late_configuration(setup):
+    """ Test processing after the plan was already used
+    Sets - Error situation.
+    Adding a field after a first process() call should be picked up.
+    """
+    post = deepcopy(setup)
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '654321')
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please match %handy%.')
+    form = dynamic_form.process(SimpleForm,
+                                post)
+
+    assert 'handy_1' not in form
+
+    dynamic_form.add_field('handy','Handy', TextField)
+    form = dynamic_form.process(SimpleForm,
+                                post)
+
+    assert form.validate() == False
+    assert form.errors['mobile_1'] == ['Please match handy_1.']
+    assert form.handy_1() == '<input id="handy_1" name="handy_1" type="text" value="654321">'
+
+def test_resolver():
+    """ Test canonical name and set number resolution
+    Exact names win over set members, which keeps canonical
+    names ending in _<digits> unambiguous.
+    """
+    resolver = FieldResolver(['email', 'phone', 'phone_2'])
+
+    assert resolver.resolve('email') == ('email', None)
+    assert resolver.resolve('email_12') == ('email', '12')
+    assert resolver.resolve('phone_2') == ('phone_2', None)
+    assert resolver.resolve('phone_2_1') == ('phone_2', '1')
+    assert resolver.resolve('phone_3') == ('phone', '3')
+    assert resolver.resolve('email_') is None
+    assert resolver.resolve('email_x') is None
+    assert resolver.resolve('pager_1') is None
+
+def test_resolver_memo_is_bounded():
+    """ Test the memo of resolved names stays within its size. """
+    resolver = FieldResolver(['email'], maxsize=10)
+    for number in range(25):
+        assert resolver.resolve('email_%d' % number) == ('email', str(number))
+
+    assert len(resolver._memo) <= 10
+
+def test_resolver_memo_skips_junk():
+    """ Test rejected and very long names are not remembered. """
+    resolver = FieldResolver(['email'], maxsize=10)
+    resolver.resolve('email_1')
+    for number in range(25):
+        assert resolver.resolve('junk_%d' % number) is None
+    long_name = 'email_' + '1' * MEMO_KEY_LENGTH
+    assert resolver.resolve(long_name) == ('email', '1' * MEMO_KEY_LENGTH)
+
+    assert list(resolver._memo) == ['email_1']
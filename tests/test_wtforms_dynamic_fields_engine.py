@@ -0,0 +1,146 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField, IntegerField, SelectField
+from wtforms.validators import (InputRequired, DataRequired, Length, NumberRange,
+                                AnyOf, NoneOf, EqualTo, Regexp, Email,
+                                ValidationError)
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the form-free validation engine against the form path.
+"""
+
+class NoSpaces(object):
+    """ A custom validator, which the engine calls as it is. """
+
+    def __call__(self, form, field):
+        if ' ' in (field.data or ''):
+            raise ValidationError('No spaces in %s.' % field.label.text)
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    post.add(u'email_1', 'john@mail.mock')
+    post.add(u'email_2', 'john@localhost')
+    post.add(u'nickname_1', 'J')
+    post.add(u'nickname_2', 'Johnny Bravo')
+    post.add(u'code_1', 'AB12')
+    post.add(u'code_2', 'ab12')
+    post.add(u'age_1', '42')
+    post.add(u'age_2', 'old')
+    post.add(u'kind_1', 'home')
+    post.add(u'kind_2', 'boat')
+    post.add(u'pet_1', 'cat')
+    post.add(u'pet_2', 'dragon')
+    post.add(u'remark', '   ')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', Email)
+    dynamic_form.add_field('nickname','Nickname', TextField)
+    dynamic_form.add_validator('nickname', Length, min=2, max=8)
+    dynamic_form.add_validator('nickname', NoSpaces)
+    dynamic_form.add_field('code','Code', TextField)
+    dynamic_form.add_validator('code', Regexp, '^[A-Z]+[0-9]+$')
+    dynamic_form.add_field('age','Age', IntegerField)
+    dynamic_form.add_validator('age', NumberRange, min=30, max=40)
+    dynamic_form.add_field('kind','Kind', SelectField, choices=[('home', 'Home'), ('work', 'Work')])
+    dynamic_form.add_field('pet','Pet', TextField)
+    dynamic_form.add_validator('pet', AnyOf, ['cat', 'dog', 'dragon'])
+    dynamic_form.add_validator('pet', NoneOf, ['dragon'])
+    dynamic_form.add_field('remark','Remark', TextField)
+    dynamic_form.add_validator('remark', DataRequired)
+    return dynamic_form
+
+def form_errors(dynamic_form, post):
+    """ Return the errors of the form path. """
+    form = dynamic_form.process(SimpleForm, post)
+    form.validate()
+    return form.errors
+
+# Below follow the actual tests
+
+def test_engine_matches_form_errors(setup, dynamic_form):
+    """ Test the engine gives the errors of the form path
+    Sets - Error situation.
+    """
+    errors = dynamic_form.engine(SimpleForm).validate(deepcopy(setup))
+
+    assert errors == form_errors(dynamic_form, deepcopy(setup))
+    assert sorted(errors) == ['age_1', 'age_2', 'code_2', 'email_2', 'kind_2',
+                              'last_name', 'mobile_2', 'nickname_1', 'nickname_2',
+                              'pet_2', 'remark']
+    assert errors['nickname_2'] == ['Field must be between 2 and 8 characters long.',
+                                    'No spaces in Nickname.']
+
+def test_engine_plain_mapping(setup, dynamic_form):
+    """ Test validating a plain dictionary, as decoded from JSON
+    Sets - Error situation.
+    """
+    data = {'first_name': 'John', 'last_name': ['Doe'],
+            'mobile_3': '1', 'handy_3': '2', 'unknown': 'noise'}
+    engine = dynamic_form.engine(SimpleForm)
+
+    assert engine.validate(data) == {'mobile_3': ['Please fill in the exact same data as handy_3.']}
+    data['handy_3'] = '1'
+    assert engine.validate(data) == {}
+
+    post = MultiDict(data)
+    post.add('handy_3', '3')
+    assert engine.validate(post) == form_errors(dynamic_form, post)
+
+def test_engine_without_form(dynamic_form):
+    """ Test the engine with the dynamic fields alone
+    Sets - Error situation.
+    """
+    engine = dynamic_form.engine()
+
+    assert engine.validate({'handy_1': ''}) == {'handy_1': ['This field is required.']}
+    assert engine.validate({}) == {}
+
+def test_engine_follows_configuration():
+    """ Test the engine picks up configuration changes
+    Sets - Error situation.
+    """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    engine = dynamic_form.engine()
+
+    assert engine.validate({'email_1': ''}) == {}
+    dynamic_form.add_validator('email', InputRequired, message='Please fill in %email%.')
+    assert engine.validate({'email_1': ''}) == {'email_1': ['Please fill in email_1.']}
+
+def test_engine_json_scalars(dynamic_form):
+    """ Test JSON numbers, booleans and nulls are validated as text
+    Sets - Error situation.
+    """
+    data = {'first_name': 'John', 'last_name': 'Doe', 'remark': False,
+            'rows': [{'nickname': 123456789 if number % 2 else 42,
+                      'age': 35 if number % 3 else None,
+                      'pet': True} for number in range(20)]}
+    errors = dynamic_form.engine(SimpleForm).validate(data)
+
+    assert errors == form_errors(dynamic_form, data)
+    assert errors['nickname_2'] == ['Field must be between 2 and 8 characters long.']
+    assert errors['age_1'] == ['Number must be between 30 and 40.']
+    assert errors['pet_1'] == ["Invalid value, must be one of: cat, dog, dragon."]
+    assert 'nickname_1' not in errors and 'age_2' not in errors and 'remark' not in errors
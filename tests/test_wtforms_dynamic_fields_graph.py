@@ -0,0 +1,110 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields, UnknownReferenceError
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the dependency graph of the %field% references.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '')
+    post.add(u'pager_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '')
+    post.add(u'pager_2', '')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', EqualTo, '%pager%', message='Please fill in the exact same data as %pager%.')
+    dynamic_form.add_field('pager','Pager', TextField)
+    dynamic_form.add_validator('pager', InputRequired, message='Please fill in %pager%.')
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_graph_references(dynamic_form):
+    """ Test the graph records the placeholders per canonical field. """
+    graph = dynamic_form.compile().graph
+
+    assert graph.dependencies('mobile', '2') == set(['handy_2'])
+    assert graph.dependencies('handy', '1') == set(['pager_1'])
+    # Referring to itself in the message is no dependency.
+    assert graph.dependencies('pager', '1') == set()
+    # Outside of a set, placeholders are not substituted.
+    assert graph.dependencies('mobile') == set()
+    assert graph.unknown == []
+
+def test_graph_closure(setup, dynamic_form):
+    """ Test the closure follows the references transitively
+    Sets - Error situation.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup))
+    graph = dynamic_form.compile().graph
+
+    assert graph.closure(form, ['mobile_2']) == ['mobile_2', 'handy_2', 'pager_2']
+    assert graph.closure(form, ['pager_1', 'first_name']) == ['pager_1', 'first_name']
+    with pytest.raises(KeyError):
+        graph.closure(form, ['mobile_3'])
+
+def test_validate_fields(setup, dynamic_form):
+    """ Test validating part of the form with its dependencies
+    Sets - Error situation.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup))
+
+    assert dynamic_form.validate_fields(form, ['handy_1']) == False
+    assert form.errors == {'handy_1': ['Please fill in the exact same data as pager_1.']}
+
+    assert dynamic_form.validate_fields(form, ['mobile_2']) == False
+    # The errors of handy_1 stay around.
+    assert form.errors == {'handy_1': ['Please fill in the exact same data as pager_1.'],
+                           'mobile_2': ['Please fill in the exact same data as handy_2.'],
+                           'pager_2': ['Please fill in pager_2.']}
+
+def test_validate_fields_lazy(setup, dynamic_form):
+    """ Test only the relevant fields get bound with lazy binding
+    Sets - Error situation.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), lazy=True)
+
+    assert dynamic_form.validate_fields(form, ['handy_1']) == False
+    assert form._fields.pending == set(['mobile_1', 'mobile_2', 'handy_2', 'pager_2'])
+
+def test_unknown_references():
+    """ Test placeholders referring to fields that were not added. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%')
+
+    assert dynamic_form.unknown_references() == [('mobile', 'EqualTo', 'handy')]
+    # Not an error unless asked for.
+    dynamic_form.compile()
+
+    dynamic_form = WTFormsDynamicFields(strict=True)
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%')
+    with pytest.raises(UnknownReferenceError) as excinfo:
+        dynamic_form.compile()
+    assert excinfo.value.references == [('mobile', 'EqualTo', 'handy')]
+
+    # Adding the field later on is fine.
+    dynamic_form.add_field('handy','Handy', TextField)
+    assert dynamic_form.compile().graph.unknown == []
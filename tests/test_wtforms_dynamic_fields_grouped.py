@@ -0,0 +1,129 @@
+from __future__ import absolute_import
+import sys
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the grouping of set members into rows.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    post.add(u'mobile_3', '')
+    post.add(u'handy_3', '')
+    post.add(u'handy_4', '')
+    post.add(u'email', 'john@mail.mock')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired, message='Please fill in %handy%.')
+    dynamic_form.add_field('email','Email', TextField)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_grouped_same_errors(setup, dynamic_form):
+    """ Test grouped forms validate like flat ones
+    Sets - Error situation.
+    """
+    flat = dynamic_form.process(SimpleForm, deepcopy(setup))
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+
+    assert form.validate() == flat.validate() == False
+    assert form.errors == flat.errors
+    assert form.errors == {'mobile_2': ['Please fill in the exact same data as handy_2.'],
+                           'handy_3': ['Please fill in handy_3.'],
+                           'handy_4': ['Please fill in handy_4.']}
+    assert form.data == flat.data
+
+def test_grouped_rows(setup, dynamic_form):
+    """ Test the rows and sets of a grouped form
+    Sets - Error situation.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+
+    assert list(form._fields) == ['first_name', 'last_name', 'email']
+    assert list(form.rows) == ['1', '2', '3', '4']
+    assert form.rows[2]['mobile'] is form.rows['2']['mobile_2']
+    assert form.rows[2]['mobile'] is form.sets['mobile'][2]
+    assert form.rows[2]['mobile'] is form['mobile_2']
+    assert form.rows[2].data == {'mobile': '456789', 'handy': '987654'}
+    assert 'mobile' not in form.rows[4] and 'handy_4' in form.rows[4]
+    assert 4 not in form.sets['mobile']
+    assert form.sets['handy'][1]() == '<input id="handy_1" name="handy_1" type="text" value="123456">'
+
+    # Set numbers with the same canonical names share a row class.
+    assert type(form.rows[1]) is type(form.rows[3])
+    assert type(form.rows[1]) is not type(form.rows[4])
+    assert type(form).__dict__.get('mobile_1') is None
+
+def test_grouped_form_cache(setup, dynamic_form):
+    """ Test grouped and flat form classes are cached apart. """
+    grouped = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+    flat = dynamic_form.process(SimpleForm, deepcopy(setup))
+
+    assert type(grouped) is not type(flat)
+    assert type(dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)) is type(grouped)
+    with pytest.raises(ValueError):
+        dynamic_form.process(SimpleForm, deepcopy(setup), lazy=True, grouped=True)
+
+def test_grouped_helpers(setup, dynamic_form):
+    """ Test the validation helpers and populate_obj() see the members
+    Sets - Error situation.
+    """
+    from wtforms_dynamic_fields import validate_parallel
+    flat = dynamic_form.process(SimpleForm, deepcopy(setup))
+    flat.validate()
+
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+    assert validate_parallel(form) == False
+    assert form.errors == flat.errors
+
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+    assert dynamic_form.validate_fields(form, ['handy_3', 'mobile_2']) == False
+    assert form.errors == {'mobile_2': ['Please fill in the exact same data as handy_2.'],
+                           'handy_3': ['Please fill in handy_3.']}
+
+    class Person(object):
+        pass
+    person = Person()
+    form.populate_obj(person)
+    assert person.mobile_2 == '456789' and person.email == 'john@mail.mock'
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason='Requires Python 3.5')
+def test_grouped_async(setup, dynamic_form):
+    """ Test validate_async() sees the members
+    Sets - Error situation.
+    """
+    import asyncio
+    from wtforms_dynamic_fields import validate_async
+    flat = dynamic_form.process(SimpleForm, deepcopy(setup))
+    flat.validate()
+
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(validate_async(form)) == False
+    finally:
+        loop.close()
+    assert form.errors == flat.errors
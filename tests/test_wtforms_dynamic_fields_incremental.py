@@ -0,0 +1,119 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the incremental revalidation of live posted forms.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '456789')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    return dynamic_form
+
+def full_errors(dynamic_form, post):
+    """ Return the errors of a full process and validate. """
+    form = dynamic_form.process(SimpleForm, post)
+    form.validate()
+    return form.errors
+
+# Below follow the actual tests
+
+def test_incremental_first_post_validates_all(setup, dynamic_form):
+    """ Test the first POST is processed and validated in full
+    Sets - No error situation.
+    """
+    live = dynamic_form.incremental(SimpleForm)
+
+    assert live.validate(deepcopy(setup)) == True
+    assert set(live.revalidated) == set(['first_name', 'last_name', 'mobile_1',
+                                         'handy_1', 'mobile_2', 'handy_2'])
+
+def test_incremental_revalidates_dependents(setup, dynamic_form):
+    """ Test changing a field revalidates the fields referring to it
+    Sets - Error situation.
+    """
+    live = dynamic_form.incremental(SimpleForm)
+    post = deepcopy(setup)
+    live.validate(post)
+
+    post = deepcopy(setup)
+    post[u'handy_2'] = '987654'
+    assert live.validate(post) == False
+    assert set(live.revalidated) == set(['handy_2', 'mobile_2'])
+    assert live.form.errors == full_errors(dynamic_form, post)
+    assert live.form.errors == {'mobile_2': ['Please fill in the exact same data as handy_2.']}
+
+    post = deepcopy(setup)
+    assert live.validate(post) == True
+    assert live.form.errors == {}
+
+def test_incremental_unrelated_change(setup, dynamic_form):
+    """ Test a change without dependents revalidates that field only
+    Sets - Error situation.
+    """
+    live = dynamic_form.incremental(SimpleForm)
+    live.validate(deepcopy(setup))
+
+    post = deepcopy(setup)
+    post[u'last_name'] = u''
+    assert live.validate(post) == False
+    assert live.revalidated == ('last_name', )
+    assert live.form.last_name.data == u''
+    assert live.form.errors == full_errors(dynamic_form, post)
+
+    # Nothing changed, nothing to do.
+    assert live.validate(post) == False
+    assert live.revalidated == ()
+    assert live.form.errors == full_errors(dynamic_form, post)
+
+def test_incremental_new_set_member(setup, dynamic_form):
+    """ Test a POST with other dynamic fields is processed in full
+    Sets - Error situation.
+    """
+    live = dynamic_form.incremental(SimpleForm)
+    live.validate(deepcopy(setup))
+    previous = live.form
+
+    post = deepcopy(setup)
+    post.add(u'mobile_3', '111')
+    post.add(u'handy_3', '222')
+    assert live.validate(post) == False
+    assert live.form is not previous
+    assert live.form.errors == full_errors(dynamic_form, post)
+
+def test_incremental_lazy(setup, dynamic_form):
+    """ Test incremental revalidation of lazily bound forms
+    Sets - Error situation.
+    """
+    live = dynamic_form.incremental(SimpleForm, lazy=True)
+    live.validate(deepcopy(setup))
+
+    post = deepcopy(setup)
+    post[u'mobile_1'] = '000000'
+    assert live.validate(post) == False
+    assert set(live.revalidated) == set(['mobile_1'])
+    assert live.form.errors == full_errors(dynamic_form, post)
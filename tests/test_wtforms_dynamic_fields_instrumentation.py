@@ -0,0 +1,93 @@
+from __future__ import absolute_import
+import pytest
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields, ProcessStats
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the per-phase timings and counters of process().
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'mobile_2', '654321')
+    post.add(u'handy', '123456')
+    post.add(u'pager_1', '123456')
+    return post
+
+def configure(dynamic_form):
+    """ Add the fields used by these tests. """
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', InputRequired)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Not the same as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_process_record(setup):
+    """ Test the counters and timings of a single call. """
+    records = []
+    dynamic_form = configure(WTFormsDynamicFields(instrument=records.append))
+    form = dynamic_form.process(SimpleForm, setup)
+
+    assert len(records) == 1
+    record = records[0]
+    assert record.form is SimpleForm
+    assert record.counters == {'keys_scanned': 6,
+                               'keys_skipped_base': 2,
+                               'keys_duplicate': 0,
+                               'keys_rejected': 1,
+                               'set_members_bound': 2,
+                               'validators_constructed': 4,
+                               'substitutions': 4,
+                               'form_cache_hits': 0}
+    assert all(seconds > 0 for seconds in record.timings.values())
+    assert record.total >= record.timings['instantiate']
+    assert form.mobile_2.data == '654321'
+
+def test_process_stats(setup):
+    """ Test aggregation over calls with the form class cached. """
+    stats = ProcessStats()
+    dynamic_form = configure(WTFormsDynamicFields(instrument=stats))
+    dynamic_form.process(SimpleForm, setup)
+    dynamic_form.process(SimpleForm, setup)
+
+    assert stats.calls == 2
+    assert stats.counters['keys_scanned'] == 12
+    assert stats.counters['validators_constructed'] == 4
+    assert stats.counters['form_cache_hits'] == 1
+    assert stats.counters['set_members_bound'] == 2
+    assert stats.averages()['instantiate'] > 0
+
+    stats.reset()
+    assert stats.calls == 0
+    assert stats.counters['keys_scanned'] == 0
+
+def test_instrument_disabled_by_default(setup):
+    """ Test nothing is recorded without an instrument. """
+    dynamic_form = configure(WTFormsDynamicFields())
+
+    assert dynamic_form.instrument is None
+    assert dynamic_form.process(SimpleForm, setup).mobile_1.data == '123456'
+
+def test_process_record_duplicates(setup):
+    """ Test repeated keys and lazy binding are counted apart. """
+    records = []
+    dynamic_form = configure(WTFormsDynamicFields(instrument=records.append))
+    post = MultiDict(setup)
+    post.add(u'mobile_1', '123456')
+    dynamic_form.process(SimpleForm, post, lazy=True)
+
+    counters = records[0].counters
+    assert counters['keys_skipped_base'] == 2
+    assert counters['keys_duplicate'] == 1
+    assert counters['set_members_bound'] == 0
@@ -0,0 +1,75 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the lazy binding of dynamic fields.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_lazy_fields_bind_on_access(setup, dynamic_form):
+    """ Test fields stay pending until accessed
+    Sets - No error situation.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), lazy=True)
+
+    assert form._fields.pending == set(['mobile_1', 'handy_1', 'mobile_2', 'handy_2'])
+    assert 'mobile_2' in form
+    assert form.mobile_2.data == '456789'
+    assert form['handy_2']() == '<input id="handy_2" name="handy_2" type="text" value="987654">'
+    assert form._fields.pending == set(['mobile_1', 'handy_1'])
+
+def test_lazy_form_matches_eager_form(setup, dynamic_form):
+    """ Test lazy and eager forms behave the same
+    Sets - Error situation.
+    Validation, errors, data and iteration order are identical.
+    """
+    eager = dynamic_form.process(SimpleForm, deepcopy(setup))
+    lazy = dynamic_form.process(SimpleForm, deepcopy(setup), lazy=True)
+
+    assert [field.name for field in lazy] == [field.name for field in eager]
+    assert lazy.validate() == eager.validate() == False
+    assert lazy.errors == eager.errors
+    assert lazy.errors['mobile_2'] == ['Please fill in the exact same data as handy_2.']
+    assert lazy.data == eager.data
+    assert not lazy._fields.pending
+
+def test_lazy_validation_binds_referenced_fields(setup, dynamic_form):
+    """ Test a validator can reach a pending field through the form
+    Sets - Error situation.
+    EqualTo on mobile_2 looks up handy_2 while it is still pending.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup), lazy=True)
+
+    assert form.mobile_2.validate(form) == False
+    assert form.mobile_2.errors == ['Please fill in the exact same data as handy_2.']
+    assert form._fields.pending == set(['mobile_1', 'handy_1'])
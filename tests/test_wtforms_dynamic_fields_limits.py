@@ -0,0 +1,100 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired
+from wtforms_dynamic_fields import WTFormsDynamicFields, LimitExceededError
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the limits on the dynamic fields of a POST.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'email_1', u'one@mail.mock')
+    post.add(u'email_2', u'two@mail.mock')
+    post.add(u'email_3', u'three@mail.mock')
+    post.add(u'pager', u'123456')
+    post.add(u'unknown', u'noise')
+    return post
+
+def dynamic_form(**limits):
+    """ Initiate the dynamic fields configuration with the given limits. """
+    dynamic_form = WTFormsDynamicFields(**limits)
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', InputRequired)
+    dynamic_form.add_field('pager','Pager', TextField)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_within_limits(setup):
+    """ Test a POST right at the limits is processed
+    Sets - No error situation.
+    """
+    form = dynamic_form(max_post_keys=7, max_fields=4, max_set_members=3,
+                        max_set_number=3).process(SimpleForm, deepcopy(setup))
+    assert form.validate() == True
+    assert form.email_3.data == u'three@mail.mock'
+
+@pytest.mark.parametrize('limit, maximum, field', [
+    ('max_post_keys', 6, None),
+    ('max_fields', 3, 'pager'),
+    ('max_set_members', 2, 'email_3'),
+    ('max_set_number', 2, 'email_3'),
+])
+def test_limit_exceeded(setup, limit, maximum, field):
+    """ Test every limit raises with its name and value
+    Sets - Error situation.
+    """
+    dynamic = dynamic_form(**{limit: maximum})
+    with pytest.raises(LimitExceededError) as excinfo:
+        dynamic.process(SimpleForm, deepcopy(setup))
+    assert excinfo.value.limit == limit
+    assert excinfo.value.maximum == maximum
+    assert excinfo.value.field == field
+    # Rejected before any form class got built.
+    assert len(dynamic.form_cache) == 0
+
+def test_huge_set_number(setup):
+    """ Test very long set numbers are rejected
+    Sets - Error situation.
+    """
+    post = deepcopy(setup)
+    post.add(u'email_' + u'9' * 5000, u'huge@mail.mock')
+    with pytest.raises(LimitExceededError):
+        dynamic_form(max_set_number=1000).process(SimpleForm, post)
+
+    # Leading zeroes do not count.
+    post = deepcopy(setup)
+    post.add(u'email_0004', u'four@mail.mock')
+    form = dynamic_form(max_set_number=4).process(SimpleForm, post)
+    assert form.email_0004.data == u'four@mail.mock'
+
+@pytest.mark.parametrize('field', [u'email_\u00b2', u'email_\u0661', u'email_1\n'])
+def test_non_ascii_set_number(setup, field):
+    """ Test set numbers that are not ASCII digits are rejected
+    Sets - Error situation.
+    """
+    post = MultiDict([(field, u'x')])
+    form = dynamic_form(max_set_number=100).process(SimpleForm, post)
+    assert field not in form
+
+def test_limits_incremental(setup):
+    """ Test the limits apply to incremental revalidation
+    Sets - Error situation.
+    """
+    live = dynamic_form(max_set_members=3).incremental(SimpleForm)
+    live.validate(deepcopy(setup))
+
+    post = deepcopy(setup)
+    post.add(u'email_4', u'four@mail.mock')
+    with pytest.raises(LimitExceededError):
+        live.validate(post)
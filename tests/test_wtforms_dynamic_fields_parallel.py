@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import EqualTo, InputRequired, Length
+from wtforms_dynamic_fields import WTFormsDynamicFields, validate_parallel
+from wtforms_dynamic_fields.parallel import group_fields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the parallel validation of sets.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate a POST mockup with 20 sets, every fourth one invalid. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'')
+    post.add(u'note', u'Way too long for a note')
+    for number in range(1, 21):
+        post.add(u'mobile_%d' % number, u'123456')
+        post.add(u'handy_%d' % number, u'654321' if number % 4 == 0 else u'123456')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('note','Note', TextField)
+    dynamic_form.add_validator('note', Length, max=10)
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_group_fields(setup, dynamic_form):
+    """ Test the partitioning of the fields by set number. """
+    form = dynamic_form.process(SimpleForm, setup)
+    groups = group_fields(form)
+
+    assert groups[None] == ['first_name', 'last_name', 'note']
+    assert groups['3'] == ['mobile_3', 'handy_3']
+    assert len(groups) == 21
+
+def test_thread_pool_matches_serial(setup, dynamic_form):
+    """ Test validation on a thread pool
+    Sets - Error situation.
+    """
+    serial = dynamic_form.process(SimpleForm, setup)
+    parallel = dynamic_form.process(SimpleForm, setup)
+
+    with ThreadPoolExecutor(4) as executor:
+        assert validate_parallel(parallel, executor) == serial.validate() == False
+    assert list(parallel.errors.items()) == list(serial.errors.items())
+    assert parallel.errors['mobile_8'] == ['Please fill in the exact same data as handy_8.']
+    assert 'mobile_7' not in parallel.errors
+
+def test_process_pool_matches_serial(setup, dynamic_form):
+    """ Test validation on a process pool
+    Sets - Error situation.
+    """
+    serial = dynamic_form.process(SimpleForm, setup)
+    parallel = dynamic_form.process(SimpleForm, setup, lazy=True)
+
+    with ProcessPoolExecutor(2) as executor:
+        assert validate_parallel(parallel, executor) == serial.validate() == False
+    assert parallel.errors == serial.errors
+    assert parallel.errors['note'] == ['Field cannot be longer than 10 characters.']
+
+def test_default_executor_success(dynamic_form):
+    """ Test validation without an explicit executor
+    Sets - No error situation.
+    """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', u'123456')
+    post.add(u'handy_1', u'123456')
+    form = dynamic_form.process(SimpleForm, post)
+
+    assert validate_parallel(form, max_workers=2) == True
+    assert form.errors == {}
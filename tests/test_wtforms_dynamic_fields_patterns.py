@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields
+from wtforms_dynamic_fields.resolver import FieldResolver
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the pattern names of canonical field families.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'addr_home', 'Main street 1')
+    post.add(u'addr_work', '')
+    post.add(u'addr_home_2', 'Side street 2')
+    post.add(u'addr_home_extra', 'Ignored')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '654321')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('addr_<kind>','Address', TextField)
+    dynamic_form.add_validator('addr_<kind>', InputRequired, message='Please fill in an address.')
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_pattern_resolver():
+    """ Test resolving names against patterns. """
+    resolver = FieldResolver(['addr', 'addr_<kind>', 'addr_work', 'phone_<kind>_<line>'])
+
+    assert resolver.resolve('addr_home') == ('addr_<kind>', None)
+    assert resolver.resolve('addr_home_3') == ('addr_<kind>', '3')
+    assert resolver.resolve('addr_work') == ('addr_work', None)
+    assert resolver.resolve('addr_work_3') == ('addr_work', '3')
+    assert resolver.resolve('addr_3') == ('addr', '3')
+    assert resolver.resolve('phone_home_fax') == ('phone_<kind>_<line>', None)
+    assert resolver.resolve('phone_home_fax_1') == ('phone_<kind>_<line>', '1')
+    assert resolver.resolve('phone_home') is None
+    assert resolver.resolve('addr__1') is None
+    assert resolver.resolve('addr_home_extra') is None
+
+def test_pattern_fields(setup, dynamic_form):
+    """ Test a pattern configures a whole family of fields
+    Sets - Error situation.
+    """
+    form = dynamic_form.process(SimpleForm, deepcopy(setup))
+
+    assert form.validate() == False
+    assert form.errors == {'addr_work': ['Please fill in an address.'],
+                           'mobile_1': ['Please fill in the exact same data as handy_1.']}
+    assert form.addr_home_2.label.text == 'Address'
+    assert 'addr_home_extra' not in form
+
+    grouped = dynamic_form.process(SimpleForm, deepcopy(setup), grouped=True)
+    assert grouped.validate() == False
+    assert grouped.errors == form.errors
+    assert grouped.sets['addr_home'][2].data == 'Side street 2'
+
+    payload = {'first_name': 'John', 'last_name': 'Doe',
+               'rows': [{'addr_home': 'Main street 1', 'addr_work': '', 'fax': '1'}]}
+    form = dynamic_form.process(SimpleForm, payload)
+    assert sorted(form._fields) == ['addr_home_1', 'addr_work_1', 'first_name', 'last_name']
+
+def test_pattern_references():
+    """ Test placeholders naming a member of a family are known. """
+    dynamic_form = WTFormsDynamicFields(strict=True)
+    dynamic_form.add_field('addr_<kind>','Address', TextField)
+    dynamic_form.add_field('confirm','Confirm', TextField)
+    dynamic_form.add_validator('confirm', EqualTo, '%addr_home%')
+    assert dynamic_form.unknown_references() == []
+
+    post = MultiDict([('addr_home_1', 'a'), ('confirm_1', 'b')])
+    form = dynamic_form.process(SimpleForm, post)
+    form.validate()
+    assert form.errors['confirm_1'] == ['Field must be equal to addr_home_1.']
+
+def test_pattern_malformed():
+    """ Test placeholders have to be whole parts of the name. """
+    dynamic_form = WTFormsDynamicFields()
+    for name in ('addr<kind>', 'addr_<kind', 'addr_<>', 'addr_<kind>s'):
+        with pytest.raises(ValueError):
+            dynamic_form.add_field(name, 'Address', TextField)
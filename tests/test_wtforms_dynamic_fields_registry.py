@@ -0,0 +1,151 @@
+from __future__ import absolute_import
+import threading
+import time
+import pytest
+from wtforms import TextField
+from wtforms.validators import InputRequired
+from wtforms_dynamic_fields import (WTFormsDynamicFields, ConfigRegistry,
+                                    configuration_weight)
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the multi-tenant configuration registry.
+"""
+
+class Loader(object):
+    """ A loader counting its calls, with one field per version. """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, tenant, version):
+        self.calls.append((tenant, version))
+        dynamic_form = WTFormsDynamicFields()
+        for number in range(version or 1):
+            dynamic_form.add_field('email%d' % number, 'Email', TextField)
+            dynamic_form.add_validator('email%d' % number, InputRequired)
+        return dynamic_form
+
+# Below follow the actual tests
+
+def test_registry_loads_once():
+    """ Test configurations are loaded, compiled and kept. """
+    loader = Loader()
+    registry = ConfigRegistry(loader)
+
+    first = registry.get('acme', 1)
+    assert first._plan is not None
+    assert registry.get('acme', 1) is first
+    assert registry.get('acme', 2) is not first
+    assert loader.calls == [('acme', 1), ('acme', 2)]
+    info = registry.info()
+    assert (info.hits, info.misses, info.loads, info.currsize) == (1, 2, 2, 2)
+
+def test_registry_eviction():
+    """ Test the least recently used configuration is dropped. """
+    loader = Loader()
+    registry = ConfigRegistry(loader, maxsize=2)
+
+    registry.get('a')
+    registry.get('b')
+    registry.get('a')
+    registry.get('c')
+    assert ('a', None) in registry
+    assert ('b', None) not in registry
+    assert registry.info().evictions == 1
+
+    registry.invalidate('a')
+    assert len(registry) == 1
+    registry.get('a')
+    assert loader.calls.count(('a', None)) == 2
+
+def test_registry_weight():
+    """ Test the registry bounded by the weight of the configurations. """
+    registry = ConfigRegistry(Loader(), maxsize=9, weigh=configuration_weight)
+
+    registry.get('a', 2)
+    registry.get('b', 2)
+    assert registry.info().currsize == 8
+    registry.get('c', 1)
+    assert ('a', 2) not in registry
+    assert registry.info().currsize == 6
+
+def test_registry_snapshot_loader():
+    """ Test loaders may give snapshots. """
+    snapshot = Loader()('acme', 3).snapshot()
+    registry = ConfigRegistry(lambda tenant, version: snapshot)
+
+    assert sorted(registry.get('acme').compile().fields) == ['email0', 'email1', 'email2']
+
+def test_registry_coalesces_loads():
+    """ Test concurrent misses wait for a single load. """
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader(tenant, version):
+        calls.append(tenant)
+        started.set()
+        release.wait(5)
+        return Loader()(tenant, version)
+
+    registry = ConfigRegistry(loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('acme')))
+               for i in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while registry.coalesced < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ['acme']
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+def test_registry_invalidate_during_load():
+    """ Test a load started before invalidate() is not kept. """
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader(tenant, version):
+        calls.append(tenant)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        return Loader()(tenant, version)
+
+    registry = ConfigRegistry(loader)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(registry.get('acme')))
+    thread.start()
+    started.wait(5)
+    registry.invalidate('acme')
+    # Loads again instead of waiting for the stale load.
+    fresh = registry.get('acme')
+    release.set()
+    thread.join(5)
+
+    assert calls == ['acme', 'acme']
+    assert results[0] is not fresh
+    assert registry.get('acme') is fresh
+    assert registry.info().loads == 2
+
+def test_registry_failure_not_kept():
+    """ Test errors of the loader are raised and not kept. """
+    def loader(tenant, version):
+        raise LookupError(tenant)
+
+    registry = ConfigRegistry(loader)
+    with pytest.raises(LookupError):
+        registry.get('acme')
+    assert registry.info().failures == 1
+    assert len(registry) == 0
+
+    with pytest.raises(TypeError):
+        ConfigRegistry(lambda tenant, version: 42).get('acme')
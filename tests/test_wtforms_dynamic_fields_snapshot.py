@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+import json
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField, SelectField
+from wtforms.validators import InputRequired, EqualTo, AnyOf
+from wtforms_dynamic_fields import WTFormsDynamicFields, SnapshotError
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the configuration snapshots.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    post.add(u'kind', 'home')
+    return post
+
+@pytest.fixture(scope="module")
+def dynamic_form(request):
+    """ Initiate the dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    dynamic_form.add_field('kind','Kind', SelectField, choices=[('home', 'Home'), ('work', 'Work')])
+    dynamic_form.add_validator('kind', AnyOf, ('home', 'work'))
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_snapshot_round_trip(setup, dynamic_form):
+    """ Test a loaded snapshot gives the same configuration
+    Sets - Error situation.
+    """
+    snapshot = json.loads(json.dumps(dynamic_form.snapshot()))
+    loaded = WTFormsDynamicFields.from_snapshot(snapshot)
+
+    assert loaded._dyn_fields == dynamic_form._dyn_fields
+    assert loaded.snapshot() == snapshot
+    assert snapshot['fields']['mobile']['type'] == 'wtforms.fields.simple:TextField'
+
+    form = loaded.process(SimpleForm, deepcopy(setup))
+    assert form.validate() == False
+    assert form.errors == {'mobile_2': ['Please fill in the exact same data as handy_2.']}
+    assert form.kind.choices == [('home', 'Home'), ('work', 'Work')]
+
+def test_snapshot_from_json(dynamic_form):
+    """ Test loading a JSON string and passing the class init options. """
+    loaded = WTFormsDynamicFields.from_snapshot(json.dumps(dynamic_form.snapshot()),
+                                                strict=True, max_fields=10)
+    assert loaded.strict == True
+    assert loaded.max_fields == 10
+    assert loaded.compile().fields['kind'].validators[0].args == (('home', 'work'), )
+
+def test_snapshot_not_importable():
+    """ Test types that can not be imported back are refused. """
+    class LocalField(TextField):
+        pass
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', LocalField)
+    with pytest.raises(SnapshotError):
+        dynamic_form.snapshot()
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('mobile','Mobile', TextField, default=object())
+    with pytest.raises(SnapshotError):
+        dynamic_form.snapshot()
+
+@pytest.mark.parametrize('snapshot', [
+    '{not json',
+    {'version': 0, 'fields': {}},
+    {'version': 1},
+    {'version': 1, 'fields': {'mobile': {'label': 'Mobile'}}},
+    {'version': 1, 'fields': {'mobile': {'label': 'Mobile', 'type': 'wtforms:NoSuchField',
+                                         'args': [], 'kwargs': {}, 'validators': []}}},
+    {'version': 1, 'fields': {'mobile': {'label': 'Mobile', 'type': 'wtforms:TextField',
+                                         'args': [], 'kwargs': {}, 'validators': [
+                                             ['wtforms.validators:EqualTo', {'x': 1}, []]]}}},
+    {'version': 1, 'fields': {'addr_x<kind>': {'label': 'Address', 'type': 'wtforms:TextField',
+                                               'args': [], 'kwargs': {}, 'validators': []}}},
+])
+def test_snapshot_invalid(snapshot):
+    """ Test invalid snapshots are refused. """
+    with pytest.raises(SnapshotError):
+        WTFormsDynamicFields.from_snapshot(snapshot)
@@ -0,0 +1,169 @@
+from __future__ import absolute_import
+import sys
+import threading
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo, Length
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the processing of forms from many threads at once.
+"""
+
+THREADS = 16
+ROUNDS = 30
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    return post
+
+@pytest.fixture
+def switching(request):
+    """ Switch between threads as often as possible. """
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+def configure(**kwargs):
+    """ Return a new dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields(**kwargs)
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    return dynamic_form
+
+def run_threads(target, count=THREADS):
+    """ Run the target in count threads at once, re-raise their errors. """
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def run(index):
+        barrier.wait()
+        try:
+            target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(index, )) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+# Below follow the actual tests
+
+def test_threads_process(setup, switching):
+    """ Test many threads processing the same configuration
+    Sets - Error situation.
+    """
+    dynamic_form = configure(validator_cache_size=16)
+    expected = {'mobile_2': ['Please fill in the exact same data as handy_2.']}
+
+    def request(index):
+        for round in range(ROUNDS):
+            post = deepcopy(setup)
+            # Every thread posts a few shapes of its own.
+            post.add('mobile_%d' % (3 + round % 4), '1')
+            post.add('handy_%d' % (3 + round % 4), '1')
+            lazy = round % 3 == 1
+            grouped = round % 3 == 2
+            form = dynamic_form.process(SimpleForm, post, lazy=lazy, grouped=grouped)
+            assert form.validate() == False
+            assert form.errors == expected
+        assert dynamic_form.engine(SimpleForm).validate(deepcopy(setup)) == expected
+
+    run_threads(request)
+    assert len(dynamic_form.form_cache) == 12
+
+def test_threads_configuration_updates(setup, switching):
+    """ Test requests see a whole configuration while it is changed. """
+    dynamic_form = configure()
+    done = threading.Event()
+
+    def update(index):
+        for number in range(ROUNDS):
+            dynamic_form.add_validator('mobile', Length, max=0, message='v%d' % number)
+            dynamic_form.add_field('extra%d' % number, 'Extra', TextField)
+        done.set()
+
+    def request(index):
+        if index == 0:
+            return update(index)
+        post = deepcopy(setup)
+        for number in range(ROUNDS):
+            post.add('extra%d' % number, 'x')
+        while not done.is_set():
+            form = dynamic_form.process(SimpleForm, post)
+            form.validate()
+            # Both members were built from the same version.
+            errors = form.errors.get('mobile_1', [])
+            assert form.errors.get('mobile_2', [])[1:] == errors
+            assert errors == ['v%d' % number for number in range(len(errors))]
+            extra = [name for name in form._fields if name.startswith('extra')]
+            assert extra == ['extra%d' % number for number in range(len(extra))]
+
+    run_threads(request, 8)
+    form = dynamic_form.process(SimpleForm, deepcopy(setup))
+    form.validate()
+    assert len(form.errors['mobile_1']) == ROUNDS
+
+def test_stale_plan():
+    """ Test a plan or form class of an older configuration, stored by
+    a request that was still running, is not used.
+    """
+    dynamic_form = configure()
+    post = MultiDict([('mobile_1', '1'), ('handy_1', '2')])
+    plan = dynamic_form.compile()
+
+    dynamic_form.add_validator('handy', Length, max=0)
+    stale = dynamic_form._form_class(SimpleForm, plan, post)
+    dynamic_form._plan = plan
+
+    assert dynamic_form.compile() is not plan
+    assert dynamic_form.compile().config is dynamic_form._dyn_fields
+    assert dynamic_form.process(SimpleForm, post).__class__ is not stale
+    assert len(dynamic_form.compile().fields['handy'].validators) == 2
+
+def test_threads_add_field():
+    """ Test fields added from many threads at once are all kept. """
+    dynamic_form = WTFormsDynamicFields()
+
+    def add(index):
+        for number in range(ROUNDS):
+            dynamic_form.add_field('field%d_%d' % (index, number), 'Field', TextField)
+
+    run_threads(add)
+    assert len(dynamic_form.compile().fields) == THREADS * ROUNDS
+
+def test_configuration_copies():
+    """ Test the configuration is only copied once it was compiled. """
+    dynamic_form = WTFormsDynamicFields()
+    config = dynamic_form._dyn_fields
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', InputRequired)
+    assert dynamic_form._dyn_fields is config
+
+    plan = dynamic_form.compile()
+    dynamic_form.add_field('handy','Handy', TextField)
+    assert dynamic_form._dyn_fields is not config
+    assert sorted(plan.config) == ['mobile']
+    config = dynamic_form._dyn_fields
+    dynamic_form.add_validator('handy', InputRequired)
+    assert dynamic_form._dyn_fields is config
+    assert sorted(dynamic_form.compile().fields) == ['handy', 'mobile']
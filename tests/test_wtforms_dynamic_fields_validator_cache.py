@@ -0,0 +1,137 @@
+from __future__ import absolute_import
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import AnyOf, InputRequired, ValidationError
+from wtforms_dynamic_fields import WTFormsDynamicFields, no_validator_cache
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the sharing of bound validator instances.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    return post
+
+@no_validator_cache
+class CountingValidator(object):
+    """ A stateful validator that must not be shared. """
+    def __init__(self, message=None):
+        self.message = message
+        self.calls = 0
+
+    def __call__(self, form, field):
+        self.calls += 1
+        if self.calls > 1:
+            raise ValidationError(self.message)
+
+def unbound_validators(form_class, name):
+    """ Return the validator instances of a generated form class field. """
+    return getattr(form_class, name).kwargs['validators']
+
+# Below follow the actual tests
+
+def test_validators_shared_between_shapes(setup):
+    """ Test validator reuse across form classes
+    Sets - Error situation.
+    The same set member in two shapes gets the same validator
+    instances, while other set numbers get their own.
+    """
+    dynamic_form = WTFormsDynamicFields(validator_cache_size=100)
+    dynamic_form.add_field('hobby','Hobby', TextField)
+    dynamic_form.add_validator('hobby', InputRequired, message='Please fill in %hobby%.')
+    dynamic_form.add_validator('hobby', AnyOf, ['cycling', 'swimming'], message='Only sports.')
+
+    post = deepcopy(setup)
+    post.add(u'hobby_1', 'sleeping')
+    first = dynamic_form.process(SimpleForm, post)
+    post.add(u'hobby_2', '')
+    second = dynamic_form.process(SimpleForm, post)
+
+    first_validators = unbound_validators(type(first), 'hobby_1')
+    assert unbound_validators(type(second), 'hobby_1') == first_validators
+    assert unbound_validators(type(second), 'hobby_2')[0] is not first_validators[0]
+    # AnyOf has no placeholders, so all set members share it.
+    assert unbound_validators(type(second), 'hobby_2')[1] is first_validators[1]
+    assert dynamic_form.validator_cache.hits == 3
+    assert dynamic_form.validator_cache.hit_rate == 0.5
+
+    assert second.validate() == False
+    assert second.errors == {'hobby_1': ['Only sports.'],
+                             'hobby_2': ['Please fill in hobby_2.']}
+
+def test_validator_cache_opt_out(setup):
+    """ Test validators marked with no_validator_cache are not shared. """
+    dynamic_form = WTFormsDynamicFields(validator_cache_size=100)
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', CountingValidator, message='Called twice.')
+
+    post = deepcopy(setup)
+    post.add(u'email_1', '')
+    post.add(u'email_2', '')
+    form = dynamic_form.process(SimpleForm, post)
+
+    assert unbound_validators(type(form), 'email_1')[0] is not \
+        unbound_validators(type(form), 'email_2')[0]
+    assert len(dynamic_form.validator_cache) == 0
+    assert form.validate() == True
+
+def test_validator_cache_disabled_by_default(setup):
+    """ Test the validator cache is opt-in. """
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('email','Email', TextField)
+    dynamic_form.add_validator('email', InputRequired)
+
+    post = deepcopy(setup)
+    post.add(u'email_1', '')
+    post.add(u'email_2', '')
+    form = dynamic_form.process(SimpleForm, post)
+
+    assert unbound_validators(type(form), 'email_1')[0] is not \
+        unbound_validators(type(form), 'email_2')[0]
+    assert dynamic_form.validator_cache.info().currsize == 0
+
+def test_validator_opt_out_across_requests(setup):
+    """ Test validators marked with no_validator_cache are built for
+    every request, although the form classes are cached.
+    """
+    constructed = []
+
+    @no_validator_cache
+    class Tracked(CountingValidator):
+        def __init__(self, message=None):
+            super(Tracked, self).__init__(message)
+            constructed.append(self)
+
+    dynamic_form = WTFormsDynamicFields(validator_cache_size=100)
+    dynamic_form.add_field('x','X', TextField)
+    dynamic_form.add_validator('x', Tracked, message='Called twice.')
+    dynamic_form.add_field('y','Y', TextField)
+    dynamic_form.add_validator('y', InputRequired)
+
+    post = deepcopy(setup)
+    post.add(u'x_1', '')
+    for request in range(3):
+        form = dynamic_form.process(SimpleForm, post)
+        assert form.validate() == True
+    assert len(constructed) == 3
+    assert len(dynamic_form.form_cache) == 0
+
+    engine = dynamic_form.engine(SimpleForm)
+    for request in range(3):
+        assert engine.validate(post) == {}
+    assert len(constructed) == 6
+
+    # Shapes without such validators are still cached.
+    post = deepcopy(setup)
+    post.add(u'y_1', 'y')
+    dynamic_form.process(SimpleForm, post)
+    assert type(dynamic_form.process(SimpleForm, post)) is type(dynamic_form.process(SimpleForm, post))
+    assert len(dynamic_form.form_cache) == 1
@@ -283,3 +283,23 @@ def test_validator_anyof_error_multiple(setup):
     assert form.hobby_2() == '<input id="hobby_2" name="hobby_2" type="text" value="eating">'
     assert form.hobby_3() == '<input id="hobby_3" name="hobby_3" type="text" value="swimming">'
     assert form.hobby_4() == '<input id="hobby_4" name="hobby_4" type="text" value="gaming">'
+
+def test_validator_same_class_twice(setup):
+    """ Test two validators of the same class on one field
+    Sets - Error situation.
+    Both Length validators apply, each with its own arguments.
+    """
+    post = deepcopy(setup)
+    post.add(u'nickname_1', 'J')
+    post.add(u'nickname_2', 'Johnny Bravo')
+
+    dynamic_form = WTFormsDynamicFields()
+    dynamic_form.add_field('nickname','Nickname', TextField)
+    dynamic_form.add_validator('nickname', Length, min=2, message='Too short.')
+    dynamic_form.add_validator('nickname', Length, max=8, message='Too long.')
+    form = dynamic_form.process(SimpleForm,
+                                post)
+
+    assert form.validate() == False
+    assert form.errors['nickname_1'] == ['Too short.']
+    assert form.errors['nickname_2'] == ['Too long.']
@@ -0,0 +1,111 @@
+from __future__ import absolute_import
+import gc
+import pytest
+from copy import deepcopy
+from .forms import SimpleForm
+from webob.multidict import MultiDict
+from wtforms import TextField
+from wtforms.validators import InputRequired, EqualTo
+from wtforms_dynamic_fields import WTFormsDynamicFields
+
+""" This test module uses PyTest (py.test command) for its testing.
+
+Testing the warmup of form shapes.
+"""
+
+@pytest.fixture(scope="module")
+def setup(request):
+    """ Initiate the basic POST mockup. """
+    post = MultiDict()
+    post.add(u'first_name',u'John')
+    post.add(u'last_name',u'Doe')
+    post.add(u'comment', u'Hello')
+    post.add(u'mobile_1', '123456')
+    post.add(u'handy_1', '123456')
+    post.add(u'mobile_2', '456789')
+    post.add(u'handy_2', '987654')
+    return post
+
+def configure(**kwargs):
+    """ Return a new dynamic fields configuration. """
+    dynamic_form = WTFormsDynamicFields(**kwargs)
+    dynamic_form.add_field('comment','Comment', TextField)
+    dynamic_form.add_field('mobile','Mobile', TextField)
+    dynamic_form.add_validator('mobile', EqualTo, '%handy%', message='Please fill in the exact same data as %handy%.')
+    dynamic_form.add_field('handy','Handy', TextField)
+    dynamic_form.add_validator('handy', InputRequired)
+    return dynamic_form
+
+# Below follow the actual tests
+
+def test_shape_keys():
+    """ Test the POST keys of the shapes. """
+    assert WTFormsDynamicFields.shape_keys(['handy_1', 'mobile_1']) == ['handy_1', 'mobile_1']
+    shape = [('mobile', 2), ('comment', None), ('handy', 3)]
+    assert WTFormsDynamicFields.shape_keys(MultiDict(shape)) == [
+        'comment', 'mobile_1', 'handy_1', 'mobile_2', 'handy_2', 'handy_3']
+    assert WTFormsDynamicFields.shape_keys({}) == []
+
+def test_warmup_form_cache(setup):
+    """ Test the first request of a warmed up shape is a cache hit
+    Sets - Error situation.
+    """
+    dynamic_form = configure()
+    shape = MultiDict([('comment', None), ('mobile', 2), ('handy', 2)])
+    classes = dynamic_form.warmup(SimpleForm, [shape, ['mobile_1']])
+
+    assert len(classes) == 2 and dynamic_form._plan is not None
+    assert dynamic_form.form_cache.info().currsize == 2
+    hits = dynamic_form.form_cache.hits
+
+    form = dynamic_form.process(SimpleForm, deepcopy(setup))
+    assert form.__class__ is classes[0]
+    assert dynamic_form.form_cache.hits == hits + 1
+    assert form.validate() == False
+    assert form.errors == {'mobile_2': ['Please fill in the exact same data as handy_2.']}
+
+def test_warmup_modes(setup):
+    """ Test warming up lazy and grouped forms and the validator cache. """
+    dynamic_form = configure(validator_cache_size=64)
+    lazy, = dynamic_form.warmup(SimpleForm, [['mobile_1', 'handy_1']], lazy=True)
+    grouped, = dynamic_form.warmup(SimpleForm, [['mobile_1', 'handy_1']], grouped=True)
+    assert dynamic_form.validator_cache.info().currsize > 0
+
+    post = MultiDict([('first_name', 'John'), ('last_name', 'Doe'),
+                      ('mobile_1', '1'), ('handy_1', '2')])
+    assert dynamic_form.process(SimpleForm, post, lazy=True).__class__ is lazy
+    form = dynamic_form.process(SimpleForm, post, grouped=True)
+    assert form.__class__ is grouped
+    assert form.validate() == False
+
+    with pytest.raises(ValueError):
+        dynamic_form.warmup(SimpleForm, [], lazy=True, grouped=True)
+    with pytest.raises(TypeError):
+        dynamic_form.warmup(object, [])
+
+@pytest.mark.skipif(not hasattr(gc, 'freeze'), reason='Requires gc.freeze()')
+def test_warmup_freeze():
+    """ Test the warmed up objects can be frozen. """
+    dynamic_form = configure()
+    try:
+        dynamic_form.warmup(SimpleForm, [{'mobile': 1}], freeze=True)
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+def test_warmup_validate_opt_in():
+    """ Test validators only run during warmup when asked for. """
+    calls = []
+
+    class Lookup(object):
+        """ A validator doing I/O, a database lookup say. """
+        def __call__(self, form, field):
+            calls.append(field.name)
+
+    dynamic_form = configure()
+    dynamic_form.add_validator('comment', Lookup)
+    dynamic_form.warmup(SimpleForm, [{'comment': None}])
+    assert calls == []
+
+    dynamic_form.warmup(SimpleForm, [{'comment': None}], validate=True)
+    assert calls == ['comment']
@@ -1,4 +1,17 @@
 from __future__ import absolute_import
+import sys
 from .wtforms_dynamic_fields import WTFormsDynamicFields
+from .adapters import (PostAdapter, GetListAdapter, WebObAdapter,
+                       MappingAdapter, adapt)
+from .cache import no_validator_cache
+from .engine import ValidationEngine
+from .exceptions import LimitExceededError, SnapshotError, UnknownReferenceError
+from .graph import DependencyGraph
+from .incremental import IncrementalForm
+from .instrumentation import ProcessRecord, ProcessStats
+from .parallel import validate_parallel
+from .registry import ConfigRegistry, configuration_weight
+if sys.version_info >= (3, 5):
+    from .asynchronous import validate_async
 
 __version__ = '0.1a3'
@@ -0,0 +1,238 @@
+""" Adapters reading the POST of the common request types as they are.
+
+Every adapter offers the same read-only interface:
+
+- "fields()" yields each posted key together with its (canonical name,
+  set number) when the adapter already knows it, or None when the key
+  still has to be resolved,
+- "getlist(key)", "in", "len" and iteration, which is all WTForms needs
+  of its form data, so the adapter is passed to the form as it is.
+
+The request data is never copied into another MultiDict.
+"""
+from numbers import Number
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+from .plan import string_types
+from .resolver import is_set_number
+
+# Tells a missing key from a key posted with None as its value.
+MISSING = object()
+
+text_type = type(u'')
+
+
+def form_text(value):
+    """ Return a decoded JSON value the way a browser would have posted
+    it: booleans as "true" or "false" (the latter being one of the
+    "false_values" of a BooleanField) and numbers as their text. Null
+    is None, for no value at all. Strings and anything else are
+    returned as they are.
+    """
+    if value is None or isinstance(value, string_types):
+        return value
+    if isinstance(value, bool):
+        return u'true' if value else u'false'
+    if isinstance(value, Number):
+        return text_type(value)
+    return value
+
+
+class PostAdapter(object):
+    """ Base class of the adapters. Wraps the request data as it is. """
+
+    __slots__ = ('data', )
+
+    def __init__(self, data):
+        self.data = data
+
+    def fields(self):
+        """ Yield (key, split) tuples for the posted keys, in order,
+        "split" being the (canonical name, set number) of the key or
+        None when it is not known.
+        """
+        for key in self.data:
+            yield key, None
+
+    def getlist(self, key):
+        raise NotImplementedError
+
+    def items(self):
+        """ Yield every (key, list of values) once. """
+        seen = set()
+        for key, split in self.fields():
+            if key not in seen:
+                seen.add(key)
+                yield key, self.getlist(key)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return (key for key, split in self.fields())
+
+    def __len__(self):
+        return len(self.data)
+
+
+class GetListAdapter(PostAdapter):
+    """ Werkzeug MultiDict and ImmutableMultiDict, Django QueryDict or
+    anything else with a "getlist" method.
+    """
+
+    __slots__ = ()
+
+    def getlist(self, key):
+        return self.data.getlist(key)
+
+
+class WebObAdapter(PostAdapter):
+    """ WebOb MultiDict and NestedMultiDict.
+
+    Looking a key up in these scans all items, so on the first lookup
+    the values are indexed by key (the index refers to the values, it
+    does not copy them). Most keys are posted once, so the index holds
+    their value as it is and only keeps lists for the repeated keys.
+    """
+
+    __slots__ = ('_index', '_repeated')
+
+    def __init__(self, data):
+        self.data = data
+        self._index = None
+        self._repeated = None
+
+    def fields(self):
+        for key in self.data.keys():
+            yield key, None
+
+    def index(self):
+        """ Return the first value of the MultiDict by key. """
+        index = self._index
+        if index is None:
+            index = self._index = {}
+            repeated = self._repeated = {}
+            for key, value in self.data.items():
+                if key not in index:
+                    index[key] = value
+                elif key in repeated:
+                    repeated[key].append(value)
+                else:
+                    repeated[key] = [index[key], value]
+        return index
+
+    def getlist(self, key):
+        value = self.index().get(key, MISSING)
+        if value is MISSING:
+            return []
+        return self._repeated.get(key) or [value]
+
+    def __contains__(self, key):
+        return key in self.index()
+
+
+class MappingAdapter(PostAdapter):
+    """ A plain mapping, a decoded JSON object for example.
+
+    Values that are lists or tuples are the values posted for their
+    key, anything else its single value. Scalars are turned into the
+    text a browser would post (see form_text()), so the fields get the
+    same data as for a form POST; a null value is no value at all.
+    Lists of mappings are rows of set members, numbered from "start":
+    the payload
+
+        {"first_name": "John",
+         "phones": [{"mobile": "1", "handy": "1"},
+                    {"mobile": "2", "handy": "3"}]}
+
+    posts mobile_1, handy_1, mobile_2 and handy_2. The rows are handed
+    over already split into canonical name and set number, so they
+    never have to be parsed apart again. The key of the list itself
+    ("phones") is not posted.
+    """
+
+    __slots__ = ('start', '_rows', '_row_keys')
+
+    def __init__(self, data, start=1):
+        self.data = data
+        self.start = start
+        self._rows = None
+        self._row_keys = None
+
+    @staticmethod
+    def is_rows(value):
+        return (isinstance(value, list) and len(value) > 0 and
+                all(isinstance(row, Mapping) for row in value))
+
+    def rows(self):
+        """ Return the lists of rows in the mapping. """
+        rows = self._rows
+        if rows is None:
+            row_keys = [key for key, value in self.data.items() if self.is_rows(value)]
+            rows = self._rows = [self.data[key] for key in row_keys]
+            self._row_keys = frozenset(row_keys)
+        return rows
+
+    def fields(self):
+        start = self.start
+        for key, value in self.data.items():
+            if self.is_rows(value):
+                for number, row in enumerate(value, start):
+                    set_number = str(number)
+                    for cname in row:
+                        yield cname + '_' + set_number, (cname, set_number)
+            else:
+                yield key, None
+
+    def _value(self, key):
+        """ Return the value posted for a key, raise KeyError if none. """
+        rows = self.rows()
+        value = self.data.get(key, MISSING)
+        if value is not MISSING and key not in self._row_keys:
+            return value
+        if rows:
+            cname, sep, set_number = key.rpartition('_')
+            if sep and is_set_number(set_number):
+                number = int(set_number) - self.start
+                if number >= 0 and str(number + self.start) == set_number:
+                    for row_list in rows:
+                        if number < len(row_list):
+                            value = row_list[number].get(cname, MISSING)
+                            if value is not MISSING:
+                                return value
+        raise KeyError(key)
+
+    def getlist(self, key):
+        try:
+            value = self._value(key)
+        except KeyError:
+            return []
+        values = value if isinstance(value, (list, tuple)) else (value, )
+        return [form_text(value) for value in values if value is not None]
+
+    def __contains__(self, key):
+        try:
+            self._value(key)
+        except KeyError:
+            return False
+        return True
+
+
+def adapt(post):
+    """ Return the PostAdapter for the request data.
+
+    :param post:
+        A PostAdapter, a WebOb or Werkzeug MultiDict (or anything with
+        a "getlist" method) or a plain mapping
+    """
+    if isinstance(post, PostAdapter):
+        return post
+    if hasattr(post, 'getall'):
+        return WebObAdapter(post)
+    if hasattr(post, 'getlist'):
+        return GetListAdapter(post)
+    if isinstance(post, Mapping):
+        return MappingAdapter(post)
+    raise TypeError('Can not read the POST variables of {0!r}.'.format(post))
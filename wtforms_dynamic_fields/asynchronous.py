@@ -0,0 +1,116 @@
+""" Asyncio support, for validators that are coroutines.
+
+Kept in a module of its own as it needs Python 3.5 or later.
+"""
+import asyncio
+import inspect
+import itertools
+
+from wtforms.validators import StopValidation
+
+from .grouped import field_names
+
+
+def is_async_validator(validator):
+    """ Return whether calling the validator gives a coroutine. """
+    return (inspect.iscoroutinefunction(validator) or
+            inspect.iscoroutinefunction(getattr(validator, '__call__', None)))
+
+
+async def process_async(dynamic, form, post, lazy=False):
+    """ See WTFormsDynamicFields.process_async(). """
+    return dynamic.process(form, post, lazy)
+
+
+async def run_validation_chain(field, form, validators):
+    """ Field._run_validation_chain(), awaiting coroutine validators. """
+    for validator in validators:
+        try:
+            result = validator(form, field)
+            if inspect.isawaitable(result):
+                await result
+        except StopValidation as e:
+            if e.args and e.args[0]:
+                field.errors.append(e.args[0])
+            return True
+        except ValueError as e:
+            field.errors.append(e.args[0])
+    return False
+
+
+async def validate_field(field, form, extra_validators=()):
+    """ Field.validate(), awaiting coroutine validators. """
+    field.errors = list(field.process_errors)
+    stop_validation = False
+
+    try:
+        field.pre_validate(form)
+    except StopValidation as e:
+        if e.args and e.args[0]:
+            field.errors.append(e.args[0])
+        stop_validation = True
+    except ValueError as e:
+        field.errors.append(e.args[0])
+
+    if not stop_validation:
+        chain = itertools.chain(field.validators, extra_validators)
+        stop_validation = await run_validation_chain(field, form, chain)
+
+    try:
+        field.post_validate(form, stop_validation)
+    except ValueError as e:
+        field.errors.append(e.args[0])
+
+    return len(field.errors) == 0
+
+
+async def validate_async(form, limit=None, extra_validators=None):
+    """ Validate a processed form, awaiting coroutine validators.
+
+    Fields without coroutine validators are validated as usual.
+    The others, typically the members of a set, are validated
+    concurrently, each running its own validators one after the
+    other like WTForms does. The errors end up on the fields, so
+    "form.errors" has the same structure as after "form.validate()".
+
+    :param form:
+        A form returned by WTFormsDynamicFields.process()
+    :param limit:
+        The maximum number of fields validated at the same time,
+        None for no limit.
+    :param extra_validators:
+        A dictionary of extra validators per field name, as
+        accepted by BaseForm.validate().
+    Returns True if no errors occur.
+    """
+    fields = [(name, form[name]) for name in field_names(form)]
+    # Gather the inline validators like Form.validate() does.
+    extra = {}
+    for name, field in fields:
+        inline = getattr(form.__class__, 'validate_%s' % name, None)
+        if inline is not None:
+            extra[name] = [inline]
+    for name, validators in (extra_validators or {}).items():
+        extra[name] = list(extra.get(name, ())) + list(validators)
+
+    form._errors = None
+    success = True
+    pending = []
+    for name, field in fields:
+        validators = list(itertools.chain(field.validators, extra.get(name, ())))
+        if any(is_async_validator(validator) for validator in validators):
+            pending.append((field, extra.get(name, ())))
+        elif not field.validate(form, extra.get(name, ())):
+            success = False
+
+    semaphore = asyncio.Semaphore(limit) if limit else None
+
+    async def run(field, extra_validators):
+        if semaphore is None:
+            return await validate_field(field, form, extra_validators)
+        async with semaphore:
+            return await validate_field(field, form, extra_validators)
+
+    results = await asyncio.gather(*[run(field, extra_validators)
+                                     for field, extra_validators in pending])
+    return success and all(results)
@@ -0,0 +1,158 @@
+import threading
+from collections import namedtuple
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+
+CacheInfo = namedtuple('CacheInfo',
+                       ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+# The attribute custom validators can set to False to opt out of
+# the validator cache, see no_validator_cache().
+CACHEABLE_ATTRIBUTE = 'dynamic_fields_cacheable'
+
+
+def no_validator_cache(validator):
+    """ Mark a validator as not safe to share between fields.
+
+    Use this (as a class decorator, for example) on validators that
+    keep state between calls. They will be built anew for each
+    field even when the validator cache is enabled.
+    """
+    setattr(validator, CACHEABLE_ATTRIBUTE, False)
+    return validator
+
+
+def is_cacheable(validator):
+    """ Return whether validator instances may be shared. """
+    return getattr(validator, CACHEABLE_ATTRIBUTE, True)
+
+
+def freeze(value):
+    """ Return a hashable representation of value for use in cache keys.
+
+    Lists, tuples, sets and dictionaries are frozen recursively. Every
+    value is paired with its type so that, for example, 1, 1.0 and True
+    or a list and a tuple with the same items give different keys.
+    Raises TypeError for values that can not be hashed.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(item) for item in value))
+    if isinstance(value, dict):
+        return (type(value), frozenset((key, freeze(item))
+                                       for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(freeze(item) for item in value))
+    hash(value)
+    return (type(value), value)
+
+
+class LRUCache(object):
+    """ A small, thread-safe least recently used cache.
+
+    Keeps at most "maxsize" entries, dropping the one that was used
+    the longest time ago when full. A maxsize of 0 disables the cache
+    (nothing is stored) and a maxsize of None lets it grow unbounded.
+
+    The hits, misses and evictions are counted so the effectiveness
+    of the cache can be inspected with "info()" or "hit_rate".
+
+    When a "weigh" callable is given, the entries count for the weight
+    it returns for their value (an estimate of their memory use, say)
+    instead of one each, and "maxsize" bounds their total weight. The
+    most recently stored entry is always kept, however heavy it is.
+    """
+
+    def __init__(self, maxsize=128, weigh=None):
+        self.maxsize = maxsize
+        self.weigh = weigh
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.weight = 0
+        self._data = OrderedDict()
+        self._weights = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """ Return the cached value for key and mark it as most
+        recently used, or default when it is not cached.
+        """
+        with self._lock:
+            try:
+                # Python 2 has no move_to_end(), so pop and re-insert
+                # to move the entry to the most recently used end.
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """ Store value under key, evicting the least recently
+        used entries if the cache is full.
+        """
+        if self.maxsize == 0:
+            return
+        weight = 1 if self.weigh is None else self.weigh(value)
+        with self._lock:
+            self._remove(key)
+            self._data[key] = value
+            self._weights[key] = weight
+            self.weight += weight
+            if self.maxsize is not None:
+                while self.weight > self.maxsize and len(self._data) > 1:
+                    self._remove(next(iter(self._data)))
+                    self.evictions += 1
+
+    def _remove(self, key):
+        """ Remove key, if cached, and return its value. Call this with
+        the lock held.
+        """
+        self.weight -= self._weights.pop(key, 0)
+        return self._data.pop(key, None)
+
+    def pop(self, key, default=None):
+        """ Remove key from the cache and return its value. """
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)
+
+    def discard(self, predicate):
+        """ Remove all entries whose key matches the predicate. """
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                self._remove(key)
+
+    def clear(self):
+        """ Remove all entries. The counters are kept. """
+        with self._lock:
+            self._data.clear()
+            self._weights.clear()
+            self.weight = 0
+
+    def keys(self):
+        """ Return the cached keys, least recently used first. """
+        with self._lock:
+            return list(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def hit_rate(self):
+        """ The fraction of lookups that were served from the cache. """
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def info(self):
+        """ Return the cache statistics as a CacheInfo tuple. """
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.maxsize, self.weight)
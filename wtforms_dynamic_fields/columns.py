@@ -0,0 +1,190 @@
+""" Column-wise validation of the members of a set.
+
+The members of a set get the same validators, so rather than running
+the validators of one member after the other, each validator is run
+over the data of all members at once: a column. The errors are the
+same, per member and in the same order, as validating the members one
+by one gives.
+"""
+from wtforms.validators import AnyOf, NoneOf, NumberRange, Regexp
+from .compat import integer_types, string_types
+
+REAL_TYPES = integer_types + (float, )
+
+# Columns shorter than this are not worth converting to an array.
+NUMPY_MIN_SIZE = 64
+# Integers beyond this can not be compared exactly as float64.
+EXACT_FLOAT_LIMIT = 2 ** 53
+
+# NumPy is imported on first use, see numpy_module(): False until then,
+# None when it is not installed.
+numpy = False
+
+
+def numpy_module():
+    """ Return the numpy module, or None when it is not installed.
+    Importing it takes a while, so only the columns that are long
+    enough to use it pay for it.
+    """
+    global numpy
+    if numpy is False:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+    return numpy
+
+
+def numpy_out_of_range(values, minimum, maximum):
+    """ Return, per value, whether it is missing or out of the range
+    as a list, or None when the values can not be compared exactly
+    as float64 (very large integers, Decimals...) or NumPy is not
+    installed.
+    """
+    for bound in (minimum, maximum):
+        if bound is not None and (type(bound) not in REAL_TYPES or
+                                  not -EXACT_FLOAT_LIMIT <= bound <= EXACT_FLOAT_LIMIT):
+            return None
+    numbers = []
+    missing = []
+    for value in values:
+        if value is None:
+            numbers.append(0)
+            missing.append(True)
+        elif type(value) in REAL_TYPES and -EXACT_FLOAT_LIMIT <= value <= EXACT_FLOAT_LIMIT:
+            numbers.append(value)
+            missing.append(False)
+        else:
+            return None
+    np = numpy_module()
+    if np is None:
+        return None
+    column = np.array(numbers, dtype=np.float64)
+    failed = np.array(missing, dtype=bool)
+    if minimum is not None:
+        failed |= column < minimum
+    if maximum is not None:
+        failed |= column > maximum
+    return failed.tolist()
+
+
+def number_range_column(validator, fields):
+    """ NumberRange over a column, with NumPy when it is installed. """
+    minimum, maximum = validator.min, validator.max
+    values = [field.data for field in fields]
+    failed = None
+    if len(values) >= NUMPY_MIN_SIZE:
+        failed = numpy_out_of_range(values, minimum, maximum)
+    if failed is None:
+        failed = [data is None or (minimum is not None and data < minimum) or
+                  (maximum is not None and data > maximum) for data in values]
+    if not any(failed):
+        return True
+    message = validator.message
+    if message is None:
+        if maximum is None:
+            message = fields[0].gettext('Number must be at least %(min)s.')
+        elif minimum is None:
+            message = fields[0].gettext('Number must be at most %(max)s.')
+        else:
+            message = fields[0].gettext('Number must be between %(min)s and %(max)s.')
+    message = message % dict(min=minimum, max=maximum)
+    for field, failure in zip(fields, failed):
+        if failure:
+            field.errors.append(message)
+    return True
+
+
+def membership_column(validator, fields, expected, default_message):
+    """ AnyOf (expected=True) or NoneOf over a column, looking the data
+    up in a set instead of the sequence of values.
+    """
+    if isinstance(validator.values, string_types):
+        # "in" would look for a substring, not a member.
+        return False
+    try:
+        values = frozenset(validator.values)
+    except TypeError:
+        return False
+    message = None
+    for field in fields:
+        data = field.data
+        try:
+            found = data in values
+        except TypeError:
+            found = data in validator.values
+        if found is not expected:
+            if message is None:
+                message = validator.message
+                if message is None:
+                    message = field.gettext(default_message)
+                message = message % dict(
+                    values=validator.values_formatter(validator.values))
+            field.errors.append(message)
+    return True
+
+
+def any_of_column(validator, fields):
+    return membership_column(validator, fields, True,
+                             'Invalid value, must be one of: %(values)s.')
+
+
+def none_of_column(validator, fields):
+    return membership_column(validator, fields, False,
+                             'Invalid value, can\'t be any of: %(values)s.')
+
+
+def regexp_column(validator, fields):
+    """ Regexp over a column, with the compiled pattern looked up once. """
+    match = validator.regex.match
+    message = validator.message
+    for field in fields:
+        if not match(field.data or ''):
+            if message is None:
+                message = field.gettext('Invalid input.')
+            field.errors.append(message)
+    return True
+
+
+# The validators that can run over a column, by exact class. These never
+# stop the validation chain. A column function returns False when it can
+# not handle the validator after all, which is then run per member.
+COLUMN_VALIDATORS = {
+    NumberRange: number_range_column,
+    AnyOf: any_of_column,
+    NoneOf: none_of_column,
+    Regexp: regexp_column,
+}
+
+
+def validate_column(form, members, shared, run_validator):
+    """ Validate the members of a set, one validator at a time.
+
+    :param form:
+        The form (or stand-in) the validators get
+    :param members:
+        A list of (field, validators) tuples, one for every member
+    :param shared:
+        Per validator position, whether all members got the same
+        validator there (no %field% placeholders in its arguments)
+    :param run_validator:
+        A callable taking the form, field and validator, running the
+        validator like Field._run_validation_chain does and returning
+        True if the validation was stopped
+    """
+    for field, validators in members:
+        field.errors = list(field.process_errors)
+    active = members
+    for position, same in enumerate(shared):
+        if not active:
+            break
+        if same:
+            validator = active[0][1][position]
+            column = COLUMN_VALIDATORS.get(type(validator))
+            if column is not None and column(validator, [field for field, validators in active]):
+                continue
+        # Without column support, each member runs its own validator
+        # and members whose validation stopped drop out.
+        active = [(field, validators) for field, validators in active
+                  if not run_validator(form, field, validators[position])]
@@ -0,0 +1,8 @@
+import sys
+
+if sys.version_info[0] >= 3:
+    string_types = (str, )
+    integer_types = (int, )
+else:
+    string_types = (basestring, )
+    integer_types = (int, long)
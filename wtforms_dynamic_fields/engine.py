@@ -0,0 +1,424 @@
+""" A form-free validation engine, for JSON and API endpoints.
+
+Validates a plain mapping against the configuration (and, optionally,
+a base form) without building a form class, a form or, for the common
+text fields, any field at all. The errors are the same as those in
+"form.errors" after processing and validating the same data.
+"""
+import decimal
+from wtforms import fields
+from wtforms.fields.core import Label, UnboundField
+from wtforms.i18n import DummyTranslations
+from wtforms.meta import DefaultMeta
+from wtforms.validators import (DataRequired, Email, EqualTo, InputRequired,
+                                Length, NoneOf, NumberRange, Regexp, AnyOf,
+                                StopValidation, ValidationError)
+from .cache import LRUCache
+from .columns import validate_column
+from .adapters import adapt
+from .plan import string_types
+from .wtforms_dynamic_fields import form_meta
+
+
+def text_data(field, valuelist):
+    field.data = valuelist[0] if valuelist else ''
+
+
+def integer_data(field, valuelist):
+    if valuelist:
+        try:
+            field.data = int(valuelist[0])
+        except ValueError:
+            field.data = None
+            raise ValueError(field.gettext('Not a valid integer value'))
+
+
+def float_data(field, valuelist):
+    if valuelist:
+        try:
+            field.data = float(valuelist[0])
+        except ValueError:
+            field.data = None
+            raise ValueError(field.gettext('Not a valid float value'))
+
+
+def decimal_data(field, valuelist):
+    if valuelist:
+        try:
+            field.data = decimal.Decimal(valuelist[0])
+        except (decimal.InvalidOperation, ValueError):
+            field.data = None
+            raise ValueError(field.gettext('Not a valid decimal value'))
+
+
+# The fields that only take the first posted value as their data, with
+# their process_formdata(). These are handled without a Field instance,
+# as long as they get no filters and no other arguments than the ones
+# below.
+NATIVE_FIELDS = {
+    fields.StringField: text_data,
+    getattr(fields, 'TextField', fields.StringField): text_data,
+    fields.TextAreaField: text_data,
+    fields.PasswordField: text_data,
+    fields.HiddenField: text_data,
+    fields.IntegerField: integer_data,
+    fields.FloatField: float_data,
+    fields.DecimalField: decimal_data,
+}
+NATIVE_ARGUMENTS = frozenset(['label', 'validators', 'default', 'description',
+                              'id', 'widget', 'render_kw'])
+
+
+class FieldValue(object):
+    """ A field being validated by the engine. Has the attributes of a
+    bound field validators use: data, raw_data, errors, label, gettext...
+    """
+
+    __slots__ = ('name', 'short_name', 'label_text', 'data', 'raw_data',
+                 'errors', 'process_errors', '_translations')
+
+    def __init__(self, name, label_text, translations):
+        self.name = self.short_name = name
+        self.label_text = label_text
+        self.data = None
+        self.raw_data = None
+        self.errors = []
+        self.process_errors = ()
+        self._translations = translations
+
+    @property
+    def label(self):
+        return Label(self.name, self.label_text)
+
+    def gettext(self, string):
+        return self._translations.gettext(string)
+
+    def ngettext(self, singular, plural, n):
+        return self._translations.ngettext(singular, plural, n)
+
+
+class EngineForm(object):
+    """ Stands in for the form towards the validators, for those looking
+    up other fields (EqualTo, for example).
+    """
+
+    def __init__(self, fields):
+        self._fields = fields
+
+    def __getitem__(self, name):
+        return self._fields[name]
+
+    def __contains__(self, name):
+        return name in self._fields
+
+    def __iter__(self):
+        return iter(self._fields.values())
+
+    @property
+    def data(self):
+        return dict((name, field.data) for name, field in self._fields.items())
+
+
+# Below follow the native versions of the common validators. They behave
+# (and word their messages) exactly like those of WTForms.
+
+def input_required(validator, form, field):
+    if not field.raw_data or not field.raw_data[0]:
+        field.errors[:] = []
+        raise StopValidation(validator.message if validator.message is not None
+                             else field.gettext('This field is required.'))
+
+
+def data_required(validator, form, field):
+    data = field.data
+    if not data or isinstance(data, string_types) and not data.strip():
+        field.errors[:] = []
+        raise StopValidation(validator.message if validator.message is not None
+                             else field.gettext('This field is required.'))
+
+
+def length(validator, form, field):
+    size = field.data and len(field.data) or 0
+    if size < validator.min or validator.max != -1 and size > validator.max:
+        message = validator.message
+        if message is None:
+            if validator.max == -1:
+                message = field.ngettext('Field must be at least %(min)d character long.',
+                                         'Field must be at least %(min)d characters long.',
+                                         validator.min)
+            elif validator.min == -1:
+                message = field.ngettext('Field cannot be longer than %(max)d character.',
+                                         'Field cannot be longer than %(max)d characters.',
+                                         validator.max)
+            else:
+                message = field.gettext('Field must be between %(min)d and %(max)d characters long.')
+        raise ValidationError(message % dict(min=validator.min, max=validator.max,
+                                             length=size))
+
+
+def number_range(validator, form, field):
+    data = field.data
+    if data is None or (validator.min is not None and data < validator.min) or \
+            (validator.max is not None and data > validator.max):
+        message = validator.message
+        if message is None:
+            if validator.max is None:
+                message = field.gettext('Number must be at least %(min)s.')
+            elif validator.min is None:
+                message = field.gettext('Number must be at most %(max)s.')
+            else:
+                message = field.gettext('Number must be between %(min)s and %(max)s.')
+        raise ValidationError(message % dict(min=validator.min, max=validator.max))
+
+
+def any_of(validator, form, field):
+    if field.data not in validator.values:
+        message = validator.message
+        if message is None:
+            message = field.gettext('Invalid value, must be one of: %(values)s.')
+        raise ValidationError(message % dict(
+            values=validator.values_formatter(validator.values)))
+
+
+def none_of(validator, form, field):
+    if field.data in validator.values:
+        message = validator.message
+        if message is None:
+            message = field.gettext('Invalid value, can\'t be any of: %(values)s.')
+        raise ValidationError(message % dict(
+            values=validator.values_formatter(validator.values)))
+
+
+def equal_to(validator, form, field):
+    try:
+        other = form[validator.fieldname]
+    except KeyError:
+        raise ValidationError(field.gettext("Invalid field name '%s'.") %
+                              validator.fieldname)
+    if field.data != other.data:
+        message = validator.message
+        if message is None:
+            message = field.gettext('Field must be equal to %(other_name)s.')
+        raise ValidationError(message % {
+            'other_label': other.label.text or validator.fieldname,
+            'other_name': validator.fieldname,
+        })
+
+
+def regexp(validator, form, field):
+    if not validator.regex.match(field.data or ''):
+        raise ValidationError(validator.message if validator.message is not None
+                              else field.gettext('Invalid input.'))
+
+
+def email(validator, form, field):
+    message = validator.message
+    if message is None:
+        message = field.gettext('Invalid email address.')
+    match = validator.regex.match(field.data or '')
+    if not match or not validator.validate_hostname(match.group(1)):
+        raise ValidationError(message)
+
+
+# Only exact classes are looked up, subclasses may behave differently
+# and are called like any other validator.
+NATIVE_VALIDATORS = {
+    InputRequired: input_required,
+    DataRequired: data_required,
+    Length: length,
+    NumberRange: number_range,
+    AnyOf: any_of,
+    NoneOf: none_of,
+    EqualTo: equal_to,
+    Regexp: regexp,
+    Email: email,
+}
+
+
+class FieldRecipe(object):
+    """ What the engine needs to know of a field, taken from its
+    UnboundField once.
+    """
+
+    __slots__ = ('unbound', 'native', 'label', 'default', 'validators')
+
+    def __init__(self, name, unbound, translations):
+        self.unbound = unbound
+        args, kwargs = unbound.args, unbound.kwargs
+        label = args[0] if args else kwargs.get('label')
+        if label is None:
+            label = translations.gettext(name.replace('_', ' ').title())
+        self.label = label
+        self.default = kwargs.get('default')
+        self.validators = tuple(kwargs.get('validators') or
+                                (args[1] if len(args) > 1 else None) or ())
+        # The process_formdata() of native fields, None for the others.
+        self.native = None
+        if len(args) <= 2 and NATIVE_ARGUMENTS.issuperset(kwargs):
+            self.native = NATIVE_FIELDS.get(unbound.field_class)
+
+
+class ValidationEngine(object):
+    """ Validates plain mappings against a WTFormsDynamicFields
+    configuration and, optionally, the fields of a base form.
+
+    Text fields (see NATIVE_FIELDS) and the common validators (see
+    NATIVE_VALIDATORS) are handled by the engine itself. Any other
+    field is bound and processed like WTForms does, and any other
+    validator is called with the engine's stand-ins for the form and
+    field. CSRF protection and inline "validate_<name>" methods of the
+    base form do not apply.
+
+    Sets with many members are validated column-wise: each validator
+    runs over the data of all members of a set at once, see columns.py.
+
+    An engine holds no state per call, so threads may share it.
+    """
+
+    def __init__(self, dynamic, form=None, cache_size=1024, column_size=16):
+        """ Engine init.
+        :param dynamic: The WTFormsDynamicFields configuration
+        :param form: An optional WTForm Form object whose fields are
+            validated as well
+        :param cache_size: How many dynamic field recipes to keep
+        :param column_size: From how many members on a set is validated
+            column-wise, None to always validate field by field
+        """
+        self.dynamic = dynamic
+        self.form = form
+        if form is not None:
+            self.meta = form_meta(form)()
+        else:
+            self.meta = DefaultMeta()
+        self.translations = self.meta.get_translations(None) or DummyTranslations()
+        self.base_recipes = []
+        if form is not None:
+            unbound_fields = [(name, getattr(form, name)) for name in dir(form)
+                              if not name.startswith('_') and
+                              isinstance(getattr(form, name), UnboundField)]
+            unbound_fields.sort(key=lambda field: (field[1].creation_counter, field[0]))
+            self.base_recipes = [(name, FieldRecipe(name, unbound, self.translations))
+                                 for name, unbound in unbound_fields]
+        self.recipes = LRUCache(cache_size)
+        self.column_size = column_size
+        self._plan = None
+
+    def recipe(self, plan, name, cname, set_number):
+        """ Return the recipe of a dynamic field, building it if needed. """
+        # Recipes are stored with the plan they were built from, a
+        # thread still validating with an older plan may store one.
+        cached = self.recipes.get(name)
+        if cached is not None and cached[0] is plan:
+            return cached[1]
+        validator_cache = self.dynamic.validator_cache
+        if validator_cache.maxsize == 0:
+            validator_cache = None
+        unbound = plan.fields[cname].build(set_number, validator_cache)
+        recipe = FieldRecipe(name, unbound, self.translations)
+        if cname not in plan.uncacheable:
+            self.recipes.put(name, (plan, recipe))
+        return recipe
+
+    def validate(self, data):
+        """ Validate the data, return the errors per field name.
+
+        :param data:
+            A mapping of field names to their value (or list of values),
+            a MultiDict with the POST variables or a PostAdapter, see
+            WTFormsDynamicFields.process(). The values of a mapping are
+            read through its MappingAdapter, which posts JSON numbers,
+            booleans and nulls as text, see form_text().
+        Returns a dictionary like "form.errors", empty if all is valid.
+        """
+        plan = self.dynamic.compile()
+        if plan is not self._plan:
+            # The configuration changed, forget everything built for it.
+            self.recipes.clear()
+            self._plan = plan
+        formdata = adapt(data)
+
+        recipes = list(self.base_recipes)
+        columns = {}
+        matched = self.dynamic._match_fields(self.form, plan, formdata)
+        for name, (cname, set_number) in matched.items():
+            recipe = self.recipe(plan, name, cname, set_number)
+            recipes.append((name, recipe))
+            if set_number is not None and recipe.native:
+                columns.setdefault(cname, []).append((name, recipe))
+
+        # Process every field before validating any of them, validators
+        # may look at the data of other fields.
+        values = {}
+        for name, recipe in recipes:
+            if recipe.native:
+                field = FieldValue(name, recipe.label, self.translations)
+                default = recipe.default
+                field.data = default() if callable(default) else default
+                if formdata:
+                    field.raw_data = formdata.getlist(name)
+                    try:
+                        recipe.native(field, field.raw_data)
+                    except ValueError as e:
+                        field.process_errors = [e.args[0]]
+            else:
+                field = recipe.unbound.bind(None, name, translations=self.translations,
+                                            _meta=self.meta)
+                field.process(formdata)
+            values[name] = field
+
+        form = EngineForm(values)
+        errors = {}
+        validated = set()
+        if self.column_size is not None:
+            for cname, members in columns.items():
+                if len(members) < self.column_size:
+                    continue
+                shared = tuple(not validator.templated
+                               for validator in plan.fields[cname].validators)
+                validate_column(form, [(values[name], recipe.validators)
+                                       for name, recipe in members],
+                                shared, self.run_validator)
+                for name, recipe in members:
+                    if values[name].errors:
+                        errors[name] = values[name].errors
+                    validated.add(name)
+
+        for name, recipe in recipes:
+            if name in validated:
+                continue
+            field = values[name]
+            if recipe.native:
+                valid = self.validate_field(form, field, recipe.validators)
+            else:
+                valid = field.validate(form)
+            if not valid:
+                errors[name] = field.errors
+        return errors
+
+    @staticmethod
+    def validate_field(form, field, validators):
+        """ Field.validate() for a FieldValue, with the native validators. """
+        field.errors = list(field.process_errors)
+        for validator in validators:
+            if ValidationEngine.run_validator(form, field, validator):
+                break
+        return not field.errors
+
+    @staticmethod
+    def run_validator(form, field, validator):
+        """ Run one validator on a FieldValue, natively if possible.
+        Returns True if it stopped the validation chain.
+        """
+        native = NATIVE_VALIDATORS.get(type(validator))
+        try:
+            if native is None:
+                validator(form, field)
+            else:
+                native(validator, form, field)
+        except StopValidation as e:
+            if e.args and e.args[0]:
+                field.errors.append(e.args[0])
+            return True
+        except ValueError as e:
+            field.errors.append(e.args[0])
+        return False
@@ -0,0 +1,37 @@
+class UnknownReferenceError(AttributeError):
+    """ Raised when a validator argument refers, through a %field%
+    placeholder, to a field that is not in the configuration.
+    """
+
+    def __init__(self, references):
+        """ :param references: A list of (field, validator, name) tuples """
+        self.references = references
+        super(UnknownReferenceError, self).__init__(
+            '; '.join('Validator "{1}" of field "{0}" refers to unknown '
+                      'field "{2}"'.format(*reference)
+                      for reference in references) + '.')
+
+
+class LimitExceededError(ValueError):
+    """ Raised when a POST goes beyond one of the limits set on
+    WTFormsDynamicFields, before any field is built for it.
+
+    The "limit" attribute holds the name of the limit ("max_post_keys",
+    "max_fields", "max_set_members" or "max_set_number") and "maximum"
+    its value. Applications may turn this into a 400 or 413 response.
+    """
+
+    def __init__(self, limit, maximum, field=None):
+        self.limit = limit
+        self.maximum = maximum
+        self.field = field
+        message = 'The POST exceeds {0}={1}'.format(limit, maximum)
+        if field is not None:
+            message += ' at "{0}"'.format(field)
+        super(LimitExceededError, self).__init__(message + '.')
+
+
+class SnapshotError(ValueError):
+    """ Raised when a configuration can not be written to a snapshot
+    or when a snapshot being loaded is invalid.
+    """
@@ -0,0 +1,126 @@
+from collections import deque
+from .compat import string_types
+
+
+def bound_references(field):
+    """ Return the names the bound validators of a field may refer to.
+
+    Used for the fields of the base form, which are not part of the
+    configuration: every string attribute of their validators counts,
+    like the "fieldname" of an EqualTo validator.
+    """
+    names = set()
+    for validator in field.validators:
+        for value in getattr(validator, '__dict__', {}).values():
+            if isinstance(value, string_types):
+                names.add(value)
+    return names
+
+
+class DependencyGraph(object):
+    """ The cross-field references of a compiled configuration.
+
+    Each canonical field maps to the names its validator arguments
+    refer to, as (name, templated) tuples. Templated names come from
+    %field% placeholders and get the set suffix of the field they are
+    bound to. Plain string arguments are kept as well, as these may
+    name any field of the form (EqualTo('first_name'), for example);
+    they only count as a reference when the form has such a field.
+
+    Placeholders naming a field that is not configured can never be
+    bound, these are kept as (field, validator, name) tuples in
+    "unknown".
+    """
+
+    __slots__ = ('references', 'unknown')
+
+    def __init__(self, fields, resolver=None):
+        """ Build the graph.
+        :param fields: The FieldPlans of the plan, by canonical name
+        :param resolver: An optional FieldResolver, placeholders it
+            resolves outside of a set (through a pattern name like
+            "addr_<kind>") are configured as well
+        """
+        self.references = {}
+        self.unknown = []
+        for cname, field in fields.items():
+            references = set()
+            for validator in field.validators:
+                for name, templated in validator.references:
+                    if not templated:
+                        references.add((name, False))
+                    elif not self.configured(name, fields, resolver):
+                        self.unknown.append((cname, validator.validator.__name__,
+                                             name))
+                    elif name != cname:
+                        # A field referring to itself (in its error
+                        # message, say) is no dependency.
+                        references.add((name, True))
+            self.references[cname] = frozenset(references)
+
+    @staticmethod
+    def configured(name, fields, resolver=None):
+        """ Return True if a placeholder names a configured field. """
+        if name in fields:
+            return True
+        resolved = resolver.resolve(name) if resolver is not None else None
+        return resolved is not None and resolved[1] is None
+
+    def dependencies(self, cname, set_number=None):
+        """ Return the names the canonical field or set member refers to.
+
+        Placeholders only count for set members, outside of a set they
+        are not substituted and can not name any field.
+
+        :param cname:
+            The canonical field name
+        :param set_number:
+            The set number as a string, or None when not in a set.
+        """
+        names = set()
+        for name, templated in self.references.get(cname, ()):
+            if not templated:
+                names.add(name)
+            elif set_number is not None:
+                names.add(name + '_' + set_number)
+        return names
+
+    def field_dependencies(self, form, name):
+        """ Return the names of the fields of the processed form that the
+        validators of the named field refer to.
+        """
+        dynamic_fields = getattr(type(form), '_dynamic_fields', {})
+        if name in dynamic_fields:
+            names = self.dependencies(*dynamic_fields[name])
+        else:
+            names = bound_references(form[name])
+        names.discard(name)
+        return set(dependency for dependency in names if dependency in form)
+
+    def closure(self, form, names):
+        """ Return the given field names of a processed form followed by
+        everything they depend on, directly or through other fields.
+
+        Only the fields that are reached are looked at, so this stays
+        cheap for a few fields of a large (or lazily bound) form.
+
+        :param form:
+            A form returned by WTFormsDynamicFields.process()
+        :param names:
+            The names of the fields to start from
+        """
+        for name in names:
+            # Not "_fields", which misses the members of grouped forms.
+            if name not in form:
+                raise KeyError(name)
+        closure = []
+        seen = set()
+        pending = deque(names)
+        while pending:
+            name = pending.popleft()
+            if name in seen:
+                continue
+            seen.add(name)
+            closure.append(name)
+            pending.extend(sorted(self.field_dependencies(form, name) - seen))
+        return closure
@@ -0,0 +1,222 @@
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+from .adapters import adapt
+from .lazy import process_field
+
+
+class SetNumbers(OrderedDict):
+    """ An ordered dictionary keyed by set number, which may be given
+    as the string from the POST ('3') or as an integer (3).
+    """
+
+    def __missing__(self, key):
+        if isinstance(key, int) and not isinstance(key, bool) and str(key) in self:
+            return self[str(key)]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if isinstance(key, int) and not isinstance(key, bool):
+            key = str(key)
+        return OrderedDict.__contains__(self, key)
+
+
+class SetRow(object):
+    """ The fields of one set number.
+
+    Rows of the same shape (the same member names without their set
+    suffix, in the same order) share one generated subclass, which
+    holds the shape and, per set number, the UnboundFields of the
+    members. A row itself only holds its set number and its fields, in
+    the order of the shape. The names of the shape are the canonical
+    names, except for pattern names ("addr_<kind>"), for which they
+    are the names matched in the POST ("addr_home").
+    """
+
+    __slots__ = ('set_number', 'fields')
+
+    # The names of the row with their position, and the
+    # UnboundFields of the members by set number, set on the
+    # generated subclasses.
+    shape = ()
+    positions = {}
+    unbound_fields = {}
+
+    def __init__(self, set_number, fields):
+        self.set_number = set_number
+        self.fields = fields
+
+    def __getitem__(self, name):
+        """ Return a field by name ('email') or by its full name
+        ('email_3').
+        """
+        position = self.positions.get(name)
+        if position is None:
+            suffix = '_' + self.set_number
+            if name.endswith(suffix):
+                position = self.positions.get(name[:-len(suffix)])
+            if position is None:
+                raise KeyError(name)
+        return self.fields[position]
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    @property
+    def data(self):
+        return dict((base, field.data) for base, field in zip(self.shape, self.fields))
+
+    @property
+    def errors(self):
+        return dict((field.name, field.errors) for field in self.fields
+                    if field.errors)
+
+    def validate(self, form):
+        """ Validate the fields of the row, passing the form they belong
+        to to the validators, and return True if none has errors.
+        """
+        success = True
+        for field in self.fields:
+            inline = getattr(form.__class__, 'validate_%s' % field.name, None)
+            if not field.validate(form, (inline, ) if inline is not None else ()):
+                success = False
+        return success
+
+
+def row_class(shape):
+    """ Return a new SetRow subclass for the given tuple of names. """
+    positions = dict((cname, position) for position, cname in enumerate(shape))
+    return type('SetRow', (SetRow, ), {'__slots__': (), 'shape': shape,
+                                       'positions': positions,
+                                       'unbound_fields': {}})
+
+
+def field_names(form):
+    """ Return the field names of a processed form, followed by the
+    set members of a grouped form, which are not in "_fields".
+    """
+    names = list(form._fields)
+    if isinstance(form, GroupedFormMixin):
+        names.extend(form._members)
+    return names
+
+
+class GroupedFormMixin(object):
+    """ Mixin for generated form classes with the set members grouped
+    into rows instead of added as fields of their own.
+
+    The generated class holds a "_rows" ordered dictionary mapping each
+    set number to its SetRow subclass. Each form gets:
+
+    - "rows", the SetRow of every set number, in POST order,
+    - "sets", per name, its member fields by set number.
+
+    Only the base form fields and the dynamic fields outside of any set
+    are in "_fields" and are iterated or rendered along with the form.
+    The members can still be looked up by name (form['email_3']), and
+    validation, "data" and "errors" take them into account, so the
+    errors are the same as those of a form without grouping.
+    """
+
+    _rows = OrderedDict()
+
+    def process(self, formdata=None, obj=None, data=None, **kwargs):
+        """ Bind the rows on the first call and process all fields.
+
+        See BaseForm.process() for the arguments.
+        """
+        if 'rows' not in self.__dict__:
+            self._bind_rows()
+        super(GroupedFormMixin, self).process(formdata, obj, data, **kwargs)
+
+        # Looking up thousands of members in a WebOb MultiDict one by
+        # one scans it every time, its adapter indexes it once.
+        formdata = self.meta.wrap_formdata(self, formdata)
+        if formdata is not None and self._members:
+            formdata = adapt(getattr(formdata, '_wrapped', formdata))
+        if data is not None:
+            kwargs = dict(data, **kwargs)
+        for name, field in self._members.items():
+            process_field(field, name, formdata, obj, kwargs)
+
+    def _bind_rows(self):
+        """ Bind the members of every row, like BaseForm.__init__ binds
+        the fields of the form.
+        """
+        translations = self._get_translations()
+        bind_field = self.meta.bind_field
+        self.rows = SetNumbers()
+        self._members = {}
+        for set_number, row in self._rows.items():
+            fields = []
+            for base, unbound in zip(row.shape, row.unbound_fields[set_number]):
+                name = base + '_' + set_number
+                options = dict(name=name, prefix=self._prefix,
+                               translations=translations)
+                field = self._members[name] = bind_field(self, unbound, options)
+                fields.append(field)
+            self.rows[set_number] = row(set_number, tuple(fields))
+
+    @property
+    def sets(self):
+        """ The member fields by name and set number. """
+        sets = self.__dict__.get('_sets')
+        if sets is None:
+            sets = self._sets = {}
+            for set_number, row in self.rows.items():
+                for base, field in zip(row.shape, row.fields):
+                    sets.setdefault(base, SetNumbers())[set_number] = field
+        return sets
+
+    def validate(self):
+        """ Validate the fields of the form and the rows. """
+        success = super(GroupedFormMixin, self).validate()
+        for row in self.rows.values():
+            if not row.validate(self):
+                success = False
+        self._errors = None
+        return success
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            errors = dict((name, field.errors) for name, field in self._fields.items()
+                          if field.errors)
+            errors.update((name, field.errors) for name, field in self._members.items()
+                          if field.errors)
+            self._errors = errors
+        return self._errors
+
+    @property
+    def data(self):
+        data = dict((name, field.data) for name, field in self._fields.items())
+        data.update((name, field.data) for name, field in self._members.items())
+        return data
+
+    def populate_obj(self, obj):
+        """ Populate the attributes of obj with the data of the fields
+        and the members.
+        """
+        super(GroupedFormMixin, self).populate_obj(obj)
+        for name, field in self._members.items():
+            field.populate_obj(obj, name)
+
+    def __getitem__(self, name):
+        try:
+            return self._fields[name]
+        except KeyError:
+            return self._members[name]
+
+    def __contains__(self, name):
+        return name in self._fields or name in self._members
@@ -0,0 +1,167 @@
+from .adapters import adapt
+from .exceptions import LimitExceededError
+from .graph import bound_references
+from .lazy import LazyFields, process_field
+
+
+def post_values(post, max_post_keys=None):
+    """ Return a dictionary with the list of values of every POST key.
+
+    :param post: A PostAdapter with the POST variables
+    :param max_post_keys: Raise a LimitExceededError beyond this
+        number of POST keys, None for no limit.
+    """
+    values = {}
+    for scanned, (key, split) in enumerate(post.fields(), 1):
+        if max_post_keys is not None and scanned > max_post_keys:
+            raise LimitExceededError('max_post_keys', max_post_keys)
+        if key not in values:
+            values[key] = post.getlist(key)
+    return values
+
+
+def field_dependents(form, plan):
+    """ Map the field names of a processed form to the names of the
+    fields whose validators refer to them.
+
+    The references of the dynamic fields come from the dependency graph
+    of the compiled plan, those of the other fields from their bound
+    validators (see "bound_references").
+    """
+    dependents = {}
+    dynamic_fields = getattr(type(form), '_dynamic_fields', {})
+    for name, (cname, set_number) in dynamic_fields.items():
+        for target in plan.graph.dependencies(cname, set_number):
+            dependents.setdefault(target, set()).add(name)
+
+    fields = form._fields
+    bound = fields.bound_items() if isinstance(fields, LazyFields) else fields.items()
+    for name, field in bound:
+        if name in dynamic_fields:
+            continue
+        for target in bound_references(field):
+            dependents.setdefault(target, set()).add(name)
+    return dependents
+
+
+class IncrementalForm(object):
+    """ Keeps a processed form around between POSTs of the same form,
+    for live validation where the whole form is posted on every change.
+
+    The first POST is processed and validated as usual. The next ones
+    are compared with the previous POST: only the fields whose values
+    changed are processed again and validated, together with the fields
+    that refer to them from their validators (EqualTo('%handy%') for
+    example) and the fields with inline "validate_<name>" methods, as
+    these may look at any field. The errors are the same as those of a
+    full validation. When the POST brings other dynamic fields, or the
+    configuration changed, the form is processed again from scratch.
+
+    Like "process_many", the POST is always passed to the form as its
+    form data, also for Flask WTF forms. An IncrementalForm holds the
+    state of one form being filled in, do not share it between threads.
+    """
+
+    def __init__(self, dynamic, form, lazy=False):
+        """ Set up the incremental state.
+        :param dynamic: The WTFormsDynamicFields configuration
+        :param form: A valid WTForm Form object
+        :param lazy: See WTFormsDynamicFields.process()
+        """
+        self.dynamic = dynamic
+        self.form_class = form
+        self.lazy = lazy
+        # The current form and the names validated by the last call.
+        self.form = None
+        self.revalidated = ()
+        self._values = None
+        self._plan = None
+        self._dependents = {}
+        self._inline = set()
+        self._invalid = set()
+
+    def reset(self):
+        """ Forget the previous form, the next POST is processed in full. """
+        self.form = None
+        self._values = None
+
+    def validate(self, post):
+        """ Bring the form up to date with the POST and validate it.
+
+        :param post:
+            The POST variables, see WTFormsDynamicFields.process()
+        Returns True if the form has no errors. The form itself, with
+        its errors, is available as the "form" attribute.
+        """
+        plan = self.dynamic.compile()
+        post = adapt(post)
+        values = post_values(post, self.dynamic.max_post_keys)
+        if self.form is None or plan is not self._plan:
+            return self._validate_all(plan, post, values)
+
+        form = self.form
+        dynamic_fields = type(form)._dynamic_fields
+        previous = self._values
+        changed = set()
+        for key in set(values).union(previous):
+            if values.get(key) == previous.get(key):
+                continue
+            if key in form._fields:
+                if key in dynamic_fields and key not in values:
+                    # A dynamic field is gone, the form changes shape.
+                    return self._validate_all(plan, post, values)
+                changed.add(key)
+            elif plan.resolver.resolve(key) is not None:
+                # A new dynamic field, the form changes shape.
+                return self._validate_all(plan, post, values)
+            else:
+                # The subfields of FieldList and FormField fields are
+                # posted as "<name>-<index>", process their enclosure.
+                name = key.split('-', 1)[0]
+                if name in form._fields:
+                    changed.add(name)
+
+        formdata = form.meta.wrap_formdata(form, post)
+        if isinstance(form._fields, LazyFields):
+            # Fields that are still pending get the new POST as well.
+            form._fields.defer(formdata, None, {})
+        for name in changed:
+            process_field(form[name], name, formdata, None, {})
+
+        targets = set(changed)
+        for name in changed:
+            targets.update(self._dependents.get(name, ()))
+        targets.update(self._inline)
+        targets = [name for name in targets if name in form._fields]
+
+        for name in targets:
+            self._validate_field(form, name)
+        form._errors = None
+        self._values = values
+        self.revalidated = tuple(targets)
+        return not self._invalid
+
+    def _validate_all(self, plan, post, values):
+        """ Process and validate a new form for the POST. """
+        F = self.dynamic._form_class(self.form_class, plan, post, self.lazy)
+        form = F(post)
+        form.validate()
+        self.form = form
+        self._plan = plan
+        self._values = values
+        self._dependents = field_dependents(form, plan)
+        self._inline = set(name for name in form._fields
+                           if hasattr(F, 'validate_%s' % name))
+        self._invalid = set(name for name, field in form._fields.items()
+                            if field.errors)
+        self.revalidated = tuple(form._fields)
+        return not self._invalid
+
+    def _validate_field(self, form, name):
+        """ Validate a single field like Form.validate() does. """
+        inline = getattr(form.__class__, 'validate_%s' % name, None)
+        extra = [inline] if inline is not None else ()
+        if form[name].validate(form, extra):
+            self._invalid.discard(name)
+        else:
+            self._invalid.add(name)
@@ -0,0 +1,82 @@
+import threading
+
+# The phases of a process() call, in the order they happen.
+PHASES = ('match', 'substitute', 'bind_validators', 'build_class',
+          'instantiate')
+
+# The counters of a process() call.
+COUNTERS = ('keys_scanned', 'keys_skipped_base', 'keys_duplicate',
+            'keys_rejected', 'set_members_bound', 'validators_constructed', 'substitutions',
+            'form_cache_hits')
+
+
+class ProcessRecord(object):
+    """ The timings and counters of a single process() call.
+
+    The timings (in seconds) are kept per phase:
+
+    * match: scanning the POST keys and resolving them to their
+      canonical name and set number
+    * substitute: replacing the %field% placeholders of the
+      validator arguments
+    * bind_validators: constructing the validators
+    * build_class: building the generated form class and its fields,
+      apart from the two phases above
+    * instantiate: creating and processing the form instance
+
+    The last three are zero when the form class came from the cache.
+    With lazy binding, the fields are built after process() returned
+    and are not recorded.
+
+    Of the counters, "keys_skipped_base" counts the keys of base form
+    fields and "keys_duplicate" the dynamic keys posted more than once.
+    "set_members_bound" counts the set members built into a new form
+    class, so it stays zero for cached classes and lazy binding.
+    """
+
+    __slots__ = ('form', 'timings', 'counters')
+
+    def __init__(self, form=None):
+        self.form = form
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @property
+    def total(self):
+        """ The total recorded time in seconds. """
+        return sum(self.timings.values())
+
+    def __repr__(self):
+        return '<ProcessRecord(%r, %r)>' % (self.timings, self.counters)
+
+
+class ProcessStats(object):
+    """ Aggregates ProcessRecords. Pass an instance as the "instrument"
+    of WTFormsDynamicFields to collect totals over many calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """ Forget everything recorded so far. """
+        with self._lock:
+            self.calls = 0
+            self.timings = dict.fromkeys(PHASES, 0.0)
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def __call__(self, record):
+        with self._lock:
+            self.calls += 1
+            for phase, seconds in record.timings.items():
+                self.timings[phase] += seconds
+            for counter, value in record.counters.items():
+                self.counters[counter] += value
+
+    def averages(self):
+        """ Return the average seconds per call for each phase. """
+        if not self.calls:
+            return dict.fromkeys(PHASES, 0.0)
+        return dict((phase, seconds / self.calls)
+                    for phase, seconds in self.timings.items())
@@ -0,0 +1,148 @@
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+
+
+class LazyFields(MutableMapping):
+    """ A stand-in for a form's "_fields" dictionary that binds the
+    dynamic fields only when they are first accessed.
+
+    The static fields of the base form are bound as usual. The dynamic
+    ones stay pending until they are looked up, be it directly, as an
+    attribute of the form or while iterating, validating, rendering or
+    reading the data or errors of the form. A pending field is built,
+    bound and processed with the form data the form received, exactly
+    like WTForms would have done during form initialization.
+    """
+
+    def __init__(self, form, fields, order):
+        """ Wrap the already bound fields of the form.
+        :param form: The form instance the fields belong to
+        :param fields: An ordered dictionary of the bound fields
+        :param order: All field names, bound and pending, in order
+        """
+        self._form = form
+        self._bound = fields
+        self._order = list(order)
+        self.pending = set(name for name in self._order if name not in fields)
+        self._translations = form._get_translations()
+        self._process_args = (None, None, {})
+
+    def defer(self, formdata, obj, kwargs):
+        """ Remember the form data to process pending fields with. """
+        self._process_args = (formdata, obj, kwargs)
+
+    def bound_items(self):
+        """ Return the (name, field) pairs that are bound so far. """
+        return list(self._bound.items())
+
+    def _bind(self, name):
+        """ Build, bind and process the pending field. """
+        form = self._form
+        unbound = form._lazy_unbound_field(name)
+        options = dict(name=name, prefix=form._prefix,
+                       translations=self._translations)
+        field = form.meta.bind_field(form, unbound, options)
+        process_field(field, name, *self._process_args)
+        self.pending.discard(name)
+        self._bound[name] = field
+        # Like Form.__init__ does, obscure the class attribute.
+        setattr(form, name, field)
+        return field
+
+    def __getitem__(self, name):
+        try:
+            return self._bound[name]
+        except KeyError:
+            if name not in self.pending:
+                raise
+        return self._bind(name)
+
+    def __setitem__(self, name, field):
+        if name not in self:
+            self._order.append(name)
+        self.pending.discard(name)
+        self._bound[name] = field
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._order.remove(name)
+        self.pending.discard(name)
+        self._bound.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._bound or name in self.pending
+
+    def __iter__(self):
+        return iter(list(self._order))
+
+    def __len__(self):
+        return len(self._order)
+
+
+def process_field(field, name, formdata, obj, kwargs):
+    """ Process a single field like BaseForm.process() does. """
+    if obj is not None and hasattr(obj, name):
+        field.process(formdata, getattr(obj, name))
+    elif name in kwargs:
+        field.process(formdata, kwargs[name])
+    else:
+        field.process(formdata)
+
+
+class LazyFormMixin(object):
+    """ Mixin for generated form classes with lazily bound dynamic fields.
+
+    The generated class holds a "_lazy_fields" ordered dictionary
+    mapping each dynamic field name to a factory of its UnboundField
+    and a "_lazy_unbound" dictionary in which the UnboundFields are
+    kept once they are built, so this happens only once per class.
+    """
+
+    _lazy_fields = OrderedDict()
+    _lazy_unbound = {}
+
+    @classmethod
+    def _lazy_unbound_field(cls, name):
+        """ Return the UnboundField of a dynamic field. """
+        try:
+            return cls._lazy_unbound[name]
+        except KeyError:
+            # Threads binding the same field at once all get the
+            # UnboundField stored first.
+            return cls._lazy_unbound.setdefault(name, cls._lazy_fields[name]())
+
+    def process(self, formdata=None, obj=None, data=None, **kwargs):
+        """ Process the bound fields and defer the pending ones.
+
+        See BaseForm.process() for the arguments.
+        """
+        if not isinstance(self._fields, LazyFields):
+            # First call, during form initialization: only the static
+            # fields are bound. Put the dynamic ones before any extra
+            # fields (CSRF), as WTForms would have ordered them.
+            static = [name for name, unbound in self._unbound_fields]
+            static_names = set(static)
+            extra = [name for name in self._fields if name not in static_names]
+            order = static + list(self._lazy_fields) + extra
+            self._fields = LazyFields(self, self._fields, order)
+
+        formdata = self.meta.wrap_formdata(self, formdata)
+        if data is not None:
+            kwargs = dict(data, **kwargs)
+
+        self._fields.defer(formdata, obj, kwargs)
+        for name, field in self._fields.bound_items():
+            process_field(field, name, formdata, obj, kwargs)
+
+    def __getattr__(self, name):
+        fields = self.__dict__.get('_fields')
+        if isinstance(fields, LazyFields) and name in fields.pending:
+            return fields[name]
+        raise AttributeError(name)
@@ -0,0 +1,176 @@
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+from .grouped import field_names
+
+
+def group_fields(form):
+    """ Partition the fields of a processed form by set number.
+
+    Returns an ordered dictionary mapping each set number to the names
+    of the dynamic fields in that set. The base form fields and the
+    dynamic fields that are not part of a set are grouped under None.
+    The set members of a grouped form are included.
+    """
+    dynamic_fields = getattr(type(form), '_dynamic_fields', {})
+    groups = OrderedDict([(None, [])])
+    for name in field_names(form):
+        set_number = dynamic_fields.get(name, (None, None))[1]
+        groups.setdefault(set_number, []).append(name)
+    return groups
+
+
+def validate_fields(form, names, extra_validators):
+    """ Validate the named fields of the form, like BaseForm.validate()
+    does, and return True if none of them has errors.
+    """
+    success = True
+    for name in names:
+        if not form[name].validate(form, extra_validators.get(name, ())):
+            success = False
+    return success
+
+
+class DetachedForm(object):
+    """ Just enough of a form for validators to look up other fields
+    by name (EqualTo, for example), for use in another process.
+    """
+
+    def __init__(self, fields):
+        self._fields = fields
+
+    def __getitem__(self, name):
+        return self._fields[name]
+
+    def __contains__(self, name):
+        return name in self._fields
+
+    def __iter__(self):
+        return iter(self._fields.values())
+
+
+def detach_field(field):
+    """ Return a picklable (class, state) copy of a bound field.
+
+    Bound fields refer to the form's generated Meta class, which can
+    not be pickled. Validation does not need it, so it is left out.
+    """
+    state = dict(field.__dict__)
+    state.pop('meta', None)
+    return type(field), state
+
+
+def attach_field(detached):
+    """ Rebuild a field from detach_field() without binding it again. """
+    field_class, state = detached
+    # Going through __init__ (or the __new__ of Field) would give us
+    # an UnboundField, so restore the state on a bare instance.
+    field = object.__new__(field_class)
+    field.__dict__.update(state)
+    return field
+
+
+def validate_detached(names, context, extra_validators):
+    """ Validate the named fields in another process.
+
+    :param names: The names of the fields to validate
+    :param context: A dictionary of detached fields, holding at least
+        the named fields and any fields their validators may look up
+    :param extra_validators: A dictionary of extra validators per name
+    Returns a list of (name, errors) tuples.
+    """
+    fields = OrderedDict((name, attach_field(detached))
+                         for name, detached in context.items())
+    form = DetachedForm(fields)
+    results = []
+    for name in names:
+        fields[name].validate(form, extra_validators.get(name, ()))
+        results.append((name, fields[name].errors))
+    return results
+
+
+def validate_parallel(form, executor=None, max_workers=None,
+                      extra_validators=None):
+    """ Validate a processed form, running the sets concurrently.
+
+    The fields are partitioned by set number (see "group_fields").
+    The base form fields and the dynamic fields outside of a set are
+    validated in the calling thread while every set is validated as a
+    task on the executor. Each field keeps its own errors, so
+    "form.errors" ends up exactly the same, and in the same order,
+    as with a serial "form.validate()".
+
+    :param form:
+        A form returned by WTFormsDynamicFields.process()
+    :param executor:
+        A concurrent.futures executor. With a ThreadPoolExecutor the
+        fields are validated in place. With a ProcessPoolExecutor, the
+        fields of each set are copied (without their form) to a worker
+        together with the fields outside of any set, for validators
+        that refer to other fields. The validators must then be
+        picklable and may only refer to fields of their own set or
+        outside of any set. Fields with inline "validate_<name>"
+        methods are always validated in the calling process.
+        When omitted, a ThreadPoolExecutor is used.
+    :param max_workers:
+        The number of workers of the ThreadPoolExecutor that is
+        created when no executor is given.
+    :param extra_validators:
+        A dictionary of extra validators per field name, as
+        accepted by BaseForm.validate().
+    Returns True if no errors occur.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers) as executor:
+            return validate_parallel(form, executor,
+                                     extra_validators=extra_validators)
+
+    # Bind lazily bound fields up front, binding is not thread-safe.
+    list(form)
+    groups = group_fields(form)
+
+    # Gather the inline validators like Form.validate() does.
+    extra = {}
+    inline = set()
+    for name in field_names(form):
+        validator = getattr(form.__class__, 'validate_%s' % name, None)
+        if validator is not None:
+            extra[name] = [validator]
+            inline.add(name)
+    for name, validators in (extra_validators or {}).items():
+        extra[name] = list(extra.get(name, ())) + list(validators)
+
+    form._errors = None
+    serial = groups.pop(None)
+
+    if isinstance(executor, ProcessPoolExecutor):
+        shared = dict((name, detach_field(form[name])) for name in serial)
+        futures = []
+        for names in groups.values():
+            # Inline validators are methods of the generated form
+            # class, which can not be sent to another process.
+            serial.extend(name for name in names if name in inline)
+            names = [name for name in names if name not in inline]
+            context = dict(shared)
+            context.update((name, detach_field(form[name])) for name in names)
+            futures.append(executor.submit(
+                validate_detached, names, context,
+                dict((name, extra[name]) for name in names if name in extra)))
+        success = validate_fields(form, serial, extra)
+        for future in futures:
+            for name, errors in future.result():
+                form[name].errors = errors
+                if errors:
+                    success = False
+        return success
+
+    futures = [executor.submit(validate_fields, form, names, extra)
+               for names in groups.values()]
+    success = validate_fields(form, serial, extra)
+    for future in futures:
+        if not future.result():
+            success = False
+    return success
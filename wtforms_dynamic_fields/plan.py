@@ -0,0 +1,261 @@
+import re
+from timeit import default_timer as timer
+from .cache import freeze, is_cacheable
+from .compat import string_types
+from .graph import DependencyGraph
+from .resolver import FieldResolver
+
+# The %field_name% convention used inside validator arguments.
+RE_FIELD_NAME = re.compile(r'\%([a-zA-Z0-9_]*)\%')
+
+
+class Template(object):
+    """ A pre-parsed validator argument containing %field% placeholders.
+
+    The argument is split once into literal and placeholder segments,
+    so that binding it to a set number is merely a join of these
+    segments with the set suffix, instead of a regex substitution.
+    """
+
+    __slots__ = ('segments', 'names', 'pieces')
+
+    def __init__(self, value):
+        # Splitting on a pattern with one group gives us alternating
+        # literal and field name segments: [lit, name, lit, name, lit].
+        self.segments = tuple(RE_FIELD_NAME.split(value))
+        self.names = self.segments[1::2]
+        # Every placeholder becomes its name followed by the suffix, so
+        # gluing each name to the literal before it leaves pieces that
+        # only need to be joined with the suffix: [lit + name, lit].
+        literals = self.segments[0::2]
+        self.pieces = tuple([literal + name for literal, name
+                             in zip(literals, self.names)] + [literals[-1]])
+
+    def substitute(self, suffix):
+        """ Return the argument with each placeholder replaced by
+        its field name followed by the given set suffix ("_X").
+        """
+        return suffix.join(self.pieces)
+
+
+class ContainerTemplate(Template):
+    """ A pre-parsed list, tuple, set or dictionary validator argument
+    holding %field% placeholders somewhere inside, AnyOf(['%a%', '%b%'])
+    for example.
+
+    The items (the values, for a dictionary) are parsed once, and
+    binding gives a new container of the same type in which only the
+    templated items are substituted.
+    """
+
+    __slots__ = ('kind', 'items')
+
+    def __init__(self, kind, items):
+        """ :param kind: The container type
+            :param items: The parsed items, (key, item) tuples for a
+                dictionary
+        """
+        self.kind = kind
+        self.items = tuple(items)
+        values = self.items
+        if kind is dict:
+            values = [item for key, item in values]
+        names = []
+        for item in values:
+            if isinstance(item, Template):
+                names.extend(item.names)
+        self.segments = self.pieces = ()
+        self.names = tuple(names)
+
+    def substitute(self, suffix):
+        """ Return a new container with the placeholders of its items
+        replaced by their field name followed by the set suffix ("_X").
+        """
+        if self.kind is dict:
+            return dict((key, bind_argument(item, suffix))
+                        for key, item in self.items)
+        return self.kind(bind_argument(item, suffix) for item in self.items)
+
+
+# The containers in which placeholders are looked for. Subclasses (like
+# named tuples) can not always be rebuilt from their items, so these
+# are taken as they are.
+CONTAINER_TYPES = (list, tuple, set, frozenset, dict)
+
+
+def parse_argument(value):
+    """ Return a Template if the argument holds placeholders, be it in
+    a string or in (nested) lists, tuples, sets or dictionaries.
+    Otherwise give back the argument itself as a constant, which is
+    then passed to the validator as it is, without copying.
+    """
+    if isinstance(value, string_types):
+        if RE_FIELD_NAME.search(value):
+            return Template(value)
+        return value
+    kind = type(value)
+    if kind not in CONTAINER_TYPES:
+        return value
+    if kind is dict:
+        items = [(key, parse_argument(item)) for key, item in value.items()]
+        templated = any(isinstance(item, Template) for key, item in items)
+    else:
+        items = [parse_argument(item) for item in value]
+        templated = any(isinstance(item, Template) for item in items)
+    if templated:
+        return ContainerTemplate(kind, items)
+    return value
+
+
+def bind_argument(value, suffix):
+    """ Bind a parsed argument to the given set suffix. """
+    if isinstance(value, Template):
+        return value.substitute(suffix)
+    return value
+
+
+class ValidatorPlan(object):
+    """ A validator together with its pre-parsed arguments. """
+
+    __slots__ = ('validator', 'args', 'kwargs', 'parsed_args',
+                 'parsed_kwargs', 'templated', 'references')
+
+    def __init__(self, validator, args, kwargs):
+        self.validator = validator
+        self.args = args
+        self.kwargs = kwargs
+        self.parsed_args = tuple(parse_argument(arg) for arg in args)
+        self.parsed_kwargs = dict((key, parse_argument(arg))
+                                  for key, arg in kwargs.items())
+        # The number of arguments holding placeholders.
+        self.templated = (
+            sum(isinstance(arg, Template) for arg in self.parsed_args) +
+            sum(isinstance(arg, Template) for arg in self.parsed_kwargs.values()))
+        # The field names the arguments may refer to, as (name, templated)
+        # tuples. Plain strings are kept as well, EqualTo('handy') being
+        # as much a reference as EqualTo('%handy%') is.
+        references = []
+        for arg in self.parsed_args + tuple(self.parsed_kwargs.values()):
+            if isinstance(arg, Template):
+                references.extend((name, True) for name in arg.names if name)
+            elif isinstance(arg, string_types):
+                references.append((arg, False))
+        self.references = tuple(references)
+
+    def build(self, suffix=None, cache=None, record=None):
+        """ Bind the arguments and return the validator instance.
+
+        :param suffix:
+            The set suffix ("_X") to apply to the %field% placeholders,
+            or None when the field is not part of a set.
+        :param cache:
+            An optional LRUCache to share validator instances built
+            with the same arguments.
+        :param record:
+            An optional ProcessRecord to account the work in.
+        """
+        if suffix is None or not self.templated:
+            args, kwargs = self.args, self.kwargs
+        else:
+            if record is not None:
+                start = timer()
+            args = tuple(bind_argument(arg, suffix) for arg in self.parsed_args)
+            kwargs = dict((key, bind_argument(arg, suffix))
+                          for key, arg in self.parsed_kwargs.items())
+            if record is not None:
+                record.timings['substitute'] += timer() - start
+                record.counters['substitutions'] += self.templated
+
+        if cache is None or not is_cacheable(self.validator):
+            return self.construct(args, kwargs, record)
+
+        try:
+            key = (self.validator, freeze(args), freeze(kwargs))
+        except TypeError:
+            # Some argument can not be hashed, so it can not be cached.
+            return self.construct(args, kwargs, record)
+        validator = cache.get(key)
+        if validator is None:
+            validator = self.construct(args, kwargs, record)
+            cache.put(key, validator)
+        return validator
+
+    def construct(self, args, kwargs, record=None):
+        """ Return a new validator instance for the bound arguments. """
+        if record is None:
+            return self.validator(*args, **kwargs)
+        start = timer()
+        validator = self.validator(*args, **kwargs)
+        record.timings['bind_validators'] += timer() - start
+        record.counters['validators_constructed'] += 1
+        return validator
+
+
+class FieldPlan(object):
+    """ Everything needed to build one canonical field. """
+
+    __slots__ = ('name', 'label', 'field_type', 'args', 'kwargs',
+                 'validators')
+
+    def __init__(self, name, label, field_type, args, kwargs, validators):
+        self.name = name
+        self.label = label
+        self.field_type = field_type
+        self.args = args
+        self.kwargs = kwargs
+        self.validators = tuple(validators)
+
+    def build(self, set_number=None, validator_cache=None, record=None):
+        """ Return the (unbound) field for a canonical name or set member.
+
+        :param set_number:
+            The set number as a string, or None when not in a set.
+        :param validator_cache:
+            An optional LRUCache to share validator instances.
+        :param record:
+            An optional ProcessRecord to account the work in.
+        """
+        suffix = None if set_number is None else '_' + set_number
+        validators = [validator.build(suffix, validator_cache, record)
+                      for validator in self.validators]
+        return self.field_type(self.label,
+                               validators=validators,
+                               *self.args,
+                               **self.kwargs)
+
+
+class Plan(object):
+    """ The compiled, read-only form of a WTFormsDynamicFields
+    configuration.
+
+    Built once from the configuration dictionary and reused
+    for every call to "process" until the configuration changes.
+    """
+
+    __slots__ = ('fields', 'resolver', 'graph', 'config', 'uncacheable')
+
+    def __init__(self, fields, config=None):
+        self.fields = fields
+        # The configuration dictionary the plan was compiled from.
+        self.config = config
+        # The canonical fields with validators that must not be shared,
+        # see no_validator_cache(). Anything built for these has to be
+        # built again for every form.
+        self.uncacheable = frozenset(
+            name for name, field in fields.items()
+            if not all(is_cacheable(validator.validator)
+                       for validator in field.validators))
+        self.resolver = FieldResolver(fields)
+        self.graph = DependencyGraph(fields, self.resolver)
+
+    @classmethod
+    def from_config(cls, config):
+        """ Compile the configuration dictionary of FieldSpecs. """
+        fields = {}
+        for name, spec in config.items():
+            validators = [ValidatorPlan(validator.validator, validator.args,
+                                        validator.kwargs)
+                          for validator in spec.validators]
+            fields[name] = FieldPlan(name, spec.label, spec.type,
+                                     spec.args, spec.kwargs, validators)
+        return cls(fields, config)
@@ -0,0 +1,169 @@
+import threading
+from collections import namedtuple
+from .cache import CacheInfo, LRUCache
+from .plan import string_types
+from .wtforms_dynamic_fields import WTFormsDynamicFields
+
+RegistryInfo = namedtuple('RegistryInfo',
+                          CacheInfo._fields + ('loads', 'coalesced', 'failures'))
+
+# Stands for every version of a tenant, see ConfigRegistry.invalidate().
+ALL_VERSIONS = object()
+
+
+class PendingLoad(object):
+    """ A load in progress, which other threads asking for the same
+    configuration wait for instead of loading it themselves. A load
+    turns stale when its configuration is invalidated meanwhile, its
+    result is then handed to the waiting threads but not kept.
+    """
+
+    __slots__ = ('done', 'value', 'error', 'stale')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.stale = False
+
+
+class ConfigRegistry(object):
+    """ Keeps the configurations of many tenants, loading them on demand.
+
+    Configurations are looked up by (tenant, version) and loaded with
+    the given loader callback when they are not in the registry. They
+    are kept in a least recently used cache, bounded by their number
+    or, with a "weigh" callable, by their estimated size. Lookups are
+    thread-safe, and threads asking for the same missing configuration
+    at the same time wait for a single load.
+    """
+
+    def __init__(self, loader, maxsize=128, weigh=None, precompile=True):
+        """ Registry init.
+        :param loader: A callable taking a tenant and version and returning
+            its WTFormsDynamicFields instance or snapshot (see
+            WTFormsDynamicFields.snapshot()).
+        :param maxsize: How many configurations to keep, or their total
+            weight when "weigh" is given. None lets the registry grow
+            unbounded.
+        :param weigh: An optional callable returning the weight of a
+            configuration, "configuration_weight" for example.
+        :param precompile: Compile the configurations as they are loaded,
+            so requests never pay for it.
+        """
+        self.loader = loader
+        self.precompile = precompile
+        self.cache = LRUCache(maxsize, weigh)
+        self.loads = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant, version=None):
+        """ Return the WTFormsDynamicFields instance of a tenant, loading
+        it if needed. Errors of the loader are raised to every thread
+        waiting for the load, and nothing is kept.
+        """
+        key = (tenant, version)
+        with self._lock:
+            pending = self._loading.get(key)
+            if pending is None:
+                dynamic = self.cache.get(key)
+                if dynamic is not None:
+                    return dynamic
+                pending = self._loading[key] = PendingLoad()
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            dynamic = self._load(tenant, version)
+        except BaseException as e:
+            with self._lock:
+                self.failures += 1
+                if not pending.stale:
+                    del self._loading[key]
+            pending.error = e
+            pending.done.set()
+            raise
+
+        with self._lock:
+            self.loads += 1
+            # A stale load was already forgotten by invalidate(), and
+            # may have been started again with the new configuration.
+            if not pending.stale:
+                # Store it before the load is forgotten, so there is no
+                # moment at which another thread would load it again.
+                self.cache.put(key, dynamic)
+                del self._loading[key]
+        pending.value = dynamic
+        pending.done.set()
+        return dynamic
+
+    def _load(self, tenant, version):
+        """ Call the loader and prepare its result for use. """
+        dynamic = self.loader(tenant, version)
+        if isinstance(dynamic, (dict, ) + string_types):
+            dynamic = WTFormsDynamicFields.from_snapshot(dynamic)
+        elif not isinstance(dynamic, WTFormsDynamicFields):
+            raise TypeError('The loader gave {0!r} instead of a '
+                            'WTFormsDynamicFields instance.'.format(dynamic))
+        if self.precompile:
+            dynamic.compile()
+        return dynamic
+
+    def invalidate(self, tenant, version=ALL_VERSIONS):
+        """ Drop the configuration of a tenant, by default all its
+        versions, so it gets loaded again when asked for. Loads still
+        in progress are not kept once they finish.
+        """
+        if version is ALL_VERSIONS:
+            matches = lambda key: key[0] == tenant
+        else:
+            matches = lambda key: key == (tenant, version)
+        with self._lock:
+            self._forget_loads(matches)
+            if version is ALL_VERSIONS:
+                self.cache.discard(matches)
+            else:
+                self.cache.pop((tenant, version))
+
+    def clear(self):
+        """ Drop all configurations. The statistics are kept. """
+        with self._lock:
+            self._forget_loads(lambda key: True)
+            self.cache.clear()
+
+    def _forget_loads(self, matches):
+        """ Mark the loads in progress of the matching keys as stale.
+        Call with the lock held.
+        """
+        for key in [key for key in self._loading if matches(key)]:
+            self._loading.pop(key).stale = True
+
+    def info(self):
+        """ Return the registry statistics as a RegistryInfo tuple. """
+        return RegistryInfo(*(tuple(self.cache.info()) +
+                              (self.loads, self.coalesced, self.failures)))
+
+    def __contains__(self, key):
+        return key in self.cache
+
+    def __len__(self):
+        return len(self.cache)
+
+
+def configuration_weight(dynamic):
+    """ A rough weight of a configuration: its number of fields and
+    validators, which is what its memory use mostly depends on.
+    """
+    return sum(1 + len(field.validators)
+               for field in dynamic._config().values()) or 1
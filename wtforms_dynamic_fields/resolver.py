@@ -0,0 +1,162 @@
+import re
+
+# A placeholder token of a pattern name, "<kind>" in "addr_<kind>".
+RE_PLACEHOLDER = re.compile(r'^<[a-zA-Z0-9]+>$')
+
+# The set number of a set member, "2" in "email_2". Only ASCII digits,
+# str.isdigit() also takes "²" and the like, which int() refuses.
+RE_SET_NUMBER = re.compile(r'[0-9]+\Z')
+
+# The keys of the trie nodes for a placeholder token and for the end
+# of a pattern. Tokens are strings, so these never clash with them.
+WILDCARD = object()
+END = object()
+
+# The longest field name the FieldResolver remembers.
+MEMO_KEY_LENGTH = 256
+
+
+def is_pattern(name):
+    """ Return True if the canonical name holds "<placeholder>" tokens. """
+    return '<' in name or '>' in name
+
+
+def is_set_number(number):
+    """ Return True if the string is a valid set number. """
+    return RE_SET_NUMBER.match(number) is not None
+
+
+def pattern_tokens(name):
+    """ Split a pattern name on "_" into its tokens, with WILDCARD for
+    each placeholder. A placeholder has to be a token of its own and
+    matches any non-empty token of a POST key.
+
+    Raises a ValueError for a malformed pattern.
+    """
+    tokens = []
+    for token in name.split('_'):
+        if RE_PLACEHOLDER.match(token):
+            tokens.append(WILDCARD)
+        elif is_pattern(token):
+            raise ValueError('Malformed field name pattern "{0}": placeholders '
+                             'have to be whole "_" separated parts, like '
+                             '"addr_<kind>".'.format(name))
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class PatternTrie(object):
+    """ All pattern names combined into one trie over their "_"
+    separated tokens. Matching a key walks the trie once along its
+    tokens, so its cost depends on the length of the key and not on
+    the number of patterns.
+    """
+
+    __slots__ = ('root', 'depth')
+
+    def __init__(self, names):
+        self.root = {}
+        self.depth = 0
+        for name in names:
+            tokens = pattern_tokens(name)
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[END] = name
+            self.depth = max(self.depth, len(tokens))
+
+    def match(self, tokens, count):
+        """ Return the pattern matching the first "count" tokens,
+        or None. A literal token wins over a placeholder.
+        """
+        if count > self.depth:
+            return None
+        return self._walk(self.root, tokens, 0, count)
+
+    def _walk(self, node, tokens, index, count):
+        if index == count:
+            return node.get(END)
+        token = tokens[index]
+        child = node.get(token)
+        if child is not None:
+            found = self._walk(child, tokens, index + 1, count)
+            if found is not None:
+                return found
+        child = node.get(WILDCARD)
+        if child is not None and token:
+            return self._walk(child, tokens, index + 1, count)
+        return None
+
+
+class FieldResolver(object):
+    """ Resolve POST field names to their canonical name and set number.
+
+    A field name resolves when it is either a canonical name itself
+    (not in a set) or a canonical name followed by one "_X" suffix
+    where X is a number (a set member). The exact match always wins,
+    which keeps canonical names that end in "_<digits>" themselves
+    unambiguous: with both "phone" and "phone_2" configured, "phone_2"
+    is the canonical field and "phone_2_1" is a member of its set.
+
+    Canonical names may be patterns with "<placeholder>" parts, like
+    "addr_<kind>", which resolves "addr_home" and, as a set member,
+    "addr_home_2". The patterns are only tried for names that do not
+    resolve to a plain canonical name, all at once through a
+    PatternTrie.
+
+    Resolved names are remembered, so repeated keys cost a single
+    dictionary lookup. The memo outlives the request and its keys come
+    from the client, so rejected names and names longer than
+    "MEMO_KEY_LENGTH" are not kept, and the memo is emptied once it
+    holds "maxsize" names.
+    """
+
+    __slots__ = ('names', 'patterns', 'maxsize', '_memo')
+
+    def __init__(self, names, maxsize=10000):
+        """ Build the resolver.
+        :param names: The configured canonical field names
+        :param maxsize: How many resolved field names to remember
+        """
+        names = frozenset(names)
+        patterns = [name for name in names if is_pattern(name)]
+        self.names = names.difference(patterns)
+        self.patterns = PatternTrie(patterns) if patterns else None
+        self.maxsize = maxsize
+        self._memo = {}
+
+    def resolve(self, field):
+        """ Return (canonical name, set number) for the field, with the
+        set number as a string or None when it is not in a set.
+        Returns None if the field does not match the configuration.
+        """
+        try:
+            return self._memo[field]
+        except KeyError:
+            pass
+
+        result = None
+        if field in self.names:
+            result = (field, None)
+        else:
+            # Parse the trailing "_X" only once.
+            cname, sep, number = field.rpartition('_')
+            is_member = sep and is_set_number(number)
+            if is_member and cname in self.names:
+                result = (cname, number)
+            elif self.patterns is not None:
+                tokens = field.split('_')
+                pattern = self.patterns.match(tokens, len(tokens))
+                if pattern is not None:
+                    result = (pattern, None)
+                elif is_member:
+                    pattern = self.patterns.match(tokens, len(tokens) - 1)
+                    if pattern is not None:
+                        result = (pattern, number)
+
+        if result is not None and len(field) <= MEMO_KEY_LENGTH:
+            if len(self._memo) >= self.maxsize:
+                self._memo.clear()
+            self._memo[field] = result
+        return result
@@ -0,0 +1,196 @@
+from importlib import import_module
+from .compat import integer_types, string_types
+from .exceptions import SnapshotError
+from .resolver import is_pattern, pattern_tokens
+from .specs import NO_KWARGS, FieldSpec, ValidatorSpec
+
+# The version of the snapshot format written by dump_config().
+SNAPSHOT_VERSION = 1
+
+# Values that JSON handles as they are.
+PLAIN_TYPES = string_types + integer_types + (float, bool, type(None))
+
+
+def import_path(obj):
+    """ Return the "module:name" import path of a class or function,
+    raising a SnapshotError if it can not be imported back.
+    """
+    module = getattr(obj, '__module__', None)
+    name = getattr(obj, '__qualname__', None) or getattr(obj, '__name__', None)
+    if module is None or name is None or '<locals>' in name:
+        raise SnapshotError('{0!r} can not be referred to by an import '
+                            'path.'.format(obj))
+    path = '{0}:{1}'.format(module, name)
+    try:
+        imported = resolve_path(path)
+    except SnapshotError:
+        imported = None
+    if imported is not obj:
+        raise SnapshotError('{0!r} is not importable as "{1}".'.format(obj, path))
+    return path
+
+
+def resolve_path(path, resolved=None):
+    """ Return the object an import_path() refers to.
+
+    :param path: The "module:name" import path
+    :param resolved: An optional dictionary of the paths resolved so far
+    """
+    if resolved is not None and path in resolved:
+        return resolved[path]
+    if not isinstance(path, string_types) or ':' not in path:
+        raise SnapshotError('Invalid import path {0!r}.'.format(path))
+    module_name, name = path.split(':', 1)
+    try:
+        obj = import_module(module_name)
+        for attribute in name.split('.'):
+            obj = getattr(obj, attribute)
+    except (ImportError, AttributeError) as e:
+        raise SnapshotError('Can not import "{0}": {1}'.format(path, e))
+    if resolved is not None:
+        resolved[path] = obj
+    return obj
+
+
+def encode_value(value):
+    """ Return a plain data (JSON) version of an argument.
+
+    Lists, strings, numbers, booleans and None are kept as they are.
+    Tuples, dictionaries and importable classes or functions are
+    wrapped in a dictionary with a single "tuple", "dict" or
+    "import" key, so they can be told apart when loading.
+    """
+    if isinstance(value, PLAIN_TYPES):
+        return value
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {'tuple': [encode_value(item) for item in value]}
+    if isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, string_types):
+                raise SnapshotError('Dictionary keys must be strings, '
+                                    'not {0!r}.'.format(key))
+        return {'dict': dict((key, encode_value(item))
+                             for key, item in value.items())}
+    if callable(value):
+        return {'import': import_path(value)}
+    raise SnapshotError('Can not take a snapshot of {0!r}.'.format(value))
+
+
+def decode_value(value, resolved=None):
+    """ Reverse encode_value(). """
+    if isinstance(value, PLAIN_TYPES):
+        return value
+    if isinstance(value, list):
+        return [decode_value(item, resolved) for item in value]
+    if isinstance(value, dict) and len(value) == 1:
+        kind, data = next(iter(value.items()))
+        if kind == 'tuple' and isinstance(data, list):
+            return tuple(decode_value(item, resolved) for item in data)
+        if kind == 'dict' and isinstance(data, dict):
+            return dict((key, decode_value(item, resolved))
+                        for key, item in data.items())
+        if kind == 'import':
+            return resolve_path(data, resolved)
+    raise SnapshotError('Invalid value {0!r} in snapshot.'.format(value))
+
+
+def encode_arguments(args, kwargs):
+    """ Return the plain data (list, dict) version of the arguments. """
+    args = [encode_value(arg) for arg in args]
+    for key in kwargs:
+        if not isinstance(key, string_types):
+            raise SnapshotError('Keyword names must be strings, '
+                                'not {0!r}.'.format(key))
+    kwargs = dict((key, encode_value(arg)) for key, arg in kwargs.items())
+    return args, kwargs
+
+
+def decode_arguments(args, kwargs, resolved=None):
+    """ Reverse encode_arguments(), give back an (args, kwargs) tuple. """
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        raise SnapshotError('Invalid arguments {0!r}, {1!r}.'.format(args, kwargs))
+    # Most arguments are strings or numbers, which need no decoding.
+    for arg in args:
+        if not isinstance(arg, PLAIN_TYPES):
+            args = [decode_value(arg, resolved) for arg in args]
+            break
+    for arg in kwargs.values():
+        if not isinstance(arg, PLAIN_TYPES):
+            kwargs = dict((key, decode_value(arg, resolved))
+                          for key, arg in kwargs.items())
+            break
+    return tuple(args), dict(kwargs)
+
+
+def dump_config(config):
+    """ Return the plain data snapshot of a configuration dictionary
+    of FieldSpecs.
+
+    Every field is a dictionary with its "label", "type" (an import
+    path), "args", "kwargs" and "validators", the latter being a list
+    of [import path, args, kwargs] lists in the order they were added.
+    """
+    fields = {}
+    for name, field in config.items():
+        validators = []
+        for validator in field.validators:
+            args, kwargs = encode_arguments(validator.args, validator.kwargs)
+            validators.append([import_path(validator.validator), args, kwargs])
+        args, kwargs = encode_arguments(field.args, field.kwargs)
+        fields[name] = {
+            'label': encode_value(field.label),
+            'type': import_path(field.type),
+            'args': args,
+            'kwargs': kwargs,
+            'validators': validators,
+        }
+    return {'version': SNAPSHOT_VERSION, 'fields': fields}
+
+
+def load_config(snapshot):
+    """ Validate a snapshot and return its configuration dictionary,
+    as "add_field" and "add_validator" would have built it.
+    """
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError('Not a version {0} snapshot.'.format(SNAPSHOT_VERSION))
+    fields = snapshot.get('fields')
+    if not isinstance(fields, dict):
+        raise SnapshotError('The snapshot has no fields.')
+
+    # Many fields share their types and validators, import them once.
+    resolved = {}
+    config = {}
+    for name, field in fields.items():
+        try:
+            if is_pattern(name):
+                # Malformed patterns are refused by "add_field" as well.
+                try:
+                    pattern_tokens(name)
+                except ValueError as e:
+                    raise SnapshotError(e.args[0])
+            field_type = resolve_path(field['type'], resolved)
+            label = field['label']
+            if not isinstance(label, PLAIN_TYPES):
+                label = decode_value(label, resolved)
+            args, kwargs = decode_arguments(field['args'], field['kwargs'],
+                                            resolved)
+            if not callable(field_type):
+                raise SnapshotError('"{0}" is not a field type.'.format(field['type']))
+            validators = []
+            for path, validator_args, validator_kwargs in field['validators']:
+                validator = resolve_path(path, resolved)
+                if not callable(validator):
+                    raise SnapshotError('"{0}" is not a validator.'.format(path))
+                validator_args, validator_kwargs = decode_arguments(
+                    validator_args, validator_kwargs, resolved)
+                validators.append(ValidatorSpec(validator, validator_args,
+                                                validator_kwargs or NO_KWARGS))
+            config[name] = FieldSpec(label, field_type, args, kwargs or NO_KWARGS,
+                                     tuple(validators))
+        except (KeyError, TypeError, ValueError) as e:
+            if isinstance(e, SnapshotError):
+                raise SnapshotError('Invalid field "{0}": {1}'.format(name, e))
+            raise SnapshotError('Invalid field "{0}": {1!r}'.format(name, e))
+    return config
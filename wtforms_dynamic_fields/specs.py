@@ -0,0 +1,25 @@
+from collections import namedtuple
+
+# The configuration of a single validator: its class (or any callable
+# giving a validator) and the arguments to call it with, as they were
+# passed to "add_validator".
+ValidatorSpec = namedtuple('ValidatorSpec', ['validator', 'args', 'kwargs'])
+
+# The configuration of a single canonical field. The validators are a
+# tuple of ValidatorSpecs, in the order they were added.
+FieldSpec = namedtuple('FieldSpec', ['label', 'type', 'args', 'kwargs',
+                                     'validators'])
+
+# Shared by every spec without keyword arguments, never modified.
+NO_KWARGS = {}
+
+
+def field_spec(label, field_type, args, kwargs):
+    """ Return the FieldSpec of a field without validators. """
+    return FieldSpec(label, field_type, tuple(args), kwargs or NO_KWARGS, ())
+
+
+def add_validator_spec(spec, validator, args, kwargs):
+    """ Return a copy of the FieldSpec with the validator appended. """
+    return spec._replace(validators=spec.validators + (
+        ValidatorSpec(validator, tuple(args), kwargs or NO_KWARGS), ))
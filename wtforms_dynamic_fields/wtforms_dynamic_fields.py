@@ -1,6 +1,68 @@
-import re
+import gc
+import json
 import sys
+import threading
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+from functools import partial
+from timeit import default_timer as timer
+from weakref import WeakKeyDictionary
 from wtforms.form import FormMeta
+from .adapters import adapt
+from .cache import LRUCache
+from .grouped import GroupedFormMixin, row_class
+from .exceptions import (LimitExceededError, SnapshotError,
+                         UnknownReferenceError)
+from .instrumentation import ProcessRecord
+from .incremental import IncrementalForm
+from .lazy import LazyFormMixin
+from .parallel import validate_fields
+from .plan import Plan, string_types
+from .resolver import is_pattern, pattern_tokens
+from .snapshot import dump_config, load_config
+from .specs import add_validator_spec, field_spec
+
+# The static field names per base form class, see base_field_names().
+_base_field_names = WeakKeyDictionary()
+
+
+def form_meta(form):
+    """ Return the Meta class of the given WTForm Form object, combining
+    the Meta classes of its bases the same way FormMeta does.
+    """
+    bases = [mro_class.Meta for mro_class in form.__mro__
+             if 'Meta' in mro_class.__dict__]
+    return type('Meta', tuple(bases), {})
+
+
+def base_field_names(form):
+    """ Return the names of the fields an instance of the given
+    WTForm Form object would have, as a frozenset.
+
+    This mirrors what FormMeta and the form initialization do
+    (the UnboundField class attributes plus the CSRF field if the
+    form's Meta enables it) without instantiating the form. The
+    result is computed once per form class and cached.
+    """
+    try:
+        return _base_field_names[form]
+    except KeyError:
+        pass
+
+    names = set()
+    for name in dir(form):
+        if not name.startswith('_') and hasattr(getattr(form, name), '_formfield'):
+            names.add(name)
+
+    meta = form_meta(form)
+    if getattr(meta, 'csrf', False):
+        names.add(getattr(meta, 'csrf_field_name', 'csrf_token'))
+
+    names = frozenset(names)
+    _base_field_names[form] = names
+    return names
 
 class WTFormsDynamicFields():
     """ Add dynamic (set) fields to a WTForm.
@@ -32,22 +94,80 @@ class WTFormsDynamicFields():
     The latter brings the power to reference set fields with their
     canonical name without needing to care about the set number that
     will be used later on when injecting them in the DOM.
+
+    One instance may be shared by any number of threads. Once a plan
+    was compiled from the configuration dictionary (or it was handed
+    out otherwise) it is never changed in place again: "add_field" and
+    "add_validator" then copy it and publish the copy with a single
+    assignment. A lock serializes these updates, requests only take it
+    to compile the plan of a new configuration. A request reads the
+    configuration (and the plan compiled from it) once, so it runs
+    against that version from start to end, and an update made
+    meanwhile only affects the requests started after it. Form classes
+    are cached per compiled plan, so one built for an older version is
+    never handed out for a newer one.
     """
 
-    def __init__(self, flask_wtf=False):
+    def __init__(self, flask_wtf=False, form_cache_size=128,
+                 validator_cache_size=0, instrument=None, strict=False,
+                 max_post_keys=None, max_fields=None, max_set_members=None,
+                 max_set_number=None, form_cache_max_fields=1000):
         """ Class init.
         :param flask_wtf: Is this form a Flask WTF or a plain WTF instance?
+        :param form_cache_size: How many generated form classes to keep,
+            0 disables the cache and None lets it grow unbounded.
+        :param form_cache_max_fields: The classes of POSTs with more
+            dynamic fields than this are built for their request only
+            and not cached, None caches them all.
+        :param validator_cache_size: How many bound validator instances
+            to share between fields, 0 (the default) disables the cache.
+        :param instrument: A callable that receives a ProcessRecord with
+            the timings and counters of every "process" call, a
+            ProcessStats instance for example. None disables it.
+        :param strict: Raise an UnknownReferenceError when compiling a
+            configuration with %field% placeholders that refer to fields
+            which were not added.
+        :param max_post_keys: The maximum number of POST keys to scan.
+        :param max_fields: The maximum number of dynamic fields per form.
+        :param max_set_members: The maximum number of set members
+            per canonical field.
+        :param max_set_number: The highest set number accepted.
+            A POST going beyond any of these limits (None, the default,
+            meaning no limit) raises a LimitExceededError while it is
+            scanned, before any field or form class is built.
         """
         self._dyn_fields = {}
+        self._plan = None
+        self._write_lock = threading.Lock()
+        # Whether the configuration dictionary may be read without the
+        # write lock held, see _writable_config().
+        self._shared = False
+        self.form_cache = LRUCache(form_cache_size)
+        self.form_cache_max_fields = form_cache_max_fields
+        self.validator_cache = LRUCache(validator_cache_size)
+        self.instrument = instrument
+        self.strict = strict
+        self.max_post_keys = max_post_keys
+        self.max_fields = max_fields
+        self.max_set_members = max_set_members
+        self.max_set_number = max_set_number
         self.flask_wtf=flask_wtf
 
     def add_field(self, name, label, field_type, *args, **kwargs):
-        """ Add the field to the internal configuration dictionary. """
-        if name in self._dyn_fields:
-            raise AttributeError('Field already added to the form.')
-        else:
-            self._dyn_fields[name] = {'label': label, 'type': field_type,
-                                      'args': args, 'kwargs': kwargs}
+        """ Add the field to the internal configuration dictionary.
+
+        The name may be a pattern with "<placeholder>" parts, like
+        "addr_<kind>", to configure a whole family of fields at once.
+        """
+        with self._write_lock:
+            if name in self._dyn_fields:
+                raise AttributeError('Field already added to the form.')
+            if is_pattern(name):
+                # Raises a ValueError for malformed patterns.
+                pattern_tokens(name)
+            config = self._writable_config()
+            config[name] = field_spec(label, field_type, args, kwargs)
+            self._publish(config)
 
     def add_validator(self, name, validator, *args, **kwargs):
         """ Add the validator to the internal configuration dictionary.
@@ -60,20 +180,151 @@ class WTFormsDynamicFields():
         belong to the validator. We let them simply pass through
         to be checked and bound later.
         """
-        if name in self._dyn_fields:
-            if 'validators' in self._dyn_fields[name]:
-                self._dyn_fields[name]['validators'].append(validator)
-                self._dyn_fields[name][validator.__name__] = {}
-                if args:
-                    self._dyn_fields[name][validator.__name__]['args'] = args
-                if kwargs:
-                    self._dyn_fields[name][validator.__name__]['kwargs'] = kwargs
-            else:
-                self._dyn_fields[name]['validators'] = []
-                self.add_validator(name, validator, *args, **kwargs)
-        else:
-            raise AttributeError('Field "{0}" does not exist. '
-                                 'Did you forget to add it?'.format(name))
+        with self._write_lock:
+            if name not in self._dyn_fields:
+                raise AttributeError('Field "{0}" does not exist. '
+                                     'Did you forget to add it?'.format(name))
+            # The specs are immutable, so replace the field's spec
+            # with one holding the new validator as well.
+            config = self._writable_config()
+            config[name] = add_validator_spec(config[name], validator,
+                                              args, kwargs)
+            self._publish(config)
+
+    def snapshot(self):
+        """ Return the configuration as plain data, for "from_snapshot".
+
+        The result only holds dictionaries, lists, strings, numbers,
+        booleans and None, so it can be stored as JSON. Field types,
+        validators and any classes or functions in their arguments are
+        referred to by their import path, so these have to be importable.
+        Raises a SnapshotError for anything else.
+        """
+        return dump_config(self._config())
+
+    @classmethod
+    def from_snapshot(cls, snapshot, **kwargs):
+        """ Create a configuration from a snapshot in one go.
+
+        This is a lot faster than replaying the "add_field" and
+        "add_validator" calls: the snapshot is validated and every
+        import path is resolved once.
+
+        :param snapshot:
+            A dictionary returned by "snapshot", or its JSON string
+        The keyword arguments are passed on to the class init.
+        """
+        if isinstance(snapshot, string_types):
+            try:
+                snapshot = json.loads(snapshot)
+            except ValueError as e:
+                raise SnapshotError('Invalid JSON snapshot: {0}'.format(e))
+        dynamic = cls(**kwargs)
+        dynamic._dyn_fields = load_config(snapshot)
+        return dynamic
+
+    def _config(self):
+        """ Return the configuration dictionary, for reading it without
+        the write lock held. It is copied before it is changed again.
+        """
+        with self._write_lock:
+            self._shared = True
+            return self._dyn_fields
+
+    def _writable_config(self):
+        """ Return the configuration dictionary to change, a copy when
+        it may be read elsewhere (by a compiled plan, say). Changing it
+        in place otherwise keeps building a configuration linear. Call
+        this with the write lock held.
+        """
+        if self._shared:
+            self._shared = False
+            return dict(self._dyn_fields)
+        return self._dyn_fields
+
+    def _publish(self, config):
+        """ Make the changed configuration dictionary the current one.
+        Call this with the write lock held.
+        """
+        self._dyn_fields = config
+        self._invalidate()
+
+    def _invalidate(self):
+        """ Throw away everything derived from the configuration. """
+        self._plan = None
+        self.form_cache.clear()
+        self.validator_cache.clear()
+
+    def compile(self):
+        """ Compile the configuration into a processing plan.
+
+        The plan holds, per canonical field, a ready-made field factory
+        with its validators and their pre-parsed arguments. It is built
+        on first use and kept until the configuration changes, so there
+        is no need to call this method yourself unless you wish to pay
+        the cost upfront (at startup, for example).
+
+        In strict mode, this is where placeholders referring to unknown
+        fields are reported (see "unknown_references"). Validators may
+        be added before the fields they refer to, so this can not be
+        done any earlier.
+        """
+        config = self._dyn_fields
+        plan = self._plan
+        if plan is not None and plan.config is config:
+            return plan
+        # Compile with the write lock held, so threads starting at
+        # once share one plan and none stores an outdated one.
+        with self._write_lock:
+            config = self._dyn_fields
+            plan = self._plan
+            if plan is None or plan.config is not config:
+                plan = Plan.from_config(config)
+                if self.strict and plan.graph.unknown:
+                    raise UnknownReferenceError(plan.graph.unknown)
+                # The plan is known by its dictionary, which must not
+                # change from now on.
+                self._shared = True
+                self._plan = plan
+            return plan
+
+    def unknown_references(self):
+        """ Return the %field% placeholders of the validator arguments
+        that refer to fields which were not added, as a list of
+        (field, validator name, referred name) tuples.
+        """
+        # Not through compile(), which raises on these in strict mode.
+        config = self._config()
+        plan = self._plan
+        if plan is None or plan.config is not config:
+            plan = Plan.from_config(config)
+        return list(plan.graph.unknown)
+
+    def validate_fields(self, form, names):
+        """ Validate some fields of a processed form together with the
+        fields they depend on.
+
+        The fields the validators of the named fields refer to (through
+        %field% placeholders or otherwise, see DependencyGraph) are
+        validated as well, and so are the fields these refer to, and so
+        on. No other field is looked at, with lazy binding none of them
+        gets bound either. The other fields keep the errors they have,
+        if any, from an earlier validation.
+
+        :param form:
+            A form returned by "process"
+        :param names:
+            The names of the fields to validate
+        Returns True if none of the validated fields has errors.
+        """
+        names = self.compile().graph.closure(form, names)
+        extra = {}
+        for name in names:
+            inline = getattr(form.__class__, 'validate_%s' % name, None)
+            if inline is not None:
+                extra[name] = [inline]
+        form._errors = None
+        return validate_fields(form, names, extra)
 
     @staticmethod
     def iteritems(dict):
@@ -87,7 +338,330 @@ class WTFormsDynamicFields():
         else:
             return dict.iteritems()
 
-    def process(self, form, post):
+    def _build_form_class(self, form, plan, dynamic_fields, lazy=False,
+                          record=None, grouped=False):
+        """ Subclass the given form and attach the dynamic fields.
+
+        :param form:
+            A valid WTForm Form object
+        :param plan:
+            The compiled plan to build the fields with
+        :param dynamic_fields:
+            An ordered mapping of field names to their
+            (canonical name, set number)
+        :param lazy:
+            Whether to bind the dynamic fields on first access
+        :param record:
+            An optional ProcessRecord to account the work in
+        :param grouped:
+            Whether to group the set members into rows
+        """
+        validator_cache = self.validator_cache if self.validator_cache.maxsize != 0 else None
+        if record is not None:
+            start = timer()
+            # Substitution and validator binding are accounted
+            # separately, so leave them out of the class building.
+            nested = record.timings['substitute'] + record.timings['bind_validators']
+
+        if lazy:
+            class F(LazyFormMixin, form):
+                _dynamic_fields = dynamic_fields
+                _lazy_fields = OrderedDict()
+                _lazy_unbound = {}
+
+            for field, (field_cname, set_number) in self.iteritems(dynamic_fields):
+                # Only keep a factory around, the field (and its
+                # validators) will be built when it is first needed.
+                F._lazy_fields[field] = partial(plan.fields[field_cname].build,
+                                                set_number, validator_cache)
+        elif grouped:
+            class F(GroupedFormMixin, form):
+                _dynamic_fields = dynamic_fields
+                _rows = OrderedDict()
+
+            # Collect the member names (without their set suffix) and
+            # canonical names of each set number, the fields outside
+            # of any set are added as usual.
+            shapes = OrderedDict()
+            for field, (field_cname, set_number) in self.iteritems(dynamic_fields):
+                if set_number is None:
+                    setattr(F, field, plan.fields[field_cname].build(None,
+                                                                     validator_cache,
+                                                                     record))
+                else:
+                    base = field[:-len(set_number) - 1]
+                    shapes.setdefault(set_number, []).append((base, field_cname))
+
+            # Set numbers with the same member names share a row class.
+            row_classes = {}
+            for set_number, members in self.iteritems(shapes):
+                shape = tuple(base for base, field_cname in members)
+                row = row_classes.get(shape)
+                if row is None:
+                    row = row_classes[shape] = row_class(shape)
+                row.unbound_fields[set_number] = tuple(
+                    plan.fields[field_cname].build(set_number, validator_cache, record)
+                    for base, field_cname in members)
+                F._rows[set_number] = row
+        else:
+            class F(form):
+                # Keep track of the canonical name and set number of
+                # each dynamic field for later inspection.
+                _dynamic_fields = dynamic_fields
+
+            for field, (field_cname, set_number) in self.iteritems(dynamic_fields):
+                # Let the compiled plan build the field. If we are in a set,
+                # the %field_name% placeholders in the validator arguments
+                # get suffixed with the current set number.
+                setattr(F, field, plan.fields[field_cname].build(set_number,
+                                                                 validator_cache,
+                                                                 record))
+
+        if record is not None:
+            nested = (record.timings['substitute'] +
+                      record.timings['bind_validators'] - nested)
+            record.timings['build_class'] += timer() - start - nested
+            if not lazy:
+                record.counters['set_members_bound'] += sum(
+                    1 for cname, set_number in dynamic_fields.values()
+                    if set_number is not None)
+        return F
+
+    def _match_fields(self, form, plan, post, record=None):
+        """ Return an ordered mapping of the dynamic fields among the POST
+        keys to their (canonical name, set number).
+
+        :param form:
+            A valid WTForm Form object, whose fields are skipped,
+            or None
+        :param plan:
+            The compiled plan to resolve the keys with
+        :param post:
+            A PostAdapter with the POST variables
+        :param record:
+            An optional ProcessRecord to account the work in
+        """
+        if record is not None:
+            start = timer()
+        base_fields = base_field_names(form) if form is not None else frozenset()
+        resolve = plan.resolver.resolve
+        plan_fields = plan.fields
+        scanned = skipped = duplicates = rejected = 0
+        max_post_keys = self.max_post_keys
+        max_fields = self.max_fields
+        max_set_members = self.max_set_members
+        max_set_number = self.max_set_number
+        members = {}
+
+        # Collect the dynamic fields found in the POST, in order,
+        # together with their canonical name and set number.
+        dynamic_fields = OrderedDict()
+        for field, split in post.fields():
+            scanned += 1
+            if max_post_keys is not None and scanned > max_post_keys:
+                raise LimitExceededError('max_post_keys', max_post_keys)
+            if field in base_fields:
+                # Skip it if the POST field is one of the standard form
+                # fields.
+                skipped += 1
+                continue
+            if field in dynamic_fields:
+                # Or if we already picked it up.
+                duplicates += 1
+                continue
+            if split is None:
+                resolved = resolve(field)
+            else:
+                # The adapter split the key already (rows of a JSON
+                # payload), only check it is configured. Row keys may
+                # still have to be matched against the pattern names.
+                if split[0] in plan_fields:
+                    resolved = split
+                else:
+                    resolved = resolve(split[0])
+                    if resolved is not None:
+                        resolved = (None if resolved[1] is not None
+                                    else (resolved[0], split[1]))
+            if resolved is None:
+                # The field did not match to a canonical name
+                # from the fields dictionary or the name
+                # was malformed, throw it out.
+                rejected += 1
+                continue
+            if max_fields is not None and len(dynamic_fields) >= max_fields:
+                raise LimitExceededError('max_fields', max_fields, field)
+            field_cname, set_number = resolved
+            if set_number is not None:
+                if max_set_number is not None:
+                    # Compare the digits first, int() of a very long
+                    # number is costly in itself.
+                    digits = set_number.lstrip('0')
+                    if (len(digits) > len(str(max_set_number)) or
+                            int(digits or '0') > max_set_number):
+                        raise LimitExceededError('max_set_number',
+                                                 max_set_number, field)
+                if max_set_members is not None:
+                    count = members[field_cname] = members.get(field_cname, 0) + 1
+                    if count > max_set_members:
+                        raise LimitExceededError('max_set_members',
+                                                 max_set_members, field)
+            # Remember the canonical name and, if we are in a set,
+            # the set number we are at.
+            dynamic_fields[field] = resolved
+
+        if record is not None:
+            record.timings['match'] += timer() - start
+            record.counters['keys_scanned'] += scanned
+            record.counters['keys_skipped_base'] += skipped
+            record.counters['keys_duplicate'] += duplicates
+            record.counters['keys_rejected'] += rejected
+        return dynamic_fields
+
+    def _form_class(self, form, plan, post, lazy=False, record=None,
+                    grouped=False):
+        """ Return the generated form class for the fields in the POST.
+
+        :param form:
+            A valid WTForm Form object
+        :param plan:
+            The compiled plan to build the fields with
+        :param post:
+            The POST variables, see adapt()
+        :param lazy:
+            Whether to bind the dynamic fields on first access
+        :param record:
+            An optional ProcessRecord to account the work in
+        :param grouped:
+            Whether to group the set members into rows
+        """
+        dynamic_fields = self._match_fields(form, plan, adapt(post), record)
+
+        # Forms with the same dynamic fields share the same class,
+        # so only build one when this shape was not seen before. The
+        # plan is part of the key, a class built by a request that
+        # started before a configuration change may still be stored.
+        key = (form, tuple(dynamic_fields), lazy, grouped, plan)
+        uncacheable = plan.uncacheable
+        max_fields = self.form_cache_max_fields
+        if ((max_fields is not None and len(dynamic_fields) > max_fields) or
+                (uncacheable and any(cname in uncacheable for cname, set_number
+                                     in dynamic_fields.values()))):
+            # Keep large (possibly hostile) shapes from filling the cache
+            # with huge classes. A cached class would also share the
+            # validators of its fields between all its forms, which some
+            # validators opted out of.
+            return self._build_form_class(form, plan, dynamic_fields, lazy,
+                                          record, grouped)
+        F = self.form_cache.get(key)
+        if F is None:
+            F = self._build_form_class(form, plan, dynamic_fields, lazy,
+                                       record, grouped)
+            self.form_cache.put(key, F)
+        elif record is not None:
+            record.counters['form_cache_hits'] += 1
+        return F
+
+    def clear_form_cache(self, form=None):
+        """ Drop the cached form classes.
+
+        :param form:
+            Only drop the classes generated for this WTForm Form
+            object. When omitted, the whole cache is cleared.
+        """
+        if form is None:
+            self.form_cache.clear()
+        else:
+            self.form_cache.discard(lambda key: key[0] is form)
+
+    @staticmethod
+    def shape_keys(shape):
+        """ Return the POST keys of a form shape, see "warmup".
+
+        :param shape:
+            Either a mapping of canonical names to their set size (None
+            for a field outside of any set), or the POST keys themselves.
+            The keys of a mapping come out the way a browser posts rows:
+            the fields outside of a set first, then row by row, each
+            row holding its members in the order of the mapping.
+        """
+        if not hasattr(shape, 'items'):
+            return list(shape)
+        keys = [name for name, size in shape.items() if size is None]
+        rows = max([size for size in shape.values() if size is not None] or [0])
+        for set_number in range(1, rows + 1):
+            for name, size in shape.items():
+                if size is not None and set_number <= size:
+                    keys.append('{0}_{1}'.format(name, set_number))
+        return keys
+
+    def warmup(self, form, shapes, lazy=False, grouped=False, freeze=False,
+               validate=False):
+        """ Do the work of the first requests upfront.
+
+        Compiles the configuration, collects the field names of the base
+        form and builds (and caches) the form class of every given shape,
+        binding its validators and filling the validator cache when that
+        is enabled. Each class is instantiated once with empty values,
+        which leaves nothing to initialize on the first real request of
+        that shape.
+
+        Meant to run in the master process of a pre-forking server
+        (gunicorn, uWSGI) before the workers are forked, so they all
+        start warm and share the memory of these objects.
+
+            dynamic.warmup(PersonalFile, [{'email': 3, 'comment': None}])
+
+        Make sure the form cache is large enough for the shapes, the
+        least recently built ones are dropped from it otherwise, and
+        that no shape has more than "form_cache_max_fields" fields.
+        Flask WTF forms need a request context to be instantiated, so
+        for these only the classes are built.
+
+        :param form:
+            A valid WTForm Form object
+        :param shapes:
+            An iterable of the expected form shapes, see "shape_keys".
+            The POST keys of a shape have to be in the order the
+            browser posts them, as that order is part of the cache key.
+        :param lazy:
+            See "process"
+        :param grouped:
+            See "process"
+        :param freeze:
+            Call gc.freeze() (Python 3.7 and up) once done, which moves
+            every object alive into a permanent generation the garbage
+            collector no longer touches. The workers then do not write
+            to (and so copy) the memory pages they share with the master.
+        :param validate:
+            Validate each instance as well, to warm up the validators.
+            Off by default: validators doing I/O (database or cache
+            lookups) would open connections in the master that all
+            forked workers then share.
+        Returns the form classes, in the order of the shapes.
+        """
+        if not isinstance(form, FormMeta):
+            raise TypeError('Given form is not a valid WTForm.')
+        if lazy and grouped:
+            raise ValueError('Lazy binding and grouping can not be combined.')
+
+        plan = self.compile()
+        base_field_names(form)
+        classes = []
+        for shape in shapes:
+            post = adapt(OrderedDict((key, u'') for key in self.shape_keys(shape)))
+            F = self._form_class(form, plan, post, lazy, None, grouped)
+            if not self.flask_wtf:
+                instance = F(post)
+                if validate:
+                    instance.validate()
+            classes.append(F)
+
+        if freeze and hasattr(gc, 'freeze'):
+            gc.collect()
+            gc.freeze()
+        return classes
+
+    def process(self, form, post, lazy=False, grouped=False):
         """ Process the given WTForm Form object.
 
         Itterate over the POST values and check each field
@@ -103,106 +677,35 @@ class WTFormsDynamicFields():
         :param form:
             A valid WTForm Form object
         :param post:
-            A MultiDict with the POST variables
+            The POST variables: a WebOb or Werkzeug MultiDict, a plain
+            mapping (a decoded JSON payload, whose lists of objects are
+            taken as rows of set members) or a PostAdapter. They are
+            read as they are, see adapters.py.
+        :param lazy:
+            Bind each dynamic field (and its validators) only when it is
+            first accessed, iterated, validated or rendered. Useful when
+            only part of many posted fields is used by a request.
+        :param grouped:
+            Group the set members by set number into rows, available as
+            "form.rows[3]" and "form.sets['email'][3]", instead of adding
+            each member as a field of the form class. Keeps the form
+            class and its fields small for large sets, see GroupedFormMixin.
         """
 
         if not isinstance(form, FormMeta):
             raise TypeError('Given form is not a valid WTForm.')
+        if lazy and grouped:
+            raise ValueError('Lazy binding and grouping can not be combined.')
+        post = adapt(post)
 
-        re_field_name = re.compile(r'\%([a-zA-Z0-9_]*)\%')
+        record = None
+        if self.instrument is not None:
+            record = ProcessRecord(form)
 
-        class F(form):
-            pass
-
-        for field, data in post.iteritems():
-            if field in F():
-                # Skip it if the POST field is one of the standard form fields.
-                continue
-            else:
-                if field in self._dyn_fields:
-                    # If we can find the field name directly, it means the field
-                    # is not a set so just set the canonical name and go on.
-                    field_cname = field
-                    # Since we are not in a set, (re)set the current set.
-                    current_set_number = None
-                elif (field.split('_')[-1].isdigit()
-                      and field[:-(len(field.split('_')[-1]))-1] in self._dyn_fields.keys()):
-                    # If the field can be split on underscore characters,
-                    # the last part contains only digits and the 
-                    # everything *but* the last part is found in the
-                    # field configuration, we are good to go.
-                    # (Cowardly refusing to use regex here).
-                    field_cname = field[:-(len(field.split('_')[-1]))-1]
-                    # Since we apparently are in a set, remember the
-                    # the set number we are at.
-                    current_set_number = str(field.split('_')[-1])
-                else:
-                    # The field did not match to a canonical name
-                    # from the fields dictionary or the name
-                    # was malformed, throw it out.
-                    continue
-
-            # Since the field seems to be a valid one, let us
-            # prepare the validator arguments and, if we are in a set
-            # replace the %field_name% convention where we find it.
-            validators = []
-            if 'validators' in self._dyn_fields[field_cname]:
-                for validator in self._dyn_fields[field_cname]['validators']:
-                    args = []
-                    kwargs = {}
-                    if 'args' in self._dyn_fields[field_cname]\
-                       [validator.__name__]:
-                        if not current_set_number:
-                            args = self._dyn_fields[field_cname]\
-                                   [validator.__name__]['args']
-                        else:
-                            # If we are currently in a set, append the set number
-                            # to all the words that are decorated with %'s within
-                            # the arguments.
-                            for arg in self._dyn_fields[field_cname]\
-                                [validator.__name__]['args']:
-                                try:
-                                    arg = re_field_name.sub(r'\1'+'_'+current_set_number,
-                                                            arg)
-                                except:
-                                    # The argument does not seem to be regex-able
-                                    # Probably not a string, thus we can skip it.
-                                    pass
-                                args.append(arg)
-                    if 'kwargs' in self._dyn_fields[field_cname]\
-                       [validator.__name__]:
-                        if not current_set_number:
-                            kwargs = self._dyn_fields[field_cname]\
-                                     [validator.__name__]['kwargs']
-                        else:
-                            # If we are currently in a set, append the set number
-                            # to all the words that are decorated with %'s within
-                            # the arguments.
-                            for key, arg in self.iteritems(self._dyn_fields[field_cname]\
-                                [validator.__name__]['kwargs']):
-                                try:
-                                    arg = re_field_name.sub(r'\1'+'_'+current_set_number,
-                                                            arg)
-                                except:
-                                    # The argument does not seem to be regex-able
-                                    # Probably not a string, thus we can skip it.
-                                    pass
-                                kwargs[key] = arg
-                    # Finally, bind arguments to the validator
-                    # and add it to the list
-                    validators.append(validator(*args, **kwargs))
-
-            # The field is setup, it is time to add it to the form.
-            field_type = self._dyn_fields[field_cname]['type']
-            field_label = self._dyn_fields[field_cname]['label']
-            field_args = self._dyn_fields[field_cname]['args']
-            field_kwargs = self._dyn_fields[field_cname]['kwargs']
-
-            setattr(F, field, field_type(field_label,
-                                         validators=validators,
-                                         *field_args,
-                                         **field_kwargs))
+        F = self._form_class(form, self.compile(), post, lazy, record, grouped)
 
+        if record is not None:
+            start = timer()
         # Create an instance of the form with the newly
         # created fields and give it back to the caller.
         if self.flask_wtf:
@@ -211,4 +714,101 @@ class WTFormsDynamicFields():
             form = F()
         else:
             form = F(post)
+        if record is not None:
+            record.timings['instantiate'] = timer() - start
+            self.instrument(record)
         return form
+
+    def engine(self, form=None, cache_size=1024, column_size=16):
+        """ Return a ValidationEngine, to validate plain mappings (the
+        body of a JSON request, say) without building any form.
+
+            errors = dynamic.engine(PersonalFile).validate(data)
+
+        :param form:
+            An optional WTForm Form object whose fields are validated
+            along with the dynamic fields
+        :param cache_size:
+            How many dynamic fields the engine keeps ready for use
+        :param column_size:
+            From how many members on a set is validated column-wise,
+            None to validate field by field
+        """
+        from .engine import ValidationEngine
+        return ValidationEngine(self, form, cache_size, column_size)
+
+    def process_async(self, form, post, lazy=False):
+        """ Process the given WTForm Form object, for use with asyncio.
+
+        Returns an awaitable giving the same form as "process". Use
+        "validate_async" to validate it when some of the validators
+        are coroutines, as "form.validate()" does not await them.
+        Requires Python 3.5 or later.
+
+        :param form:
+            A valid WTForm Form object
+        :param post:
+            A MultiDict with the POST variables
+        :param lazy:
+            See "process"
+        """
+        from .asynchronous import process_async
+        return process_async(self, form, post, lazy)
+
+    def incremental(self, form, lazy=False):
+        """ Return an IncrementalForm for live validation of the given
+        WTForm Form object, see IncrementalForm.validate().
+
+        :param form:
+            A valid WTForm Form object
+        :param lazy:
+            See "process"
+        """
+        if not isinstance(form, FormMeta):
+            raise TypeError('Given form is not a valid WTForm.')
+        return IncrementalForm(self, form, lazy)
+
+    def process_many(self, form, posts, validate=False, lazy=False):
+        """ Process the given WTForm Form object for many POSTs.
+
+        Meant for batch imports, where every row of (say) a CSV or
+        JSON upload is a POST of its own. This is a generator: each
+        row is processed when it is asked for and nothing is kept
+        around afterwards, so any iterable of rows can be handled in
+        constant memory. The compiled plan, base form field names
+        and form classes are shared between the rows.
+
+        Unlike "process", the rows are always passed to the form as
+        its form data, also for Flask WTF forms.
+
+        :param form:
+            A valid WTForm Form object
+        :param posts:
+            An iterable of POST variables, see "process"
+        :param validate:
+            Instead of the forms, yield an (index, valid, errors)
+            tuple for each row.
+        :param lazy:
+            See "process"
+        """
+        if not isinstance(form, FormMeta):
+            raise TypeError('Given form is not a valid WTForm.')
+
+        for index, post in enumerate(posts):
+            post = adapt(post)
+            record = None
+            if self.instrument is not None:
+                record = ProcessRecord(form)
+            # Compiling is a no-op unless the configuration changed.
+            F = self._form_class(form, self.compile(), post, lazy, record)
+            if record is not None:
+                start = timer()
+            processed = F(post)
+            if record is not None:
+                record.timings['instantiate'] = timer() - start
+                self.instrument(record)
+            if validate:
+                valid = processed.validate()
+                yield index, valid, processed.errors
+            else:
+                yield processed